@@ -0,0 +1,206 @@
+"""Synthetic task data for benchmarks.
+
+    python -m benchmarks.datagen --rows 1000000 --db-url postgresql+asyncpg://...
+
+Rows are produced in chunks by a seeded generator and loaded through
+TaskRepository.create_many, i.e. COPY on asyncpg and multi-row INSERT
+elsewhere. Status mix, created_at spread and description length are
+configurable so the planner sees a realistic value distribution.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.domain.task.entity import TaskEntity
+from src.domain.task.value_object import TaskStatus
+from src.infra.db.connection import Base
+from src.infra.db.models.task import Task
+from src.infra.db.repositories.task_repositories import TaskRepository
+
+LOAD_CHUNK_SIZE = 10_000
+WORDS = [
+    "deploy",
+    "fix",
+    "review",
+    "release",
+    "migrate",
+    "refactor",
+    "monitor",
+    "backup",
+    "rotate",
+    "upgrade",
+    "audit",
+    "cleanup",
+    "index",
+    "cache",
+    "report",
+    "schedule",
+    "invoice",
+    "sync",
+]
+
+
+@dataclass
+class DataProfile:
+    status_weights: Dict[TaskStatus, float] = field(
+        default_factory=lambda: {
+            TaskStatus.CREATED: 0.2,
+            TaskStatus.IN_PROGRESS: 0.1,
+            TaskStatus.COMPLETED: 0.7,
+        }
+    )
+    created_span_days: int = 365
+    description_min: int = 0
+    description_max: int = 500
+    end: datetime = field(default_factory=datetime.now)
+    seed: int = 0
+
+
+def parse_status_weights(value: str) -> Dict[TaskStatus, float]:
+    weights: Dict[TaskStatus, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        weights[TaskStatus(name.strip().upper())] = float(weight)
+    return weights
+
+
+def generate_tasks(
+    count: int, profile: DataProfile, chunk_size: int = LOAD_CHUNK_SIZE
+) -> Iterator[List[TaskEntity]]:
+    rng = random.Random(profile.seed)
+    statuses = list(profile.status_weights)
+    weights = list(profile.status_weights.values())
+    span_seconds = profile.created_span_days * 86400
+
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        chunk_statuses = rng.choices(statuses, weights, k=size)
+        chunk = []
+        for offset, status in enumerate(chunk_statuses):
+            words = rng.choices(WORDS, k=3)
+            length = rng.randint(profile.description_min, profile.description_max)
+            chunk.append(
+                TaskEntity(
+                    title=f"{' '.join(words)} #{start + offset}",
+                    description=(" ".join(rng.choices(WORDS, k=length // 6 + 1)))[
+                        :length
+                    ],
+                    status=status,
+                    created_at=profile.end
+                    - timedelta(seconds=rng.uniform(0, span_seconds)),
+                )
+            )
+        yield chunk
+
+
+async def count_tasks(engine: AsyncEngine) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count()).select_from(Task))).scalar_one()
+
+
+async def load_tasks(
+    engine: AsyncEngine, count: int, profile: DataProfile
+) -> Dict[str, float]:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    started = time.perf_counter()
+    for chunk in generate_tasks(count, profile):
+        async with session_factory() as session:
+            await TaskRepository(session).create_many(chunk)
+            await session.commit()
+    elapsed = time.perf_counter() - started
+    return {
+        "loaded": count,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(count / elapsed) if elapsed else 0,
+    }
+
+
+async def grow_to(
+    engine: AsyncEngine, rows: int, profile: DataProfile
+) -> Optional[Dict[str, float]]:
+    """Top the table up to rows; existing rows are kept so sizes can be stepped"""
+    existing = await count_tasks(engine)
+    if existing >= rows:
+        return None
+    # shift the seed so a top-up does not regenerate the rows already loaded
+    profile = replace(profile, seed=profile.seed + existing)
+    result = await load_tasks(engine, rows - existing, profile)
+    await analyze(engine)
+    return result
+
+
+async def analyze(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(f"ANALYZE {Task.__tablename__}")
+
+
+async def create_schema(engine: AsyncEngine, reset: bool) -> None:
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def run(db_url: str, rows: int, profile: DataProfile, reset: bool) -> None:
+    engine = create_async_engine(db_url)
+    try:
+        await create_schema(engine, reset)
+        result = await grow_to(engine, rows, profile)
+        print(orjson.dumps({"rows": rows, **(result or {"loaded": 0})}).decode())
+    finally:
+        await engine.dispose()
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--statuses",
+        type=parse_status_weights,
+        default=None,
+        help="status weights, e.g. created=0.2,in_progress=0.1,completed=0.7",
+    )
+    parser.add_argument("--created-span-days", type=int, default=365)
+    parser.add_argument("--description-min", type=int, default=0)
+    parser.add_argument("--description-max", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def profile_from_args(args: argparse.Namespace) -> DataProfile:
+    profile = DataProfile(
+        created_span_days=args.created_span_days,
+        description_min=args.description_min,
+        description_max=args.description_max,
+        seed=args.seed,
+    )
+    if args.statuses:
+        profile.status_weights = args.statuses
+    return profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--reset", action="store_true", help="drop and recreate the tasks table"
+    )
+    parser.add_argument(
+        "--db-url",
+        required=True,
+        help="SQLAlchemy async URL, e.g. sqlite+aiosqlite:///tasks.db",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.db_url, args.rows, profile_from_args(args), args.reset))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Throughput and peak memory of the streaming export path.
+
+    python -m benchmarks.export --rows 10000 100000 --format ndjson
+
+Seeds a fresh table for every size, then drains TaskRepository.stream through
+the same encoder the /tasks/export endpoint uses. Peak memory should stay flat
+while the row count grows.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.application.task.batch import EXPORT_CHUNK_SIZE
+from src.domain.task.entity import TaskEntity
+from src.domain.task.value_object import TaskFilter
+from src.infra.db.connection import Base
+from src.infra.db.repositories.task_repositories import TaskRepository
+from src.presentation.web_api.export import ExportFormat, encode_export
+
+SEED_BATCH = 5000
+
+
+async def seed(engine: AsyncEngine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        repository = TaskRepository(session)
+        for start in range(0, rows, SEED_BATCH):
+            size = min(SEED_BATCH, rows - start)
+            await repository.create_many(
+                [
+                    TaskEntity(title=f"Task {start + i}", description="x" * 200)
+                    for i in range(size)
+                ]
+            )
+
+
+async def measure(
+    engine: AsyncEngine, rows: int, export_format: ExportFormat
+) -> Dict[str, Any]:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    exported = 0
+    size = 0
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    async with session_factory() as session:
+        repository = TaskRepository(session)
+
+        async def chunks() -> Any:
+            nonlocal exported
+            async for chunk in repository.stream(TaskFilter(), EXPORT_CHUNK_SIZE):
+                exported += len(chunk)
+                yield chunk
+
+        async for payload in encode_export(chunks(), export_format):
+            size += len(payload)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rows": rows,
+        "exported": exported,
+        "format": export_format.value,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(exported / elapsed),
+        "megabytes": round(size / 2**20, 2),
+        "peak_memory_mb": round(peak / 2**20, 2),
+    }
+
+
+async def run(db_url: str, sizes: List[int], export_format: ExportFormat) -> None:
+    engine = create_async_engine(db_url)
+    try:
+        for rows in sizes:
+            await seed(engine, rows)
+            result = await measure(engine, rows, export_format)
+            print(orjson.dumps(result).decode())
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument(
+        "--format", type=ExportFormat, default=ExportFormat.NDJSON, dest="fmt"
+    )
+    parser.add_argument(
+        "--db-url",
+        help="SQLAlchemy async URL; the table is dropped and re-seeded",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite+aiosqlite:///{Path(tmp) / 'export.db'}"
+        asyncio.run(run(db_url, args.rows, args.fmt))
+
+
+if __name__ == "__main__":
+    main()
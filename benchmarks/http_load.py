@@ -0,0 +1,430 @@
+"""In-process HTTP load test of the task endpoints.
+
+    python -m benchmarks.http_load run --concurrency 16 --duration 20 \\
+        --mix create=2,get=5,list=3,update=1,patch=1,delete=1 --output head.json
+    python -m benchmarks.http_load compare base.json head.json
+
+Requests go through the real src.main:app via httpx.ASGITransport, so routing,
+validation, the service layer, the cache and the repository are all measured;
+only the network hop is skipped. The database is a throwaway sqlite file (the
+same stand-in tests/conftest.py uses) unless --db-url points at Postgres; the
+schema is expected to be migrated there, the benchmark only adds rows.
+
+Latencies are recorded per operation_id and reported as p50/p95/p99 plus
+throughput. `compare` prints the relative change per operation and exits with
+code 1 when any p95 or throughput regresses by more than --threshold percent.
+"""
+
+import argparse
+import asyncio
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+import orjson
+from fastapi import Depends, Request
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.application.task.task_service import TaskService
+from src.infra.cache import build_task_cache
+from src.infra.coalescing import SingleFlight
+from src.infra.config import CacheSettings
+from src.infra.db.connection import Base
+from src.infra.db.repositories.task_repositories import TaskRepository
+from src.infra.db.unit_of_work import UnitOfWork
+from src.main import READ_ONLY_METHODS, app
+from src.presentation.web_api.providers.abstract.task import task_service_provider
+
+DEFAULT_MIX = "create=2,get=5,list=3,update=1,patch=1,delete=1"
+SEED_TASKS = 1000
+STATUSES = ("CREATED", "IN_PROGRESS", "COMPLETED")
+
+# name used in --mix -> (method, path template); operation_id comes from the route
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "create": ("POST", "/tasks/"),
+    "batch": ("POST", "/tasks/batch"),
+    "bulk_status": ("POST", "/tasks/bulk/status"),
+    "list": ("GET", "/tasks/"),
+    "export": ("GET", "/tasks/export"),
+    "get": ("GET", "/tasks/{id}"),
+    "update": ("PUT", "/tasks/{id}"),
+    "patch": ("PATCH", "/tasks/{id}"),
+    "delete": ("DELETE", "/tasks/{id}"),
+}
+BY_ID_OPERATIONS = frozenset({"get", "update", "patch", "delete"})
+
+
+@dataclass
+class OperationStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+
+@dataclass
+class LoadState:
+    rng: random.Random
+    task_ids: List[str]
+    stats: Dict[str, OperationStats] = field(default_factory=dict)
+    cursor: Optional[str] = None
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix: Dict[str, int] = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operation {name!r}, expected one of {sorted(OPERATIONS)}"
+            )
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def resolve_operation_ids() -> Dict[str, str]:
+    routes = {
+        (method, route.path): route.operation_id or route.unique_id
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    return {name: routes[target] for name, target in OPERATIONS.items()}
+
+
+def bind_app(engine: AsyncEngine, use_cache: bool, use_coalescing: bool = True) -> None:
+    """Point the app's task service at engine instead of the configured Postgres"""
+    session_factory = async_sessionmaker(
+        engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    )
+    read_only_factory = async_sessionmaker(
+        engine.execution_options(isolation_level="AUTOCOMMIT"),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+    cache = build_task_cache(CacheSettings()) if use_cache else None
+    flights = SingleFlight() if use_coalescing else None
+
+    @asynccontextmanager
+    async def bench_unit_of_work(read_only: bool) -> AsyncIterator[UnitOfWork]:
+        factory = read_only_factory if read_only else session_factory
+        async with factory() as session:
+            yield UnitOfWork(session, read_only=read_only)
+
+    async def get_unit_of_work(request: Request) -> AsyncIterator[UnitOfWork]:
+        async with bench_unit_of_work(request.method in READ_ONLY_METHODS) as uow:
+            yield uow
+
+    @asynccontextmanager
+    async def repository_scope() -> AsyncIterator[TaskRepository]:
+        async with bench_unit_of_work(read_only=True) as uow:
+            yield TaskRepository(uow.session)
+
+    def get_task_service(uow: UnitOfWork = Depends(get_unit_of_work)) -> TaskService:
+        return TaskService(
+            TaskRepository(uow.session),
+            cache=cache,
+            repository_scope=repository_scope,
+            uow=uow,
+            flights=flights,
+        )
+
+    app.dependency_overrides[task_service_provider] = get_task_service
+
+
+async def prepare_database(engine: AsyncEngine) -> None:
+    if engine.dialect.name == "sqlite":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+
+async def seed(client: httpx.AsyncClient, count: int) -> List[str]:
+    task_ids: List[str] = []
+    for start in range(0, count, 1000):
+        response = await client.post(
+            "/tasks/batch",
+            json=[
+                {"title": f"Seed {start + i}", "description": "x" * 100}
+                for i in range(min(1000, count - start))
+            ],
+        )
+        response.raise_for_status()
+        task_ids.extend(task["id"] for task in response.json()["created"])
+    return task_ids
+
+
+async def call(
+    client: httpx.AsyncClient, name: str, state: LoadState
+) -> Optional[httpx.Response]:
+    rng = state.rng
+    if name in BY_ID_OPERATIONS:
+        return await call_by_id(client, name, state) if state.task_ids else None
+    if name == "create":
+        return await client.post("/tasks/", json={"title": "Load task"})
+    if name == "batch":
+        return await client.post(
+            "/tasks/batch", json=[{"title": f"Load batch {i}"} for i in range(20)]
+        )
+    if name == "bulk_status":
+        return await client.post(
+            "/tasks/bulk/status",
+            json={
+                "ids": rng.sample(state.task_ids, min(20, len(state.task_ids))),
+                "status": rng.choice(STATUSES),
+            },
+        )
+    if name == "export":
+        return await client.get("/tasks/export", params={"status": "COMPLETED"})
+    return await call_list(client, state)
+
+
+async def call_list(client: httpx.AsyncClient, state: LoadState) -> httpx.Response:
+    # walks the keyset pages and starts over from the first one at the end
+    params: Dict[str, Any] = {"limit": 50}
+    if state.cursor:
+        params["cursor"] = state.cursor
+    response = await client.get("/tasks/", params=params)
+    state.cursor = response.headers.get("X-Next-Cursor")
+    return response
+
+
+async def call_by_id(
+    client: httpx.AsyncClient, name: str, state: LoadState
+) -> httpx.Response:
+    rng = state.rng
+    if name == "delete":
+        task_id = state.task_ids.pop(rng.randrange(len(state.task_ids)))
+        return await client.delete(f"/tasks/{task_id}")
+    task_id = rng.choice(state.task_ids)
+    if name == "update":
+        return await client.put(
+            f"/tasks/{task_id}",
+            params={
+                "title": "Updated",
+                "description": "load",
+                "status": rng.choice(STATUSES),
+            },
+        )
+    if name == "patch":
+        return await client.patch(
+            f"/tasks/{task_id}", json={"status": rng.choice(STATUSES)}
+        )
+    return await client.get(f"/tasks/{task_id}")
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    state: LoadState,
+    mix: Dict[str, int],
+    operation_ids: Dict[str, str],
+    deadline: float,
+) -> None:
+    names = list(mix)
+    weights = list(mix.values())
+    while time.perf_counter() < deadline:
+        name = state.rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        response = await call(client, name, state)
+        if response is None:
+            continue
+        elapsed = time.perf_counter() - started
+
+        stats = state.stats.setdefault(operation_ids[name], OperationStats())
+        stats.latencies.append(elapsed)
+        if response.status_code >= 400:  # noqa: PLR2004
+            stats.errors += 1
+        elif name == "create":
+            state.task_ids.append(response.json()["id"])
+        elif name == "batch":
+            state.task_ids.extend(task["id"] for task in response.json()["created"])
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted sample"""
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(stats: OperationStats, duration: float) -> Dict[str, Any]:
+    ordered = sorted(stats.latencies)
+    return {
+        "requests": len(ordered),
+        "errors": stats.errors,
+        "throughput_rps": round(len(ordered) / duration, 1),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_load(args: argparse.Namespace, db_url: str) -> Dict[str, Any]:
+    engine = create_async_engine(db_url)
+    await prepare_database(engine)
+    bind_app(
+        engine,
+        use_cache=not args.no_cache,
+        use_coalescing=not args.no_coalescing,
+    )
+    operation_ids = resolve_operation_ids()
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark"
+        ) as client:
+            state = LoadState(
+                rng=random.Random(args.random_seed),
+                task_ids=await seed(client, args.seed),
+            )
+            # warm-up: cache, connection pool and SQLAlchemy statement cache
+            await worker(
+                client, state, args.mix, operation_ids, time.perf_counter() + 1
+            )
+            state.stats.clear()
+
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(
+                *(
+                    worker(client, state, args.mix, operation_ids, deadline)
+                    for _ in range(args.concurrency)
+                )
+            )
+            duration = time.perf_counter() - started
+    finally:
+        app.dependency_overrides.pop(task_service_provider, None)
+        await engine.dispose()
+
+    total = OperationStats(
+        latencies=[value for s in state.stats.values() for value in s.latencies],
+        errors=sum(s.errors for s in state.stats.values()),
+    )
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "dialect": engine.dialect.name,
+            "concurrency": args.concurrency,
+            "duration_s": round(duration, 2),
+            "mix": args.mix,
+            "seed_tasks": args.seed,
+            "cache": not args.no_cache,
+            "coalescing": not args.no_coalescing,
+            "python": platform.python_version(),
+        },
+        "operations": {
+            operation_id: summarize(stats, duration)
+            for operation_id, stats in sorted(state.stats.items())
+        },
+        "total": summarize(total, duration),
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite+aiosqlite:///{Path(tmp) / 'load.db'}"
+        result = asyncio.run(run_load(args, db_url))
+
+    payload = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    if args.output:
+        Path(args.output).write_bytes(payload)
+    print(payload.decode())
+    return 0
+
+
+def change(before: float, after: float) -> float:
+    return (after - before) / before * 100 if before else 0.0
+
+
+def compare(args: argparse.Namespace) -> int:
+    base = orjson.loads(Path(args.base).read_bytes())
+    head = orjson.loads(Path(args.head).read_bytes())
+
+    regressions = []
+    header = (
+        f"{'operation_id':<26}{'rps':>16}{'p50 ms':>20}{'p95 ms':>20}{'p99 ms':>20}"
+    )
+    print(header)
+    for operation_id in sorted(base["operations"].keys() & head["operations"]):
+        before = base["operations"][operation_id]
+        after = head["operations"][operation_id]
+        cells = []
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            delta = change(before[metric], after[metric])
+            cells.append(f"{after[metric]:>9} {delta:+6.1f}%")
+        print(f"{operation_id:<26}" + "".join(f"{cell:>20}" for cell in cells))
+
+        if change(before["p95_ms"], after["p95_ms"]) > args.threshold:
+            regressions.append(f"{operation_id}: p95")
+        if -change(before["throughput_rps"], after["throughput_rps"]) > args.threshold:
+            regressions.append(f"{operation_id}: throughput")
+
+    if regressions:
+        print(f"regressed above {args.threshold}%: " + ", ".join(regressions))
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the load and write results")
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    run_parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix(DEFAULT_MIX),
+        help=f"operation weights, default {DEFAULT_MIX}; "
+        f"operations: {', '.join(OPERATIONS)}",
+    )
+    run_parser.add_argument("--seed", type=int, default=SEED_TASKS)
+    run_parser.add_argument("--random-seed", type=int, default=0)
+    run_parser.add_argument("--no-cache", action="store_true")
+    run_parser.add_argument("--no-coalescing", action="store_true")
+    run_parser.add_argument(
+        "--db-url",
+        help="SQLAlchemy async URL of a migrated database; sqlite temp file by default",
+    )
+    run_parser.add_argument("--output", help="write the JSON results to this file")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=10.0)
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
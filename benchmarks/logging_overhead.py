@@ -0,0 +1,139 @@
+"""Per-call cost of TaskService logging: legacy eager extra vs ServiceLogger.
+
+    python -m benchmarks.logging_overhead --tasks 100 --calls 20000
+
+The legacy variants reproduce the statements create/list used before the
+facade: str() of every id and an extra dict built even when the level is off.
+Each scenario runs with the logger at INFO (record emitted to a NullHandler)
+and at WARNING (record dropped).
+"""
+
+import argparse
+import logging
+import timeit
+from typing import Callable, Dict, List
+
+import orjson
+
+from src.application.task.service_logger import ServiceLogger
+from src.domain.task.entity import TaskEntity
+from src.infra.config import ServiceLogSettings
+
+
+def legacy_create(logger: logging.Logger, task: TaskEntity) -> None:
+    logger.info(
+        "Task created successfully: task_id=%s, title='%s'",
+        str(task.id),
+        task.title,
+        extra={
+            "task_id": str(task.id),
+            "title": task.title,
+            "description": task.description,
+            "status": task.status.value,
+            "created_at": task.created_at.isoformat(),
+            "action": "task_created",
+        },
+    )
+
+
+def facade_create(log: ServiceLogger, task: TaskEntity) -> None:
+    log.info(
+        "Task created successfully: task_id=%s, title='%s'",
+        task.id,
+        task.title,
+        action="task_created",
+        task_id=task.id,
+        title=task.title,
+        description=task.description,
+        status=task.status,
+        created_at=task.created_at,
+    )
+
+
+def legacy_list(logger: logging.Logger, tasks: List[TaskEntity]) -> None:
+    logger.info(
+        "Tasks listed: count=%d, skip=%d, limit=%d",
+        len(tasks),
+        0,
+        len(tasks),
+        extra={
+            "count": len(tasks),
+            "skip": 0,
+            "limit": len(tasks),
+            "cursor": None,
+            "next_cursor": None,
+            "task_ids": [str(task.id) for task in tasks],
+            "action": "tasks_listed",
+        },
+    )
+
+
+def facade_list(log: ServiceLogger, tasks: List[TaskEntity]) -> None:
+    log.info(
+        "Tasks listed: count=%d, skip=%d, limit=%d",
+        len(tasks),
+        0,
+        len(tasks),
+        action="tasks_listed",
+        count=len(tasks),
+        skip=0,
+        limit=len(tasks),
+        cursor=None,
+        next_cursor=None,
+        task_ids=lambda: [task.id for task in tasks],
+    )
+
+
+def per_call_us(func: Callable[[], None], calls: int) -> float:
+    return min(timeit.repeat(func, number=calls, repeat=5)) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100, help="page size for list")
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument(
+        "--sample-rate",
+        type=float,
+        default=1.0,
+        help="SERVICE_LOG_SAMPLE_RATES value applied to tasks_listed",
+    )
+    args = parser.parse_args()
+
+    logger = logging.getLogger("benchmarks.logging_overhead")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    log = ServiceLogger(
+        logger, ServiceLogSettings(sample_rates={"tasks_listed": args.sample_rate})
+    )
+
+    task = TaskEntity(title="Benchmark task", description="x" * 200)
+    tasks = [TaskEntity(title=f"Task {i}") for i in range(args.tasks)]
+
+    for level in (logging.INFO, logging.WARNING):
+        logger.setLevel(level)
+        result: Dict[str, object] = {"level": logging.getLevelName(level)}
+        for name, legacy, facade in (
+            (
+                "create",
+                lambda: legacy_create(logger, task),
+                lambda: facade_create(log, task),
+            ),
+            (
+                "list",
+                lambda: legacy_list(logger, tasks),
+                lambda: facade_list(log, tasks),
+            ),
+        ):
+            before = per_call_us(legacy, args.calls)
+            after = per_call_us(facade, args.calls)
+            result[name] = {
+                "legacy_us": round(before, 2),
+                "facade_us": round(after, 2),
+                "speedup": round(before / after, 1),
+            }
+        print(orjson.dumps(result).decode())
+
+
+if __name__ == "__main__":
+    main()
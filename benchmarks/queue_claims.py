@@ -0,0 +1,180 @@
+"""Claim throughput of the worker queue as the number of workers grows.
+
+    python -m benchmarks.queue_claims --workers 1 4 16 64 256 --batch 10 \\
+        --rows 1000000 --db-url postgresql+asyncpg://...
+
+Every worker holds its own connection and loops TaskRepository.claim in its
+own transaction, as a real worker polling POST /tasks/claim would. For each
+worker count the run reports claim calls and claimed tasks per second, claim
+latency, and two correctness counters: "duplicates" (a task handed to more
+than one worker; must stay 0) and "errors". Claimed tasks are put back to
+CREATED between runs, so every run starts from the same queue.
+
+The table is grown with benchmarks.datagen; by default 20% of it is CREATED
+and the rest is history the partial index ix_tasks_claimable never sees.
+SKIP LOCKED needs Postgres: on the default sqlite file writers serialize and
+the numbers only show the single-writer ceiling.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List
+from uuid import UUID
+
+import orjson
+from sqlalchemy import update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from benchmarks.datagen import (
+    add_profile_arguments,
+    create_schema,
+    grow_to,
+    profile_from_args,
+)
+from src.domain.task.value_object import TaskStatus
+from src.infra.db.models.task import Task
+from src.infra.db.repositories.task_repositories import TaskRepository
+
+WORKER_PREFIX = "bench-"
+DEFAULT_STATUSES = {
+    TaskStatus.CREATED: 0.2,
+    TaskStatus.IN_PROGRESS: 0.05,
+    TaskStatus.COMPLETED: 0.75,
+}
+
+
+@dataclass
+class WorkerStats:
+    latencies: List[float] = field(default_factory=list)
+    claimed: List[UUID] = field(default_factory=list)
+    errors: int = 0
+    drained: bool = False
+
+
+async def worker(
+    session_factory: async_sessionmaker[AsyncSession],
+    name: str,
+    batch: int,
+    deadline: float,
+) -> WorkerStats:
+    stats = WorkerStats()
+    lease = datetime.now(timezone.utc) + timedelta(hours=1)
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            async with session_factory() as session:
+                tasks = await TaskRepository(session).claim(name, batch, lease)
+                await session.commit()
+        except DBAPIError:
+            stats.errors += 1
+            continue
+        stats.latencies.append(time.perf_counter() - started)
+        if not tasks:
+            stats.drained = True
+            break
+        stats.claimed.extend(task.id for task in tasks)
+    return stats
+
+
+async def release_claims(engine: AsyncEngine) -> None:
+    """Put every task claimed by a benchmark worker back into the queue"""
+    async with engine.begin() as conn:
+        await conn.execute(
+            update(Task)
+            .where(Task.lease_owner.like(f"{WORKER_PREFIX}%"))
+            .values(status=TaskStatus.CREATED, lease_owner=None, lease_expires_at=None)
+        )
+
+
+async def bench_workers(
+    engine: AsyncEngine, workers: int, batch: int, duration: float
+) -> Dict[str, Any]:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            worker(session_factory, f"{WORKER_PREFIX}{i}", batch, started + duration)
+            for i in range(workers)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    await release_claims(engine)
+
+    latencies = sorted(value for stats in results for value in stats.latencies)
+    claimed = [task_id for stats in results for task_id in stats.claimed]
+    percentiles = (
+        statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    )
+    return {
+        "workers": workers,
+        "batch": batch,
+        "claims": len(latencies),
+        "claims_per_s": round(len(latencies) / elapsed, 1),
+        "tasks_per_s": round(len(claimed) / elapsed, 1),
+        "p50_ms": round(percentiles[49] * 1000, 3) if latencies else None,
+        "p95_ms": round(percentiles[94] * 1000, 3) if latencies else None,
+        "duplicates": len(claimed) - len(set(claimed)),
+        "errors": sum(stats.errors for stats in results),
+        "drained": any(stats.drained for stats in results),
+    }
+
+
+async def run(args: argparse.Namespace, db_url: str) -> None:
+    # one connection per worker: claims must not queue for the pool
+    engine = create_async_engine(db_url, pool_size=max(args.workers), max_overflow=0)
+    profile = profile_from_args(args)
+    if not args.statuses:
+        profile.status_weights = DEFAULT_STATUSES
+    try:
+        await create_schema(engine, reset=args.reset)
+        loaded = await grow_to(engine, args.rows, profile)
+        if loaded is not None:
+            print(orjson.dumps({"rows": args.rows, "seed": loaded}).decode())
+        await release_claims(engine)
+        for workers in sorted(args.workers):
+            result = await bench_workers(engine, workers, args.batch, args.duration)
+            print(orjson.dumps(result).decode())
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64]
+    )
+    parser.add_argument("--batch", type=int, default=10, help="tasks per claim")
+    parser.add_argument(
+        "--duration", type=float, default=5.0, help="seconds per worker count"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--reset", action="store_true", help="drop and recreate the tasks table"
+    )
+    parser.add_argument(
+        "--db-url",
+        help="SQLAlchemy async URL; the tasks table is grown in place. "
+        "A sqlite temp file by default",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite+aiosqlite:///{Path(tmp) / 'queue.db'}"
+        asyncio.run(run(args, db_url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""How TaskRepository operations scale with table size and page depth.
+
+    python -m benchmarks.repository_scaling --sizes 10000 100000 1000000 \\
+        --depths 0 1000 10000 100000 --db-url postgresql+asyncpg://...
+
+The table is grown step by step with benchmarks.datagen (rows from the
+previous size are kept). For every size it times get, update and delete by
+id, and list at each page depth both with OFFSET and with the keyset cursor.
+Every result line carries the plan of the statement the repository actually
+sent (captured from the engine and re-run under EXPLAIN): the index names and
+a "full_scan" flag, so a query that falls off its index stands out next to
+its latency.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Row, event, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from benchmarks.datagen import (
+    add_profile_arguments,
+    create_schema,
+    grow_to,
+    profile_from_args,
+)
+from src.domain.task.value_object import TaskStatus
+from src.infra.db.models.task import Task
+from src.infra.db.repositories.task_repositories import TaskRepository
+
+PAGE_SIZE = 50
+SAMPLE_IDS = 200
+
+RepositoryCall = Callable[[TaskRepository, int], Awaitable[Any]]
+
+
+@dataclass
+class StatementRecorder:
+    """Keeps the last statement the engine sent, for EXPLAIN"""
+
+    statement: Optional[str] = None
+    parameters: Any = None
+    enabled: bool = False
+
+    def attach(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if self.enabled:
+            self.statement = statement
+            self.parameters = parameters
+
+
+@dataclass
+class Plan:
+    nodes: List[str] = field(default_factory=list)
+    indexes: List[str] = field(default_factory=list)
+    full_scan: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "plan": self.nodes,
+            "indexes": sorted(set(self.indexes)),
+            "full_scan": self.full_scan,
+        }
+
+
+def postgres_plan(node: Dict[str, Any], plan: Plan) -> None:
+    node_type = node["Node Type"]
+    plan.nodes.append(node_type)
+    if "Index Name" in node:
+        plan.indexes.append(node["Index Name"])
+    if node_type == "Seq Scan" and node.get("Relation Name") == Task.__tablename__:
+        plan.full_scan = True
+    for child in node.get("Plans", []):
+        postgres_plan(child, plan)
+
+
+def sqlite_plan(rows: Sequence[Row[Any]]) -> Plan:
+    plan = Plan()
+    for row in rows:
+        detail = str(row[-1])
+        plan.nodes.append(detail)
+        if " INDEX " in detail:
+            plan.indexes.append(detail.split(" INDEX ", 1)[1].split(" ", 1)[0])
+        elif detail.startswith(f"SCAN {Task.__tablename__}"):
+            plan.full_scan = True
+    return plan
+
+
+async def explain(session: AsyncSession, recorder: StatementRecorder) -> Optional[Plan]:
+    if recorder.statement is None:
+        return None
+    connection = await session.connection()
+    if connection.dialect.name == "postgresql":
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {recorder.statement}", recorder.parameters
+        )
+        raw = result.scalar_one()
+        document = orjson.loads(raw) if isinstance(raw, (str, bytes)) else raw
+        plan = Plan()
+        postgres_plan(document[0]["Plan"], plan)
+        return plan
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {recorder.statement}", recorder.parameters
+    )
+    return sqlite_plan(result.all())
+
+
+async def measure(
+    session_factory: async_sessionmaker[AsyncSession],
+    recorder: StatementRecorder,
+    repeat: int,
+    operation: RepositoryCall,
+) -> Dict[str, Any]:
+    """Runs operation repeat times, each in its own rolled back transaction"""
+    timings = []
+    plan: Optional[Plan] = None
+    async with session_factory() as session:
+        repository = TaskRepository(session)
+        for i in range(repeat):
+            recorder.enabled = True
+            started = time.perf_counter()
+            await operation(repository, i)
+            timings.append(time.perf_counter() - started)
+            recorder.enabled = False
+            if plan is None:
+                plan = await explain(session, recorder)
+            await session.rollback()
+
+    ordered = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[max(0, round(0.95 * len(ordered)) - 1)] * 1000, 3),
+        **(plan or Plan()).as_dict(),
+    }
+
+
+async def sample_ids(
+    session_factory: async_sessionmaker[AsyncSession], rows: int
+) -> List[UUID]:
+    step = max(1, rows // SAMPLE_IDS)
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Task.id).order_by(Task.created_at, Task.id).offset(step // 2)
+        )
+        return [task_id for i, task_id in enumerate(result.scalars()) if i % step == 0]
+
+
+async def cursor_at(
+    session_factory: async_sessionmaker[AsyncSession], depth: int
+) -> Optional[Tuple[Any, UUID]]:
+    if depth == 0:
+        return None
+    async with session_factory() as session:
+        result = await session.execute(
+            select(Task.created_at, Task.id)
+            .order_by(Task.created_at, Task.id)
+            .offset(depth - 1)
+            .limit(1)
+        )
+        row = result.one()
+        return row.created_at, row.id
+
+
+async def bench_size(
+    engine: AsyncEngine,
+    recorder: StatementRecorder,
+    rows: int,
+    depths: List[int],
+    repeat: int,
+) -> List[Dict[str, Any]]:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    ids = await sample_ids(session_factory, rows)
+    results = []
+
+    async def record(name: str, operation: RepositoryCall, **labels: Any) -> None:
+        result = await measure(session_factory, recorder, repeat, operation)
+        results.append({"rows": rows, "operation": name, **labels, **result})
+
+    await record("get", lambda repo, i: repo.get(ids[i % len(ids)]))
+    await record(
+        "update",
+        lambda repo, i: repo.update(
+            ids[i % len(ids)], {"status": TaskStatus.IN_PROGRESS}
+        ),
+    )
+    await record("delete", lambda repo, i: repo.delete(ids[i % len(ids)]))
+
+    for depth in (depth for depth in depths if depth < rows):
+        after = await cursor_at(session_factory, depth)
+        await record("list_offset", list_page(skip=depth), depth=depth)
+        await record("list_keyset", list_page(after=after), depth=depth)
+    return results
+
+
+def list_page(
+    skip: int = 0, after: Optional[Tuple[Any, UUID]] = None
+) -> RepositoryCall:
+    return lambda repo, _: repo.list(skip=skip, limit=PAGE_SIZE, after=after)
+
+
+async def run(args: argparse.Namespace, db_url: str) -> None:
+    engine = create_async_engine(db_url)
+    recorder = StatementRecorder()
+    recorder.attach(engine)
+    profile = profile_from_args(args)
+    try:
+        await create_schema(engine, reset=args.reset)
+        for rows in sorted(args.sizes):
+            loaded = await grow_to(engine, rows, profile)
+            if loaded is not None:
+                print(orjson.dumps({"rows": rows, "seed": loaded}).decode())
+            for result in await bench_size(
+                engine, recorder, rows, args.depths, args.repeat
+            ):
+                print(orjson.dumps(result).decode())
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--depths", type=int, nargs="+", default=[0, 1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--reset", action="store_true", help="drop and recreate the tasks table"
+    )
+    parser.add_argument(
+        "--db-url",
+        help="SQLAlchemy async URL; the tasks table is grown in place. "
+        "A sqlite temp file by default",
+    )
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite+aiosqlite:///{Path(tmp) / 'scaling.db'}"
+        asyncio.run(run(args, db_url))
+
+
+if __name__ == "__main__":
+    main()
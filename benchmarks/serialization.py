@@ -0,0 +1,134 @@
+"""CPU per list page: TaskDTO validation vs Core rows straight to orjson.
+
+    python -m benchmarks.serialization --page-sizes 100 1000 --repeat 50
+
+The "dto" path reproduces what GET /tasks did through response_model:
+ORM Task -> TaskEntity -> list[TaskDTO] validation -> json.dumps by
+JSONResponse. The "rows" path is the current one: Core rows from
+TaskRepository.list_rows encoded by TaskRowsResponse. Both are timed with
+process_time, once for serialization alone and once including the fetch.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from src.domain.task.entity import TaskEntity
+from src.infra.db.connection import Base
+from src.infra.db.repositories.task_repositories import TaskRepository
+from src.presentation.web_api.schemas.task import TaskDTO
+from src.presentation.web_api.task_json import encode_task_rows
+
+TASK_LIST = TypeAdapter(list[TaskDTO])
+
+
+def render_dto(tasks: List[TaskEntity]) -> bytes:
+    validated = TASK_LIST.validate_python(tasks, from_attributes=True)
+    return bytes(JSONResponse(TASK_LIST.dump_python(validated, mode="json")).body)
+
+
+async def seed(engine: AsyncEngine, rows: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        await TaskRepository(session).create_many(
+            [TaskEntity(title=f"Task {i}", description="x" * 200) for i in range(rows)]
+        )
+        await session.commit()
+
+
+async def cpu_ms(repeat: int, func: Callable[[], Awaitable[Any]]) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.process_time()
+        await func()
+        timings.append(time.process_time() - started)
+    ordered = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(ordered) * 1000, 3),
+        "p95_ms": round(ordered[max(0, round(0.95 * len(ordered)) - 1)] * 1000, 3),
+    }
+
+
+async def bench_page(
+    engine: AsyncEngine, page_size: int, repeat: int
+) -> List[Dict[str, Any]]:
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as session:
+        repository = TaskRepository(session)
+        tasks = await repository.list(limit=page_size)
+        rows = await repository.list_rows(limit=page_size)
+        if orjson.loads(render_dto(tasks)) != orjson.loads(encode_task_rows(rows)):
+            raise AssertionError("dto and rows paths produced different JSON")
+
+        async def dto_serialize() -> bytes:
+            return render_dto(tasks)
+
+        async def rows_serialize() -> bytes:
+            return encode_task_rows(rows)
+
+        async def dto_page() -> bytes:
+            return render_dto(await repository.list(limit=page_size))
+
+        async def rows_page() -> bytes:
+            return encode_task_rows(await repository.list_rows(limit=page_size))
+
+        results = []
+        for scope, dto, fast in (
+            ("serialize", dto_serialize, rows_serialize),
+            ("fetch_and_serialize", dto_page, rows_page),
+        ):
+            before = await cpu_ms(repeat, dto)
+            after = await cpu_ms(repeat, fast)
+            results.append(
+                {
+                    "page_size": page_size,
+                    "scope": scope,
+                    "dto": before,
+                    "rows": after,
+                    "speedup": round(before["median_ms"] / after["median_ms"], 1),
+                }
+            )
+        return results
+
+
+async def run(db_url: str, page_sizes: List[int], repeat: int) -> None:
+    engine = create_async_engine(db_url)
+    try:
+        await seed(engine, max(page_sizes))
+        for page_size in page_sizes:
+            for result in await bench_page(engine, page_size, repeat):
+                print(orjson.dumps(result).decode())
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument(
+        "--db-url",
+        help="SQLAlchemy async URL; the table is dropped and re-seeded. "
+        "A sqlite temp file by default",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db_url or f"sqlite+aiosqlite:///{Path(tmp) / 'serialization.db'}"
+        asyncio.run(run(db_url, args.page_sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
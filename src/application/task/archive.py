@@ -0,0 +1,8 @@
+from datetime import timedelta
+
+from src.infra.config import ArchiveSettings
+
+_settings = ArchiveSettings()
+# столько задача COMPLETED должна не меняться, чтобы уйти в tasks_archive
+ARCHIVE_AFTER = timedelta(days=_settings.after_days)
+ARCHIVE_BATCH_SIZE = _settings.batch_size
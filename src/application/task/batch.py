@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from typing import List
+from uuid import UUID
+
+from src.domain.task.entity import TaskEntity
+from src.domain.task.exception import DomainError
+
+MAX_BATCH_SIZE = 1000
+MAX_BULK_IDS = 10000
+BULK_CHUNK_SIZE = 500
+EXPORT_CHUNK_SIZE = 1000
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 1000
+
+
+@dataclass
+class TaskBatchError:
+    index: int
+    error: DomainError
+
+
+@dataclass
+class TaskBatchResult:
+    created: List[TaskEntity] = field(default_factory=list)
+    errors: List[TaskBatchError] = field(default_factory=list)
+
+
+@dataclass
+class TaskBulkResult:
+    """Количество затронутых строк по каждой пачке"""
+
+    chunks: List[int] = field(default_factory=list)
+
+    @property
+    def affected(self) -> int:
+        return sum(self.chunks)
+
+
+@dataclass
+class TaskLookupResult:
+    """Задачи в порядке запрошенных id и id, которых не нашлось"""
+
+    tasks: List[TaskEntity] = field(default_factory=list)
+    missing: List[UUID] = field(default_factory=list)
+
+
+@dataclass
+class TaskImportResult:
+    """Итог импорта; index в rejected — номер строки во входном файле"""
+
+    accepted: int = 0
+    rejected_total: int = 0
+    rejected: List[TaskBatchError] = field(default_factory=list)
+
+    def reject(self, line_number: int, error: DomainError) -> None:
+        self.rejected_total += 1
+        # подробности храним для первых строк, чтобы мусорный файл не раздул память
+        if len(self.rejected) < MAX_IMPORT_ERRORS:
+            self.rejected.append(TaskBatchError(index=line_number, error=error))
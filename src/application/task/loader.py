@@ -0,0 +1,75 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set
+from uuid import UUID
+
+from src.application.task.batch import MAX_BATCH_SIZE
+from src.domain.task.entity import TaskEntity
+
+LoadMany = Callable[[Sequence[UUID]], Awaitable[Dict[UUID, TaskEntity]]]
+
+
+class TaskLoader:
+    """Собирает чтения задач по одной в пачки (DataLoader).
+
+    Все load, вызванные за одну итерацию цикла событий, уходят в базу
+    одним запросом по списку id вместо запроса на каждую задачу. Результат
+    запоминается: повторный load того же id в базу не ходит. Загрузчик
+    живёт в пределах запроса, как и сессия, через которую он читает.
+    """
+
+    def __init__(self, load_many: LoadMany, max_batch_size: int = MAX_BATCH_SIZE):
+        self._load_many = load_many
+        self.max_batch_size = max_batch_size
+        self._futures: Dict[UUID, "asyncio.Future[Optional[TaskEntity]]"] = {}
+        self._pending: List[UUID] = []
+        self._batches: Set["asyncio.Task[None]"] = set()
+        # сессия не выполняет запросы параллельно, пачки идут по очереди
+        self._lock = asyncio.Lock()
+
+    async def load(self, task_id: UUID) -> Optional[TaskEntity]:
+        """Задача или None, если её нет"""
+        future = self._futures.get(task_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[task_id] = future
+            if not self._pending:
+                # сработает после остальных load этой итерации цикла
+                loop.call_soon(self._dispatch)
+            self._pending.append(task_id)
+        # отмена одного ожидающего не отменяет результат для остальных
+        return await asyncio.shield(future)
+
+    async def load_many(self, task_ids: Sequence[UUID]) -> List[Optional[TaskEntity]]:
+        """Задачи в порядке task_ids, None на месте ненайденных"""
+        return list(await asyncio.gather(*(self.load(task_id) for task_id in task_ids)))
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._run(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run(self, batch: List[UUID]) -> None:
+        try:
+            async with self._lock:
+                for start in range(0, len(batch), self.max_batch_size):
+                    await self._load_chunk(batch[start : start + self.max_batch_size])
+        finally:
+            # загрузку прервали: ожидающие получат отмену, id загрузится заново
+            for task_id in batch:
+                future = self._futures.get(task_id)
+                if future is not None and not future.done():
+                    del self._futures[task_id]
+                    future.cancel()
+
+    async def _load_chunk(self, chunk: List[UUID]) -> None:
+        try:
+            found = await self._load_many(chunk)
+        except Exception as e:
+            for task_id in chunk:
+                # ошибка не запоминается: следующий load повторит чтение
+                self._futures.pop(task_id).set_exception(e)
+            return
+        for task_id in chunk:
+            self._futures[task_id].set_result(found.get(task_id))
@@ -0,0 +1,77 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Tuple, TypeVar, Union
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Row
+
+from src.domain.task.entity import TaskEntity
+from src.domain.task.exception import TaskValidationError
+from src.domain.task.value_object import (
+    TaskField,
+    TaskSort,
+    TaskSortField,
+    TaskStatus,
+)
+
+# (значение поля сортировки, id)
+TaskKeyset = Tuple[Any, UUID]
+
+# TaskEntity или строка Core из TaskRepository.list_rows, поля совпадают
+PageItem = TypeVar("PageItem", TaskEntity, Row[Any])
+
+
+@dataclass
+class TaskPage(Generic[PageItem]):
+    items: List[PageItem]
+    next_cursor: Optional[str] = None
+    # поля ответа при fields=; колонки сверх них строки несут в конце
+    fields: Optional[Tuple[TaskField, ...]] = None
+
+
+def encode_cursor(
+    task: Union[TaskEntity, Row[Any]], sort: Optional[TaskSort] = None
+) -> str:
+    sort = sort or TaskSort()
+    value: Any = getattr(task, sort.field.value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload: List[Any] = [value, str(task.id)]
+    if not sort.is_default():
+        # курсор действителен только для той сортировки, в которой выдан
+        payload.append(_sort_token(sort))
+    encoded = orjson.dumps(payload)
+    return base64.urlsafe_b64encode(encoded).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Optional[TaskSort] = None) -> TaskKeyset:
+    sort = sort or TaskSort()
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, task_id, *token = orjson.loads(base64.urlsafe_b64decode(padded))
+        expected = [] if sort.is_default() else [_sort_token(sort)]
+        if token != expected:
+            raise ValueError("cursor was issued for another sort")
+        if not isinstance(task_id, str):
+            # UUID(не строки) бросает AttributeError вместо ValueError
+            raise TypeError("cursor id must be a string")
+        return _parse_value(sort.field, value), UUID(task_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise TaskValidationError("cursor", cursor, "Некорректный курсор") from e
+
+
+def _sort_token(sort: TaskSort) -> str:
+    return f"{sort.field.value}:{sort.order.value}"
+
+
+def _parse_value(field: TaskSortField, value: Any) -> Any:
+    if field == TaskSortField.CREATED_AT:
+        return datetime.fromisoformat(value)
+    if field == TaskSortField.STATUS:
+        return TaskStatus(value)
+    if not isinstance(value, str):
+        raise TypeError("title must be a string")
+    return value
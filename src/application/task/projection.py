@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from src.domain.task.exception import TaskValidationError
+from src.domain.task.value_object import TaskField, TaskVersion
+
+TaskFields = Tuple[TaskField, ...]
+
+
+@dataclass
+class TaskProjection:
+    """Задача только с запрошенными полями и её версия для ETag"""
+
+    values: Dict[str, Any]
+    version: TaskVersion
+
+
+def parse_fields(value: Optional[str]) -> Optional[TaskFields]:
+    """Разбирает fields=id,title,status; None или пустая строка означают все поля"""
+    if value is None:
+        return None
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    if not names:
+        return None
+    known = {field.value for field in TaskField}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise TaskValidationError(
+            "fields", value, f"Неизвестные поля: {', '.join(unknown)}"
+        )
+    # повторы отбрасываются, порядок полей в ответе как в запросе
+    return tuple(TaskField(name) for name in dict.fromkeys(names))
+
+
+def with_required(fields: TaskFields, *required: TaskField) -> TaskFields:
+    """Дописывает в конец поля, без которых не собрать ответ (id и ключ курсора)"""
+    return fields + tuple(
+        field for field in dict.fromkeys(required) if field not in fields
+    )
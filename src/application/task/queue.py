@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List
+from uuid import UUID
+
+from src.domain.task.entity import TaskEntity
+from src.infra.config import QueueSettings
+
+MAX_CLAIM_SIZE = 100
+MAX_WORKER_LENGTH = 64
+
+_settings = QueueSettings()
+DEFAULT_LEASE = timedelta(seconds=_settings.lease)
+MAX_LEASE = timedelta(seconds=_settings.max_lease)
+
+
+@dataclass
+class TaskClaim:
+    """Задачи, взятые воркером в работу, и срок их аренды"""
+
+    lease_expires_at: datetime
+    tasks: List[TaskEntity] = field(default_factory=list)
+
+
+@dataclass
+class TaskHeartbeat:
+    """Итог продления аренды; lost — задачи, которые воркер уже не держит"""
+
+    lease_expires_at: datetime
+    extended: List[UUID] = field(default_factory=list)
+    lost: List[UUID] = field(default_factory=list)
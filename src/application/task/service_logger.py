@@ -0,0 +1,114 @@
+import logging
+from collections import defaultdict
+from collections.abc import Collection, Mapping
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict
+from uuid import UUID
+
+from src.infra.config import ServiceLogSettings
+
+_PLAIN_TYPES = frozenset({type(None), bool, int, float})
+
+
+class ServiceLogger:
+    """Фасад логирования для горячих путей сервисного слоя.
+
+    - extra собирается, только если уровень включён;
+    - UUID, enum и даты приводятся к строкам здесь, а не в месте вызова;
+    - значение-callable вызывается, только если событие действительно пишется;
+    - события из sample_rates пишутся с заданной частотой (каждое N-е);
+    - длинные коллекции и строки сокращаются до max_items / max_str_length.
+    """
+
+    def __init__(self, logger: logging.Logger, settings: ServiceLogSettings) -> None:
+        self.logger = logger
+        self.max_items = settings.max_items
+        self.max_str_length = settings.max_str_length
+        self._sample_every = {
+            action: max(1, round(1 / rate)) if rate > 0 else 0
+            for action, rate in settings.sample_rates.items()
+        }
+        self._seen: Dict[str, int] = defaultdict(int)
+
+    def debug(self, msg: str, *args: Any, action: str, **fields: Any) -> None:
+        self._log(logging.DEBUG, action, msg, args, fields)
+
+    def info(self, msg: str, *args: Any, action: str, **fields: Any) -> None:
+        self._log(logging.INFO, action, msg, args, fields)
+
+    def warning(self, msg: str, *args: Any, action: str, **fields: Any) -> None:
+        self._log(logging.WARNING, action, msg, args, fields)
+
+    def error(self, msg: str, *args: Any, action: str, **fields: Any) -> None:
+        self._log(logging.ERROR, action, msg, args, fields)
+
+    def _log(
+        self,
+        level: int,
+        action: str,
+        msg: str,
+        args: tuple[Any, ...],
+        fields: Dict[str, Any],
+    ) -> None:
+        if not self.logger.isEnabledFor(level) or not self._sampled(action):
+            return
+        extra = {name: self._compact(value) for name, value in fields.items()}
+        extra["action"] = action
+        self.logger.log(level, msg, *args, extra=extra, stacklevel=3)
+
+    def _sampled(self, action: str) -> bool:
+        every = self._sample_every.get(action)
+        if every is None:
+            return True
+        if every == 0:
+            return False
+        self._seen[action] += 1
+        # первое событие пишется всегда, дальше через every - 1 пропусков
+        return (self._seen[action] - 1) % every == 0
+
+    def _compact(self, value: Any) -> Any:
+        # быстрый путь для самых частых типов без цепочки isinstance
+        kind = type(value)
+        if kind is str:
+            return self._truncate(value)
+        if kind in _PLAIN_TYPES:
+            return value
+        if kind is UUID:
+            return str(value)
+        return self._compact_complex(value)
+
+    def _compact_complex(self, value: Any) -> Any:
+        if callable(value):
+            value = value()
+
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, (bytes, bytearray)):
+            value = repr(value)
+
+        if value is None or isinstance(value, (bool, int, float)):
+            return value
+        if isinstance(value, str):
+            return self._truncate(value)
+        if isinstance(value, Mapping):
+            return {
+                str(key.value if isinstance(key, Enum) else key): self._compact(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, Collection):
+            return self._summarize(value)
+        return self._truncate(str(value))
+
+    def _truncate(self, value: str) -> str:
+        if len(value) > self.max_str_length:
+            return value[: self.max_str_length] + "…"
+        return value
+
+    def _summarize(self, values: Collection[Any]) -> Any:
+        items = [self._compact(item) for _, item in zip(range(self.max_items), values)]
+        if len(values) > self.max_items:
+            return {"count": len(values), "sample": items}
+        return items
@@ -0,0 +1,40 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+from src.domain.task.value_object import TaskStatus
+
+
+@dataclass
+class TaskStats:
+    # включая архив: перенос задач в архив итоги не меняет
+    by_status: Dict[TaskStatus, int]
+    # сколько из них уже в tasks_archive
+    archived: Dict[TaskStatus, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_status.values())
+
+
+@dataclass
+class TaskStatsReconcileResult:
+    before: TaskStats
+    after: TaskStats
+
+    @property
+    def drift(self) -> Dict[TaskStatus, int]:
+        """Поправка по статусам, которую внёс пересчёт; пусто, если счётчики верны"""
+        before, after = self.before.by_status, self.after.by_status
+        return {
+            status: after.get(status, 0) - before.get(status, 0)
+            for status in TaskStatus
+            if after.get(status, 0) != before.get(status, 0)
+        }
+
+
+def add_counts(
+    first: Dict[TaskStatus, int], second: Dict[TaskStatus, int]
+) -> Dict[TaskStatus, int]:
+    return {
+        status: first.get(status, 0) + second.get(status, 0) for status in TaskStatus
+    }
@@ -0,0 +1,65 @@
+import base64
+import binascii
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+import orjson
+
+from src.domain.task.entity import TaskEntity
+from src.domain.task.exception import TaskValidationError
+from src.infra.config import SyncSettings
+
+# (позиция изменения, id задачи): всё до неё клиент уже получил
+ChangeKeyset = Tuple[int, UUID]
+
+START_KEYSET: ChangeKeyset = (-1, UUID(int=0))
+TOMBSTONE_RETENTION = timedelta(days=SyncSettings().tombstone_retention_days)
+
+
+@dataclass(frozen=True)
+class SyncToken:
+    keyset: ChangeKeyset = START_KEYSET
+    # когда клиент последний раз дочитал ленту до конца; удаления старше
+    # срока хранения к этому моменту могли быть уже забыты
+    synced_at: Optional[datetime] = None
+
+
+@dataclass
+class TaskChanges:
+    tasks: List[TaskEntity] = field(default_factory=list)
+    deleted: List[UUID] = field(default_factory=list)
+    token: str = ""
+    # за токеном есть ещё изменения, их нужно дочитать тем же запросом
+    has_more: bool = False
+
+
+def encode_sync_token(token: SyncToken) -> str:
+    change_seq, task_id = token.keyset
+    synced_at = token.synced_at.isoformat() if token.synced_at else None
+    encoded = orjson.dumps([change_seq, str(task_id), synced_at])
+    return base64.urlsafe_b64encode(encoded).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> SyncToken:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        change_seq, task_id, synced_at = orjson.loads(base64.urlsafe_b64decode(padded))
+        if not all(
+            (
+                isinstance(change_seq, int),
+                isinstance(task_id, str),
+                isinstance(synced_at, str),
+            )
+        ):
+            raise TypeError("malformed sync token")
+        synced = datetime.fromisoformat(synced_at)
+        # наивное время даёт TypeError при сравнении в TaskService.changes
+        if synced.tzinfo is None:
+            raise ValueError("sync token time has no timezone")
+        return SyncToken(keyset=(change_seq, UUID(task_id)), synced_at=synced)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise TaskValidationError(
+            "since", token, "Некорректный токен синхронизации"
+        ) from e
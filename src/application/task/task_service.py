@@ -1,289 +1,1470 @@
-from typing import List
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 from uuid import UUID
 
+import orjson
 from observer import get_custom_logger as get_logger
+from sqlalchemy import Row
 
+from src.application.task.archive import ARCHIVE_AFTER, ARCHIVE_BATCH_SIZE
+from src.application.task.batch import (
+    BULK_CHUNK_SIZE,
+    EXPORT_CHUNK_SIZE,
+    IMPORT_BATCH_SIZE,
+    MAX_BATCH_SIZE,
+    MAX_BULK_IDS,
+    TaskBatchError,
+    TaskBatchResult,
+    TaskBulkResult,
+    TaskImportResult,
+    TaskLookupResult,
+)
+from src.application.task.loader import TaskLoader
+from src.application.task.pagination import (
+    PageItem,
+    TaskPage,
+    decode_cursor,
+    encode_cursor,
+)
+from src.application.task.projection import (
+    TaskProjection,
+    parse_fields,
+    with_required,
+)
+from src.application.task.queue import (
+    DEFAULT_LEASE,
+    MAX_CLAIM_SIZE,
+    MAX_LEASE,
+    MAX_WORKER_LENGTH,
+    TaskClaim,
+    TaskHeartbeat,
+)
+from src.application.task.service_logger import ServiceLogger
+from src.application.task.stats import (
+    TaskStats,
+    TaskStatsReconcileResult,
+    add_counts,
+)
+from src.application.task.sync import (
+    TOMBSTONE_RETENTION,
+    SyncToken,
+    TaskChanges,
+    decode_sync_token,
+    encode_sync_token,
+)
+from src.application.task.validation import (
+    MAX_TITLE_LENGTH,
+    check_description,
+    check_fields,
+    check_title,
+)
 from src.domain.task.entity import TaskEntity
-from src.domain.task.exception import TaskNotFoundError, TaskValidationError
-from src.domain.task.value_object import TaskStatus
+from src.domain.task.exception import (
+    TaskArchivedError,
+    TaskLeaseLostError,
+    TaskNotFoundError,
+    TaskSyncExpiredError,
+    TaskValidationError,
+    TaskVersionConflictError,
+)
+from src.domain.task.value_object import (
+    TaskField,
+    TaskFilter,
+    TaskSort,
+    TaskStatus,
+    TaskVersion,
+)
+from src.infra.cache import TaskCacheBackend
+from src.infra.coalescing import SingleFlight
+from src.infra.config import ServiceLogSettings
 from src.infra.db.repositories.task_repositories import TaskRepository
+from src.infra.db.unit_of_work import UnitOfWork
+from src.infra.events import TaskEvent, TaskEventBroker, TaskEventType
 
-MAX_TITLE_LENGTH = 100
 MAX_LIMIT_VALUE = 1000
+MAX_SEARCH_LENGTH = 100
 
-logger = get_logger(__name__)
+log = ServiceLogger(get_logger(__name__), ServiceLogSettings())
+
+T = TypeVar("T")
+
+
+RepositoryScope = Callable[[], AsyncContextManager[TaskRepository]]
 
 
 class TaskService:
-    def __init__(self, repository: TaskRepository) -> None:
+    def __init__(
+        self,
+        repository: TaskRepository,
+        cache: Optional[TaskCacheBackend] = None,
+        repository_scope: Optional[RepositoryScope] = None,
+        uow: Optional[UnitOfWork] = None,
+        read_repository: Optional[Callable[[], TaskRepository]] = None,
+        events: Optional[TaskEventBroker] = None,
+        flights: Optional[SingleFlight] = None,
+    ) -> None:
         self.repository = repository
+        # чтения get/list идут сюда (реплика), пока сервис ничего не записал;
+        # репозиторий создаётся при первом таком чтении
+        self.read_repository = read_repository
+        self._read_repository: Optional[TaskRepository] = None
+        self._wrote = False
+        # по умолчанию транзакцией управляет сессия самого репозитория
+        self.uow = uow or UnitOfWork(repository.session)
+        self.cache = cache
+        # отдельная сессия для потоковых ответов, которые живут дольше запроса
+        self.repository_scope = repository_scope
+        # события create/update/delete для подписчиков ленты изменений
+        self.events = events
+        self._events: List[TaskEvent] = []
+        # общий на процесс: одинаковые одновременные чтения делят один запрос
+        self.flights = flights
+        # чтения задач по id на время запроса собираются в пачки
+        self._task_loader: Optional[TaskLoader] = None
 
     async def create(self, title: str, description: str = "") -> TaskEntity:
-        logger.info(
-            "Creating new task: title='%s', description='%s'",
+        log.info(
+            "Creating new task: title='%s'",
             title,
-            description,
-            extra={
-                "title": title,
-                "description": description,
-                "action": "task_creation_started",
-            },
+            action="task_creation_started",
+            title=title,
+            description=description,
         )
 
-        if not title or not title.strip():
-            error_msg = "Название не может быть пустым"
-            logger.error(
-                "Task validation failed: %s",
-                error_msg,
-                extra={
-                    "error": error_msg,
-                    "title": title,
-                    "action": "validation_failed",
-                },
-            )
-            raise TaskValidationError("title", title, error_msg)
-
-        if len(title) > MAX_TITLE_LENGTH:
-            error_msg = "Название не может превышать 100 символов"
-            logger.error(
-                "Task validation failed: %s, title_length=%d, max_allowed=%d",
-                error_msg,
-                len(title),
-                MAX_TITLE_LENGTH,
-                extra={
-                    "error": error_msg,
-                    "title": title,
-                    "title_length": len(title),
-                    "max_length": MAX_TITLE_LENGTH,
-                    "action": "validation_failed",
-                },
-            )
-            raise TaskValidationError("title", title, error_msg)
-
-        logger.debug(
-            "Validation passed, creating task entity",
-            extra={
-                "title": title,
-                "description": description,
-                "action": "validation_passed",
-            },
-        )
+        self._validate_title(title)
 
         task = TaskEntity(title=title.strip(), description=description.strip())
 
-        logger.debug(
+        log.debug(
             "Saving task to repository: task_id=%s",
-            str(task.id),
-            extra={
-                "task_id": str(task.id),
-                "title": task.title,
-                "action": "saving_to_repository",
-            },
+            task.id,
+            action="saving_to_repository",
+            task_id=task.id,
         )
 
         await self.repository.create(task)
+        self._publish(TaskEventType.CREATED, [task.id])
+        await self._commit()
 
-        logger.info(
+        log.info(
             "Task created successfully: task_id=%s, title='%s'",
-            str(task.id),
+            task.id,
             task.title,
-            extra={
-                "task_id": str(task.id),
-                "title": task.title,
-                "description": task.description,
-                "status": task.status.value,
-                "created_at": task.created_at.isoformat(),
-                "action": "task_created",
-            },
+            action="task_created",
+            task_id=task.id,
+            title=task.title,
+            description=task.description,
+            status=task.status,
+            created_at=task.created_at,
         )
         return task
 
+    async def create_many(self, items: Sequence[Tuple[str, str]]) -> TaskBatchResult:
+        log.info(
+            "Creating tasks batch: size=%d",
+            len(items),
+            action="task_batch_creation_started",
+            size=len(items),
+        )
+
+        if not items or len(items) > MAX_BATCH_SIZE:
+            error_msg = "Должно быть между 1 и 1000 задач"
+            log.error(
+                "Validation error: %s, size=%d, max_size=%d",
+                error_msg,
+                len(items),
+                MAX_BATCH_SIZE,
+                action="validation_failed",
+                error=error_msg,
+                size=len(items),
+                max_size=MAX_BATCH_SIZE,
+            )
+            raise TaskValidationError("tasks", len(items), error_msg)
+
+        result = TaskBatchResult()
+        for index, (title, description) in enumerate(items):
+            error = check_title(title) or check_description(description)
+            if error is not None:
+                result.errors.append(TaskBatchError(index=index, error=error))
+                continue
+            result.created.append(
+                TaskEntity(title=title.strip(), description=description.strip())
+            )
+
+        await self.repository.create_many(result.created)
+        self._publish(TaskEventType.CREATED, [task.id for task in result.created])
+        await self._commit()
+
+        log.info(
+            "Tasks batch created: created=%d, rejected=%d",
+            len(result.created),
+            len(result.errors),
+            action="task_batch_created",
+            created=len(result.created),
+            rejected=len(result.errors),
+            rejected_indexes=lambda: [error.index for error in result.errors],
+        )
+        return result
+
+    async def import_lines(
+        self, lines: AsyncIterator[bytes], upsert: bool = False
+    ) -> TaskImportResult:
+        log.info(
+            "Importing tasks: upsert=%s",
+            upsert,
+            action="task_import_started",
+            upsert=upsert,
+        )
+
+        result = TaskImportResult()
+        # номер строки нужен, если задачу отклонит уже запись пачки
+        pending: List[Tuple[int, TaskEntity]] = []
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if not line.strip():
+                continue
+            try:
+                pending.append((line_number, self._parse_import_line(line, upsert)))
+            except TaskValidationError as e:
+                result.reject(line_number, e)
+                continue
+            if len(pending) >= IMPORT_BATCH_SIZE:
+                # следующая порция тела не читается, пока пачка не записана
+                await self._flush_import(pending, upsert, result)
+                pending = []
+        await self._flush_import(pending, upsert, result)
+
+        log.info(
+            "Tasks imported: accepted=%d, rejected=%d, lines=%d",
+            result.accepted,
+            result.rejected_total,
+            line_number,
+            action="tasks_imported",
+            accepted=result.accepted,
+            rejected=result.rejected_total,
+            lines=line_number,
+            upsert=upsert,
+        )
+        return result
+
     async def get(self, task_id: UUID) -> TaskEntity:
-        logger.debug(
+        log.debug(
             "Getting task by ID: task_id=%s",
-            str(task_id),
-            extra={"task_id": str(task_id), "action": "get_task_started"},
+            task_id,
+            action="get_task_started",
+            task_id=task_id,
         )
 
-        task = await self.repository.get(task_id)
+        task = await self._get_through_cache(task_id)
         if not task:
-            logger.warning(
+            log.warning(
                 "Task not found: task_id=%s",
-                str(task_id),
-                extra={"task_id": str(task_id), "action": "task_not_found"},
+                task_id,
+                action="task_not_found",
+                task_id=task_id,
             )
             raise TaskNotFoundError(task_id)
 
-        logger.debug(
+        log.debug(
             "Task found: task_id=%s, title='%s'",
-            str(task_id),
+            task_id,
             task.title,
-            extra={
-                "task_id": str(task_id),
-                "title": task.title,
-                "status": task.status.value,
-                "action": "task_found",
-            },
+            action="task_found",
+            task_id=task_id,
+            title=task.title,
+            status=task.status,
         )
         return task
 
-    async def list(self, skip: int = 0, limit: int = 100) -> List[TaskEntity]:
-        logger.debug(
-            "Listing tasks: skip=%d, limit=%d",
+    async def get_many(self, task_ids: Sequence[UUID]) -> TaskLookupResult:
+        """Задачи по списку id одним запросом, в порядке запроса.
+
+        Повторы id схлопываются, ненайденные id перечисляются в missing.
+        """
+        log.debug(
+            "Getting tasks by IDs: count=%d",
+            len(task_ids),
+            action="get_tasks_started",
+            count=len(task_ids),
+        )
+
+        if not task_ids or len(task_ids) > MAX_BATCH_SIZE:
+            error_msg = "Должно быть между 1 и 1000 id"
+            log.error(
+                "Validation error: %s, size=%d, max_size=%d",
+                error_msg,
+                len(task_ids),
+                MAX_BATCH_SIZE,
+                action="validation_failed",
+                error=error_msg,
+                size=len(task_ids),
+                max_size=MAX_BATCH_SIZE,
+            )
+            raise TaskValidationError("ids", len(task_ids), error_msg)
+
+        requested = list(dict.fromkeys(task_ids))
+        found = await self._loader.load_many(requested)
+        result = TaskLookupResult()
+        for task_id, task in zip(requested, found):
+            if task is None:
+                result.missing.append(task_id)
+            else:
+                result.tasks.append(task)
+
+        log.debug(
+            "Tasks found: found=%d, missing=%d",
+            len(result.tasks),
+            len(result.missing),
+            action="tasks_found",
+            found=len(result.tasks),
+            missing=len(result.missing),
+            missing_ids=result.missing,
+        )
+        return result
+
+    async def get_version(self, task_id: UUID) -> TaskVersion:
+        """Версия задачи без чтения самой задачи, для условных запросов"""
+        if self.cache is not None:
+            task = await self.get(task_id)
+            return TaskVersion(version=task.version, updated_at=task.updated_at)
+
+        version = await self._coalesce(
+            ("version", task_id), partial(self._read_version, task_id)
+        )
+        if version is None:
+            log.warning(
+                "Task not found: task_id=%s",
+                task_id,
+                action="task_not_found",
+                task_id=task_id,
+            )
+            raise TaskNotFoundError(task_id)
+        return version
+
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        task_filter: Optional[TaskFilter] = None,
+        sort: Optional[TaskSort] = None,
+    ) -> TaskPage[TaskEntity]:
+        return await self._list_page(
+            self._reader.list, "tasks", skip, limit, cursor, task_filter, sort
+        )
+
+    async def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        task_filter: Optional[TaskFilter] = None,
+        sort: Optional[TaskSort] = None,
+        fields: Optional[str] = None,
+    ) -> TaskPage[Row[Any]]:
+        """Страница строк Core вместо TaskEntity, для сериализации без pydantic.
+
+        fields=id,title ограничивает выборку этими колонками; id и поле
+        сортировки читаются всегда, они нужны для курсора.
+        """
+        requested = parse_fields(fields)
+        columns = None
+        if requested is not None:
+            sort_field = TaskField((sort or TaskSort()).field.value)
+            columns = with_required(requested, TaskField.ID, sort_field)
+        page = await self._list_page(
+            partial(self._reader.list_rows, fields=columns),
+            ("rows", columns),
+            skip,
+            limit,
+            cursor,
+            task_filter,
+            sort,
+        )
+        page.fields = requested
+        return page
+
+    async def list_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        task_filter: Optional[TaskFilter] = None,
+        sort: Optional[TaskSort] = None,
+    ) -> TaskPage[Row[Any]]:
+        """Страница из id и версий задач: по ней проверяется If-None-Match"""
+        return await self._list_page(
+            self._reader.list_versions,
+            "versions",
+            skip,
+            limit,
+            cursor,
+            task_filter,
+            sort,
+        )
+
+    async def _list_page(
+        self,
+        fetch: Callable[..., Awaitable[Sequence[PageItem]]],
+        kind: Hashable,
+        skip: int,
+        limit: int,
+        cursor: Optional[str],
+        task_filter: Optional[TaskFilter],
+        sort: Optional[TaskSort],
+    ) -> TaskPage[PageItem]:
+        task_filter = task_filter or TaskFilter()
+        sort = sort or TaskSort()
+        log.debug(
+            "Listing tasks: skip=%d, limit=%d, cursor=%s",
             skip,
             limit,
-            extra={"skip": skip, "limit": limit, "action": "list_tasks_started"},
+            cursor,
+            action="list_tasks_started",
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            filter=task_filter,
+            sort=sort,
         )
 
         if skip < 0:
             error_msg = "Не может быть отрицательным"
-            logger.error(
+            log.error(
                 "Validation error: %s, skip=%d",
                 error_msg,
                 skip,
-                extra={"error": error_msg, "skip": skip, "action": "validation_failed"},
+                action="validation_failed",
+                error=error_msg,
+                skip=skip,
             )
             raise TaskValidationError("skip", skip, error_msg)
 
-        if limit <= 0 or limit > MAX_LIMIT_VALUE:
-            error_msg = "Должно быть между 1 и 1000"
-            logger.error(
-                "Validation error: %s, limit=%d, max_limit=%d",
+        self._validate_limit(limit)
+
+        search = task_filter.search or ""
+        if len(search) > MAX_SEARCH_LENGTH:
+            error_msg = "Строка поиска не может превышать 100 символов"
+            log.error(
+                "Validation error: %s, search_length=%d, max_length=%d",
                 error_msg,
-                limit,
-                MAX_LIMIT_VALUE,
-                extra={
-                    "error": error_msg,
-                    "limit": limit,
-                    "max_limit": MAX_LIMIT_VALUE,
-                    "action": "validation_failed",
-                },
+                len(search),
+                MAX_SEARCH_LENGTH,
+                action="validation_failed",
+                error=error_msg,
+                search_length=len(search),
+                max_length=MAX_SEARCH_LENGTH,
             )
-            raise TaskValidationError("limit", limit, error_msg)
+            raise TaskValidationError("q", search, error_msg)
 
-        tasks = await self.repository.list(skip, limit)
+        after = None
+        if cursor is not None:
+            if skip:
+                error_msg = "Нельзя использовать вместе с cursor"
+                log.error(
+                    "Validation error: %s, skip=%d",
+                    error_msg,
+                    skip,
+                    action="validation_failed",
+                    error=error_msg,
+                    skip=skip,
+                )
+                raise TaskValidationError("skip", skip, error_msg)
+            after = decode_cursor(cursor, sort)
 
-        logger.info(
+        tasks = list(
+            await self._coalesce(
+                ("list", kind, skip, limit, after, task_filter, sort),
+                partial(
+                    fetch, skip, limit, after=after, task_filter=task_filter, sort=sort
+                ),
+            )
+        )
+        next_cursor = encode_cursor(tasks[-1], sort) if len(tasks) == limit else None
+
+        log.info(
             "Tasks listed: count=%d, skip=%d, limit=%d",
             len(tasks),
             skip,
             limit,
-            extra={
-                "count": len(tasks),
-                "skip": skip,
-                "limit": limit,
-                "task_ids": [str(task.id) for task in tasks],
-                "action": "tasks_listed",
-            },
+            action="tasks_listed",
+            count=len(tasks),
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            next_cursor=next_cursor,
+            task_ids=lambda: [task.id for task in tasks],
+        )
+        return TaskPage(items=tasks, next_cursor=next_cursor)
+
+    async def changes(
+        self, since: Optional[str] = None, limit: int = 100
+    ) -> TaskChanges:
+        """Изменения после токена since; без since все задачи по порядку.
+
+        Каждый ответ несёт новый токен. Пока has_more, клиент запрашивает
+        следующую порцию с ним же, иначе приходит с ним в следующий раз.
+        """
+        log.debug(
+            "Listing task changes: since=%s, limit=%d",
+            since,
+            limit,
+            action="task_changes_started",
+            since=since,
+            limit=limit,
+        )
+        self._validate_limit(limit)
+        token = decode_sync_token(since) if since else SyncToken()
+        now = datetime.now(timezone.utc)
+        if token.synced_at is not None and token.synced_at < now - TOMBSTONE_RETENTION:
+            log.warning(
+                "Sync token expired: synced_at=%s",
+                token.synced_at,
+                action="task_sync_expired",
+                synced_at=token.synced_at,
+            )
+            raise TaskSyncExpiredError(token.synced_at)
+
+        changes = await self._reader.list_changes(token.keyset, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        keyset = token.keyset
+        if changes:
+            keyset = (changes[-1].change_seq, changes[-1].task_id)
+        # пока лента не дочитана, срок хранения удалений отсчитывается
+        # от момента, когда клиент дочитал её в прошлый раз
+        synced_at = (token.synced_at or now) if has_more else now
+
+        result = TaskChanges(
+            tasks=[change.task for change in changes if change.task is not None],
+            deleted=[change.task_id for change in changes if change.task is None],
+            token=encode_sync_token(SyncToken(keyset=keyset, synced_at=synced_at)),
+            has_more=has_more,
+        )
+        log.debug(
+            "Task changes listed: changed=%d, deleted=%d, has_more=%s",
+            len(result.tasks),
+            len(result.deleted),
+            has_more,
+            action="task_changes_listed",
+            changed=len(result.tasks),
+            deleted=len(result.deleted),
+            has_more=has_more,
+        )
+        return result
+
+    async def purge_tombstones(self) -> int:
+        """Удаляет следы удалений старше срока хранения, пачками"""
+        before = datetime.now(timezone.utc) - TOMBSTONE_RETENTION
+        log.info(
+            "Purging task tombstones: before=%s",
+            before,
+            action="task_tombstones_purge_started",
+            before=before,
+        )
+
+        purged = 0
+        while True:
+            count = await self.repository.purge_tombstones(before, BULK_CHUNK_SIZE)
+            await self._commit()
+            purged += count
+            if count < BULK_CHUNK_SIZE:
+                break
+
+        log.info(
+            "Task tombstones purged: count=%d",
+            purged,
+            action="task_tombstones_purged",
+            count=purged,
+        )
+        return purged
+
+    async def claim(
+        self, worker: str, n: int = 1, lease: Optional[float] = None
+    ) -> TaskClaim:
+        """Берёт в работу до n самых старых задач CREATED.
+
+        Задачи переходят в IN_PROGRESS с арендой на lease секунд. Если
+        воркер не продлит её через heartbeat и не завершит задачу, она
+        вернётся в CREATED и достанется другому.
+        """
+        log.info(
+            "Claiming tasks: worker=%s, n=%d",
+            worker,
+            n,
+            action="task_claim_started",
+            worker=worker,
+            n=n,
+            lease=lease,
+        )
+        self._validate_worker(worker)
+        if n <= 0 or n > MAX_CLAIM_SIZE:
+            error_msg = "Должно быть между 1 и 100"
+            log.error(
+                "Validation error: %s, n=%d, max_n=%d",
+                error_msg,
+                n,
+                MAX_CLAIM_SIZE,
+                action="validation_failed",
+                error=error_msg,
+                n=n,
+                max_n=MAX_CLAIM_SIZE,
+            )
+            raise TaskValidationError("n", n, error_msg)
+        expires_at = datetime.now(timezone.utc) + self._lease_duration(lease)
+
+        tasks = await self.repository.claim(worker, n, expires_at)
+        task_ids = [task.id for task in tasks]
+        self._publish(TaskEventType.UPDATED, task_ids)
+        await self._commit(task_ids)
+
+        log.info(
+            "Tasks claimed: worker=%s, count=%d",
+            worker,
+            len(tasks),
+            action="tasks_claimed",
+            worker=worker,
+            count=len(tasks),
+            lease_expires_at=expires_at,
+            task_ids=task_ids,
+        )
+        return TaskClaim(lease_expires_at=expires_at, tasks=tasks)
+
+    async def heartbeat(
+        self, worker: str, task_ids: Sequence[UUID], lease: Optional[float] = None
+    ) -> TaskHeartbeat:
+        """Продлевает аренду задач воркера; потерянные перечислены в lost"""
+        self._validate_worker(worker)
+        if not task_ids or len(task_ids) > MAX_CLAIM_SIZE:
+            error_msg = "Должно быть между 1 и 100 id"
+            log.error(
+                "Validation error: %s, size=%d, max_size=%d",
+                error_msg,
+                len(task_ids),
+                MAX_CLAIM_SIZE,
+                action="validation_failed",
+                error=error_msg,
+                size=len(task_ids),
+                max_size=MAX_CLAIM_SIZE,
+            )
+            raise TaskValidationError("ids", len(task_ids), error_msg)
+        expires_at = datetime.now(timezone.utc) + self._lease_duration(lease)
+
+        extended = set(
+            await self.repository.extend_leases(task_ids, worker, expires_at)
+        )
+        # видимые клиентам поля не менялись, кэш сбрасывать незачем
+        await self._commit()
+
+        result = TaskHeartbeat(lease_expires_at=expires_at)
+        for task_id in dict.fromkeys(task_ids):
+            (result.extended if task_id in extended else result.lost).append(task_id)
+        if result.lost:
+            log.warning(
+                "Task leases lost: worker=%s, count=%d",
+                worker,
+                len(result.lost),
+                action="task_leases_lost",
+                worker=worker,
+                count=len(result.lost),
+                task_ids=result.lost,
+            )
+        return result
+
+    async def complete(self, worker: str, task_id: UUID) -> TaskEntity:
+        """COMPLETED для задачи, которую воркер держит в аренде"""
+        self._validate_worker(worker)
+
+        task = await self.repository.complete_leased(task_id, worker)
+        if task is None:
+            if await self.repository.get_version(task_id) is None:
+                log.warning(
+                    "Task not found: task_id=%s",
+                    task_id,
+                    action="task_not_found",
+                    task_id=task_id,
+                )
+                raise TaskNotFoundError(task_id)
+            log.warning(
+                "Task lease lost: task_id=%s, worker=%s",
+                task_id,
+                worker,
+                action="task_lease_lost",
+                task_id=task_id,
+                worker=worker,
+            )
+            raise TaskLeaseLostError(task_id, worker)
+        self._publish(TaskEventType.UPDATED, [task_id])
+        await self._commit([task_id])
+
+        log.info(
+            "Task completed: task_id=%s, worker=%s",
+            task_id,
+            worker,
+            action="task_completed",
+            task_id=task_id,
+            worker=worker,
+        )
+        return task
+
+    async def requeue_expired_leases(self) -> int:
+        """Возвращает в очередь задачи воркеров, не продливших аренду"""
+        now = datetime.now(timezone.utc)
+        requeued = 0
+        while True:
+            task_ids = await self.repository.requeue_expired(now, BULK_CHUNK_SIZE)
+            self._publish(TaskEventType.UPDATED, task_ids)
+            await self._commit(task_ids)
+            requeued += len(task_ids)
+            if len(task_ids) < BULK_CHUNK_SIZE:
+                break
+
+        if requeued:
+            log.warning(
+                "Expired task leases requeued: count=%d",
+                requeued,
+                action="task_leases_requeued",
+                count=requeued,
+            )
+        return requeued
+
+    async def archive_completed(self) -> int:
+        """Переносит задачи COMPLETED, не менявшиеся ARCHIVE_AFTER, в архив.
+
+        Каждая пачка фиксируется отдельной транзакцией, поэтому архиватор не
+        держит блокировки подолгу и его можно прервать в любой момент.
+        Задачи остаются доступны по id, кэш и подписчики ничего не замечают.
+        """
+        before = datetime.now(timezone.utc) - ARCHIVE_AFTER
+        log.info(
+            "Archiving completed tasks: before=%s",
+            before,
+            action="task_archive_started",
+            before=before,
+        )
+
+        archived = 0
+        while True:
+            task_ids = await self.repository.archive_completed(
+                before, ARCHIVE_BATCH_SIZE
+            )
+            await self._commit()
+            archived += len(task_ids)
+            if len(task_ids) < ARCHIVE_BATCH_SIZE:
+                break
+
+        log.info(
+            "Completed tasks archived: count=%d",
+            archived,
+            action="tasks_archived",
+            count=archived,
+        )
+        return archived
+
+    async def get_fields(self, task_id: UUID, fields: str) -> TaskProjection:
+        """Задача только с полями из fields=id,title,status"""
+        requested = parse_fields(fields) or tuple(TaskField)
+        if self.cache is not None:
+            # полная задача из кэша дешевле похода в базу за частью колонок
+            return self._project(await self.get(task_id), requested)
+
+        row = await self._reader.get_row(task_id, requested)
+        if row is None:
+            archived = await self._reader.get_archived(task_id)
+            if archived is not None:
+                return self._project(archived, requested)
+            log.warning(
+                "Task not found: task_id=%s",
+                task_id,
+                action="task_not_found",
+                task_id=task_id,
+            )
+            raise TaskNotFoundError(task_id)
+        # версия стоит в конце строки, после запрошенных колонок
+        return TaskProjection(
+            values={field.value: value for field, value in zip(requested, row)},
+            version=TaskVersion(version=row.version, updated_at=row.updated_at),
+        )
+
+    def _project(
+        self, task: TaskEntity, requested: Sequence[TaskField]
+    ) -> TaskProjection:
+        return TaskProjection(
+            values={field.value: getattr(task, field.value) for field in requested},
+            version=TaskVersion(version=task.version, updated_at=task.updated_at),
+        )
+
+    async def stats(self) -> TaskStats:
+        archived = await self._reader.count_archived_by_status()
+        stats = TaskStats(
+            by_status=add_counts(await self._reader.count_by_status(), archived),
+            archived=archived,
+        )
+        log.debug(
+            "Task stats read: total=%d",
+            stats.total,
+            action="task_stats_read",
+            total=stats.total,
+            by_status=stats.by_status,
+        )
+        return stats
+
+    async def estimate_total(self, task_filter: TaskFilter) -> Optional[int]:
+        return await self._reader.estimate_count(task_filter)
+
+    async def reconcile_stats(self) -> TaskStatsReconcileResult:
+        log.info("Reconciling task counters", action="task_stats_reconcile_started")
+
+        before, after = await self.repository.reconcile_counters()
+        (
+            archived_before,
+            archived_after,
+        ) = await self.repository.reconcile_archive_counters()
+        await self._commit()
+        result = TaskStatsReconcileResult(
+            before=TaskStats(
+                by_status=add_counts(before, archived_before), archived=archived_before
+            ),
+            after=TaskStats(
+                by_status=add_counts(after, archived_after), archived=archived_after
+            ),
+        )
+
+        if result.drift:
+            log.warning(
+                "Task counters drifted: drift=%s",
+                result.drift,
+                action="task_stats_drift",
+                drift=result.drift,
+                total=result.after.total,
+            )
+        log.info(
+            "Task counters reconciled: total=%d",
+            result.after.total,
+            action="task_stats_reconciled",
+            total=result.after.total,
+        )
+        return result
+
+    async def export(self, task_filter: TaskFilter) -> AsyncIterator[List[TaskEntity]]:
+        log.info(
+            "Exporting tasks: filter=%s",
+            task_filter,
+            action="task_export_started",
+            filter=task_filter,
+        )
+
+        exported = 0
+        async with self._repository_scope() as repository:
+            # архив тоже выгружается: иначе восстановление из выгрузки
+            # потеряло бы все заархивированные задачи
+            for archived in (False, True):
+                async for chunk in repository.stream(
+                    task_filter, EXPORT_CHUNK_SIZE, archived=archived
+                ):
+                    exported += len(chunk)
+                    yield chunk
+
+        log.info(
+            "Tasks exported: count=%d",
+            exported,
+            action="tasks_exported",
+            count=exported,
         )
-        return tasks
 
     async def update(
-        self, task_id: UUID, title: str, description: str, status: TaskStatus
+        self,
+        task_id: UUID,
+        title: str,
+        description: str,
+        status: TaskStatus,
+        expected_versions: Optional[Sequence[int]] = None,
     ) -> TaskEntity:
-        logger.info(
-            "Updating task: task_id=%s, title='%s', description='%s', status=%s",
-            str(task_id),
+        """expected_versions: задача меняется, только если её версия среди них"""
+        log.info(
+            "Updating task: task_id=%s, title='%s', status=%s",
+            task_id,
             title,
-            description,
             status.value,
-            extra={
-                "task_id": str(task_id),
-                "title": title,
-                "description": description,
-                "status": status.value,
-                "action": "task_update_started",
+            action="task_update_started",
+            task_id=task_id,
+            title=title,
+            description=description,
+            status=status,
+        )
+
+        self._validate_title(title)
+
+        return await self._save_changes(
+            task_id,
+            {
+                "title": title.strip(),
+                "description": description.strip(),
+                "status": status,
             },
+            expected_versions,
         )
 
-        task = await self.get(task_id)
+    async def patch(
+        self,
+        task_id: UUID,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        expected_versions: Optional[Sequence[int]] = None,
+    ) -> TaskEntity:
+        log.info(
+            "Patching task: task_id=%s",
+            task_id,
+            action="task_patch_started",
+            task_id=task_id,
+            title=title,
+            description=description,
+            status=status,
+        )
+
+        values: Dict[str, Any] = {}
+        if title is not None:
+            self._validate_title(title)
+            values["title"] = title.strip()
+        if description is not None:
+            values["description"] = description.strip()
+        if status is not None:
+            values["status"] = status
+
+        if not values:
+            task = await self.get(task_id)
+            if expected_versions is not None and task.version not in expected_versions:
+                self._raise_version_conflict(task_id, expected_versions, task.version)
+            return task
+        return await self._save_changes(task_id, values, expected_versions)
 
+    async def delete(self, task_id: UUID) -> None:
+        log.info(
+            "Deleting task: task_id=%s",
+            task_id,
+            action="task_deletion_started",
+            task_id=task_id,
+        )
+
+        # DELETE ... RETURNING: отсутствие задачи видно по пустому результату
+        deleted = await self.repository.delete(task_id)
+        if not deleted:
+            await self._check_not_archived(task_id)
+            log.warning(
+                "Task not found: task_id=%s",
+                task_id,
+                action="task_not_found",
+                task_id=task_id,
+            )
+            raise TaskNotFoundError(task_id)
+        self._publish(TaskEventType.DELETED, [task_id])
+        await self._commit([task_id])
+
+        log.info(
+            "Task deleted successfully: task_id=%s",
+            task_id,
+            action="task_deleted",
+            task_id=task_id,
+        )
+
+    async def bulk_update_status(
+        self,
+        status: TaskStatus,
+        ids: Optional[Sequence[UUID]] = None,
+        task_filter: Optional[TaskFilter] = None,
+    ) -> TaskBulkResult:
+        log.info(
+            "Bulk status update: status=%s, filter=%s",
+            status.value,
+            task_filter,
+            action="task_bulk_update_started",
+            status=status,
+            ids=ids,
+            filter=task_filter,
+        )
+        self._check_bulk_target(ids, task_filter)
+
+        result = TaskBulkResult()
+        if ids is not None:
+            for start in range(0, len(ids), BULK_CHUNK_SIZE):
+                chunk = ids[start : start + BULK_CHUNK_SIZE]
+                affected_ids = await self.repository.update_status_by_ids(chunk, status)
+                self._publish(TaskEventType.UPDATED, affected_ids)
+                await self._commit(affected_ids)
+                result.chunks.append(len(affected_ids))
+        elif task_filter is not None:
+            while True:
+                affected_ids = await self.repository.update_status_by_filter(
+                    task_filter, status, BULK_CHUNK_SIZE
+                )
+                self._publish(TaskEventType.UPDATED, affected_ids)
+                await self._commit(affected_ids)
+                result.chunks.append(len(affected_ids))
+                if len(affected_ids) < BULK_CHUNK_SIZE:
+                    break
+
+        log.info(
+            "Bulk status update finished: affected=%d, chunks=%d",
+            result.affected,
+            len(result.chunks),
+            action="task_bulk_updated",
+            status=status,
+            affected=result.affected,
+            chunks=result.chunks,
+        )
+        return result
+
+    async def bulk_delete(
+        self,
+        ids: Optional[Sequence[UUID]] = None,
+        task_filter: Optional[TaskFilter] = None,
+    ) -> TaskBulkResult:
+        log.info(
+            "Bulk delete: filter=%s",
+            task_filter,
+            action="task_bulk_deletion_started",
+            ids=ids,
+            filter=task_filter,
+        )
+        self._check_bulk_target(ids, task_filter)
+
+        result = TaskBulkResult()
+        if ids is not None:
+            for start in range(0, len(ids), BULK_CHUNK_SIZE):
+                chunk = ids[start : start + BULK_CHUNK_SIZE]
+                affected_ids = await self.repository.delete_by_ids(chunk)
+                self._publish(TaskEventType.DELETED, affected_ids)
+                await self._commit(affected_ids)
+                result.chunks.append(len(affected_ids))
+        elif task_filter is not None:
+            while True:
+                affected_ids = await self.repository.delete_by_filter(
+                    task_filter, BULK_CHUNK_SIZE
+                )
+                self._publish(TaskEventType.DELETED, affected_ids)
+                await self._commit(affected_ids)
+                result.chunks.append(len(affected_ids))
+                if len(affected_ids) < BULK_CHUNK_SIZE:
+                    break
+
+        log.info(
+            "Bulk delete finished: affected=%d, chunks=%d",
+            result.affected,
+            len(result.chunks),
+            action="task_bulk_deleted",
+            affected=result.affected,
+            chunks=result.chunks,
+        )
+        return result
+
+    def _check_bulk_target(
+        self, ids: Optional[Sequence[UUID]], task_filter: Optional[TaskFilter]
+    ) -> None:
+        if (ids is None) == (task_filter is None):
+            error_msg = "Нужно указать либо ids, либо filter"
+            log.error(
+                "Validation error: %s",
+                error_msg,
+                action="validation_failed",
+                error=error_msg,
+            )
+            raise TaskValidationError("ids", ids, error_msg)
+
+        if ids is not None and (not ids or len(ids) > MAX_BULK_IDS):
+            error_msg = "Должно быть между 1 и 10000 идентификаторов"
+            log.error(
+                "Validation error: %s, ids_count=%d, max_ids=%d",
+                error_msg,
+                len(ids),
+                MAX_BULK_IDS,
+                action="validation_failed",
+                error=error_msg,
+                ids_count=len(ids),
+                max_ids=MAX_BULK_IDS,
+            )
+            raise TaskValidationError("ids", len(ids), error_msg)
+
+        if task_filter is not None and task_filter.is_empty():
+            error_msg = "Фильтр не может быть пустым"
+            log.error(
+                "Validation error: %s",
+                error_msg,
+                action="validation_failed",
+                error=error_msg,
+            )
+            raise TaskValidationError("filter", task_filter, error_msg)
+
+    def _validate_limit(self, limit: int) -> None:
+        if limit <= 0 or limit > MAX_LIMIT_VALUE:
+            error_msg = "Должно быть между 1 и 1000"
+            log.error(
+                "Validation error: %s, limit=%d, max_limit=%d",
+                error_msg,
+                limit,
+                MAX_LIMIT_VALUE,
+                action="validation_failed",
+                error=error_msg,
+                limit=limit,
+                max_limit=MAX_LIMIT_VALUE,
+            )
+            raise TaskValidationError("limit", limit, error_msg)
+
+    def _validate_worker(self, worker: str) -> None:
+        if not worker.strip() or len(worker) > MAX_WORKER_LENGTH:
+            error_msg = "Должно быть от 1 до 64 символов"
+            log.error(
+                "Validation error: %s, worker_length=%d",
+                error_msg,
+                len(worker),
+                action="validation_failed",
+                error=error_msg,
+                worker_length=len(worker),
+            )
+            raise TaskValidationError("worker", worker, error_msg)
+
+    def _lease_duration(self, lease: Optional[float]) -> timedelta:
+        if lease is None:
+            return DEFAULT_LEASE
+        duration = timedelta(seconds=lease)
+        if duration <= timedelta(0) or duration > MAX_LEASE:
+            error_msg = (
+                f"Должно быть больше 0 и не больше {MAX_LEASE.total_seconds():g} секунд"
+            )
+            log.error(
+                "Validation error: %s, lease=%s",
+                error_msg,
+                lease,
+                action="validation_failed",
+                error=error_msg,
+                lease=lease,
+            )
+            raise TaskValidationError("lease", lease, error_msg)
+        return duration
+
+    def _validate_title(self, title: str) -> None:
         if not title or not title.strip():
             error_msg = "Название не может быть пустым"
-            logger.error(
+            log.error(
                 "Task validation failed: %s",
                 error_msg,
-                extra={
-                    "error": error_msg,
-                    "title": title,
-                    "action": "validation_failed",
-                },
+                action="validation_failed",
+                error=error_msg,
+                title=title,
             )
             raise TaskValidationError("title", title, error_msg)
 
         if len(title) > MAX_TITLE_LENGTH:
             error_msg = "Название не может превышать 100 символов"
-            logger.error(
+            log.error(
                 "Task validation failed: %s, title_length=%d, max_allowed=%d",
                 error_msg,
                 len(title),
                 MAX_TITLE_LENGTH,
-                extra={
-                    "error": error_msg,
-                    "title": title,
-                    "title_length": len(title),
-                    "max_length": MAX_TITLE_LENGTH,
-                    "action": "validation_failed",
-                },
+                action="validation_failed",
+                error=error_msg,
+                title=title,
+                title_length=len(title),
+                max_length=MAX_TITLE_LENGTH,
             )
             raise TaskValidationError("title", title, error_msg)
 
-        logger.debug(
-            "Validation passed, updating task: task_id=%s",
-            str(task_id),
-            extra={"task_id": str(task_id), "action": "validation_passed"},
-        )
-
-        task.title = title.strip()
-        task.description = description.strip()
-        task.status = status
-
-        logger.debug(
+    async def _save_changes(
+        self,
+        task_id: UUID,
+        values: Dict[str, Any],
+        expected_versions: Optional[Sequence[int]] = None,
+    ) -> TaskEntity:
+        log.debug(
             "Saving updated task to repository: task_id=%s",
-            str(task_id),
-            extra={"task_id": str(task_id), "action": "saving_to_repository"},
+            task_id,
+            action="saving_to_repository",
+            task_id=task_id,
         )
 
-        await self.repository.update(task)
+        # UPDATE ... RETURNING: один запрос вместо get + update
+        task = await self.repository.update(task_id, values, expected_versions)
+        if task is None and expected_versions is not None:
+            # пустой результат при If-Match: задачи нет либо версия не совпала
+            current = await self.repository.get_version(task_id)
+            if current is not None:
+                self._raise_version_conflict(
+                    task_id, expected_versions, current.version
+                )
+        if task is None:
+            await self._check_not_archived(task_id)
+            log.warning(
+                "Task not found: task_id=%s",
+                task_id,
+                action="task_not_found",
+                task_id=task_id,
+            )
+            raise TaskNotFoundError(task_id)
+        self._publish(TaskEventType.UPDATED, [task_id])
+        await self._commit([task_id])
 
-        logger.info(
+        log.info(
             "Task updated successfully: task_id=%s, title='%s'",
-            str(task_id),
+            task_id,
             task.title,
-            extra={
-                "task_id": str(task_id),
-                "title": task.title,
-                "description": task.description,
-                "status": task.status.value,
-                "action": "task_updated",
-            },
+            action="task_updated",
+            task_id=task_id,
+            title=task.title,
+            description=task.description,
+            status=task.status,
         )
         return task
 
-    async def delete(self, task_id: UUID) -> None:
-        logger.info(
-            "Deleting task: task_id=%s",
-            str(task_id),
-            extra={"task_id": str(task_id), "action": "task_deletion_started"},
+    async def _check_not_archived(self, task_id: UUID) -> None:
+        """Задачу, которой нет в tasks, но есть в архиве, изменить нельзя"""
+        if await self.repository.get_archived(task_id) is None:
+            return
+        log.warning(
+            "Task is archived: task_id=%s",
+            task_id,
+            action="task_archived_write_rejected",
+            task_id=task_id,
         )
+        raise TaskArchivedError(task_id)
 
-        task = await self.get(task_id)
+    def _raise_version_conflict(
+        self, task_id: UUID, expected_versions: Sequence[int], actual: int
+    ) -> None:
+        log.warning(
+            "Task version conflict: task_id=%s, version=%d",
+            task_id,
+            actual,
+            action="task_version_conflict",
+            task_id=task_id,
+            expected_versions=expected_versions,
+            version=actual,
+        )
+        raise TaskVersionConflictError(task_id, expected_versions, actual)
 
-        logger.debug(
-            "Task found for deletion: task_id=%s, title='%s'",
-            str(task_id),
-            task.title,
-            extra={
-                "task_id": str(task_id),
-                "title": task.title,
-                "action": "task_found_for_deletion",
-            },
+    def _parse_import_line(self, line: bytes, upsert: bool) -> TaskEntity:
+        try:
+            data = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            raise TaskValidationError("line", line[:100], "Некорректный JSON") from e
+        if not isinstance(data, dict):
+            raise TaskValidationError("line", line[:100], "Ожидается JSON-объект")
+
+        title: Any = data.get("title")
+        description = data.get("description") or ""
+        # лимиты те же, что в create_many: восстановление их не обходит
+        error = check_fields(title, description)
+        if error is not None:
+            raise error
+
+        task = TaskEntity(title=title.strip(), description=description.strip())
+        try:
+            if "status" in data:
+                task.status = TaskStatus(data["status"])
+            if "created_at" in data:
+                task.created_at = datetime.fromisoformat(data["created_at"])
+            if upsert:
+                task.id = UUID(data["id"])
+        except KeyError as e:
+            raise TaskValidationError("id", None, "Обязателен в режиме upsert") from e
+        except (AttributeError, TypeError, ValueError) as e:
+            raise TaskValidationError("line", line[:100], str(e)) from e
+        return task
+
+    async def _flush_import(
+        self,
+        pending: List[Tuple[int, TaskEntity]],
+        upsert: bool,
+        result: TaskImportResult,
+    ) -> None:
+        if not pending:
+            return
+        tasks = [task for _, task in pending]
+        if upsert:
+            # задача из архива не возвращается в tasks: иначе она была бы
+            # в обеих таблицах; PUT/PATCH отвечают на это так же
+            archived = await self.repository.get_archived_many(
+                [task.id for task in tasks]
+            )
+            for line_number, task in pending:
+                if task.id in archived:
+                    result.reject(line_number, TaskArchivedError(task.id))
+            tasks = [task for task in tasks if task.id not in archived]
+            # ON CONFLICT не может обновить одну строку дважды в одном INSERT
+            unique_tasks = list({task.id: task for task in tasks}.values())
+            upserted_ids = [task.id for task in unique_tasks]
+            await self.repository.upsert_many(unique_tasks)
+            # upsert не различает вставку и обновление: клиент перечитает задачи
+            self._publish(TaskEventType.UPDATED, upserted_ids)
+            await self._commit(upserted_ids)
+        else:
+            await self.repository.create_many(tasks)
+            self._publish(TaskEventType.CREATED, [task.id for task in tasks])
+            await self._commit()
+        result.accepted += len(tasks)
+
+    @asynccontextmanager
+    async def _repository_scope(self) -> AsyncIterator[TaskRepository]:
+        if self.repository_scope is None:
+            yield self.repository
+            return
+        async with self.repository_scope() as repository:
+            yield repository
+
+    @property
+    def _reader(self) -> TaskRepository:
+        """Репозиторий для чтения: после записи в этом запросе только primary"""
+        if self.read_repository is None or self._wrote:
+            return self.repository
+        if self._read_repository is None:
+            self._read_repository = self.read_repository()
+        return self._read_repository
+
+    @property
+    def _loader(self) -> TaskLoader:
+        """Загрузчик задач по id с пакетным чтением, общий для запроса.
+
+        Загрузчик запоминает прочитанное, поэтому после записи создаётся
+        заново: иначе чтения вернули бы задачи до изменения.
+        """
+        if self._task_loader is None:
+            self._task_loader = TaskLoader(self._find_many)
+        return self._task_loader
+
+    async def _get_through_cache(self, task_id: UUID) -> Optional[TaskEntity]:
+        if self.cache is None:
+            return await self._coalesce(
+                ("get", task_id), partial(self._read, self._reader, task_id)
+            )
+
+        cached = await self.cache.get(task_id)
+        if cached is not None:
+            log.debug(
+                "Task cache hit: task_id=%s",
+                task_id,
+                action="task_cache_hit",
+                task_id=task_id,
+            )
+            return cached.task
+
+        return await self._coalesce(
+            ("get", task_id), partial(self._load_into_cache, self.cache, task_id)
         )
 
-        await self.repository.delete(task_id)
+    async def _load_into_cache(
+        self, cache: TaskCacheBackend, task_id: UUID
+    ) -> Optional[TaskEntity]:
+        # метка берётся до чтения: если запись инвалидирует задачу, пока
+        # чтение идёт, прочитанное в кэш уже не попадёт
+        generation = await cache.generation(task_id)
+        task = await self._read(self._reader, task_id)
+        await cache.set_if_unchanged(task_id, task, generation)
+        return task
 
-        logger.info(
-            "Task deleted successfully: task_id=%s",
-            str(task_id),
-            extra={"task_id": str(task_id), "action": "task_deleted"},
+    async def _read(
+        self, repository: TaskRepository, task_id: UUID
+    ) -> Optional[TaskEntity]:
+        """Задача из tasks, а если её там нет, из архива.
+
+        Архиватор переносит задачу одной транзакцией, поэтому между двумя
+        чтениями она не может пропасть из обоих мест.
+        """
+        task = await repository.get(task_id)
+        if task is None:
+            task = await repository.get_archived(task_id)
+        return task
+
+    async def _read_version(self, task_id: UUID) -> Optional[TaskVersion]:
+        version = await self._reader.get_version(task_id)
+        if version is not None:
+            return version
+        task = await self._reader.get_archived(task_id)
+        if task is None:
+            return None
+        return TaskVersion(version=task.version, updated_at=task.updated_at)
+
+    async def _read_many(
+        self, repository: TaskRepository, task_ids: Sequence[UUID]
+    ) -> Dict[UUID, TaskEntity]:
+        found = await repository.get_many(task_ids)
+        missing = [task_id for task_id in task_ids if task_id not in found]
+        if missing:
+            found.update(await repository.get_archived_many(missing))
+        return found
+
+    async def _find_many(self, task_ids: Sequence[UUID]) -> Dict[UUID, TaskEntity]:
+        if self.cache is None:
+            return await self._read_many(self._reader, task_ids)
+
+        # закэшированное «не найдено» тоже попадание: в базу за ним не идём
+        cached = await self.cache.get_many(task_ids)
+        misses = [task_id for task_id in task_ids if task_id not in cached]
+        # промахи читаются так же, как в _load_into_cache
+        generations = await self.cache.generations(misses)
+        loaded = await self._read_many(self._reader, misses) if misses else {}
+        await self.cache.set_many_if_unchanged(
+            {task_id: loaded.get(task_id) for task_id in misses}, generations
         )
+
+        found = {
+            task_id: entry.task
+            for task_id, entry in cached.items()
+            if entry.task is not None
+        }
+        found.update(loaded)
+        return found
+
+    async def _coalesce(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """Чтение через общий SingleFlight, если он есть.
+
+        После записи в этом запросе чтения идут мимо него: им нужен primary
+        и результат не старше собственной записи.
+        """
+        if self.flights is None or self._wrote:
+            return await load()
+        return await self.flights.do(key, load)
+
+    async def _commit(self, task_ids: Sequence[UUID] = ()) -> None:
+        """Фиксирует транзакцию и только после этого сбрасывает кэш.
+
+        Накопленные события уходят в той же транзакции, до коммита:
+        подписчики получают их только вместе с зафиксированной записью.
+        """
+        self._wrote = True
+        self._task_loader = None
+        events, self._events = self._events, []
+        if self.events is not None and events:
+            await self.events.prepare(self.uow.session, events)
+        await self.uow.commit()
+        if self.events is not None and events:
+            self.events.committed(events)
+        await self._invalidate(task_ids)
+        if self.flights is not None:
+            # начатые до коммита чтения могут вернуть старое, к ним не присоединяемся;
+            # любая запись может изменить любую страницу списка
+            written = set(task_ids)
+            self.flights.forget(lambda key: key[0] == "list" or key[1] in written)
+
+    def _publish(self, event_type: TaskEventType, task_ids: Sequence[UUID]) -> None:
+        """Событие для подписчиков, уходит со следующим _commit"""
+        if self.events is not None and task_ids:
+            self._events.append(TaskEvent(event_type, tuple(task_ids)))
+
+    async def _invalidate(self, task_ids: Sequence[UUID]) -> None:
+        if self.cache is not None and task_ids:
+            await self.cache.invalidate(task_ids)
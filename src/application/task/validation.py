@@ -0,0 +1,34 @@
+from typing import Any, Optional
+
+from src.domain.task.exception import TaskValidationError
+
+MAX_TITLE_LENGTH = 100
+MAX_DESCRIPTION_LENGTH = 1000
+
+
+def check_title(title: str) -> Optional[TaskValidationError]:
+    """Те же правила, что и в TaskService.create, но без исключения"""
+    if not title or not title.strip():
+        return TaskValidationError("title", title, "Название не может быть пустым")
+    if len(title) > MAX_TITLE_LENGTH:
+        return TaskValidationError(
+            "title", title, "Название не может превышать 100 символов"
+        )
+    return None
+
+
+def check_description(description: str) -> Optional[TaskValidationError]:
+    if len(description) > MAX_DESCRIPTION_LENGTH:
+        return TaskValidationError(
+            "description", description, "Описание не может превышать 1000 символов"
+        )
+    return None
+
+
+def check_fields(title: Any, description: Any) -> Optional[TaskValidationError]:
+    """Поля задачи из непроверенного ввода: типы и те же лимиты, что в API"""
+    if not isinstance(title, str):
+        return TaskValidationError("title", title, "Ожидается строка")
+    if not isinstance(description, str):
+        return TaskValidationError("description", description, "Ожидается строка")
+    return check_title(title) or check_description(description)
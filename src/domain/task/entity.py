@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Optional
 from uuid import UUID, uuid4
 
 from src.domain.task.value_object import TaskStatus
@@ -12,3 +13,15 @@ class TaskEntity:
     description: str = ""
     status: TaskStatus = TaskStatus.CREATED
     created_at: datetime = field(default_factory=datetime.now)
+    # растёт на единицу при каждом изменении задачи
+    version: int = 1
+    updated_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class TaskChange:
+    """Изменение для дельта-синхронизации; task=None означает удаление"""
+
+    change_seq: int
+    task_id: UUID
+    task: Optional[TaskEntity] = None
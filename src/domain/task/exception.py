@@ -1,4 +1,5 @@
-from typing import Any, Dict
+from datetime import datetime
+from typing import Any, Dict, Sequence
 from uuid import UUID
 
 
@@ -46,3 +47,76 @@ class TaskValidationError(DomainError):
 
     def body(self) -> Dict[str, Any]:
         return {"field": self.field, "value": str(self.value), "reason": self.reason}
+
+
+class TaskVersionConflictError(DomainError):
+    """Ошибка: задачу изменили после того, как клиент прочитал свою версию"""
+
+    def __init__(self, task_id: UUID, expected: Sequence[int], actual: int):
+        self.task_id = task_id
+        self.expected = list(expected)
+        self.actual = actual
+        super().__init__()
+
+    @property
+    def message(self) -> str:
+        return f"Задача с ID {self.task_id} была изменена: текущая версия {self.actual}"
+
+    def body(self) -> Dict[str, Any]:
+        return {
+            "task_id": str(self.task_id),
+            "expected": self.expected,
+            "actual": self.actual,
+        }
+
+
+class TaskSyncExpiredError(DomainError):
+    """Ошибка: токен синхронизации старше срока хранения удалений"""
+
+    def __init__(self, synced_at: datetime):
+        self.synced_at = synced_at
+        super().__init__()
+
+    @property
+    def message(self) -> str:
+        return (
+            "Токен синхронизации устарел: удаления с тех пор могли быть забыты, "
+            "нужна полная синхронизация"
+        )
+
+    def body(self) -> Dict[str, Any]:
+        return {"synced_at": self.synced_at.isoformat()}
+
+
+class TaskLeaseLostError(DomainError):
+    """Ошибка: воркер больше не держит аренду задачи"""
+
+    def __init__(self, task_id: UUID, worker: str):
+        self.task_id = task_id
+        self.worker = worker
+        super().__init__()
+
+    @property
+    def message(self) -> str:
+        return (
+            f"Задача с ID {self.task_id} не в работе у {self.worker}: "
+            "аренда истекла или задачу забрал другой воркер"
+        )
+
+    def body(self) -> Dict[str, Any]:
+        return {"task_id": str(self.task_id), "worker": self.worker}
+
+
+class TaskArchivedError(DomainError):
+    """Ошибка: задача перенесена в архив и больше не изменяется"""
+
+    def __init__(self, task_id: UUID):
+        self.task_id = task_id
+        super().__init__()
+
+    @property
+    def message(self) -> str:
+        return f"Задача с ID {self.task_id} в архиве и не может быть изменена"
+
+    def body(self) -> Dict[str, Any]:
+        return {"task_id": str(self.task_id)}
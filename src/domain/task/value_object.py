@@ -1,5 +1,8 @@
 import logging
+from dataclasses import dataclass
+from datetime import datetime
 from enum import Enum
+from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -8,3 +11,57 @@ class TaskStatus(str, Enum):
     CREATED = "CREATED"
     IN_PROGRESS = "IN_PROGRESS"
     COMPLETED = "COMPLETED"
+
+
+class TaskSortField(str, Enum):
+    CREATED_AT = "created_at"
+    TITLE = "title"
+    STATUS = "status"
+
+
+class TaskField(str, Enum):
+    ID = "id"
+    TITLE = "title"
+    DESCRIPTION = "description"
+    STATUS = "status"
+    CREATED_AT = "created_at"
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+@dataclass(frozen=True)
+class TaskFilter:
+    statuses: Tuple[TaskStatus, ...] = ()
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    # подстрока в названии или описании, без учёта регистра
+    search: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not (
+            self.statuses or self.created_after or self.created_before or self.search
+        )
+
+
+@dataclass(frozen=True)
+class TaskSort:
+    field: TaskSortField = TaskSortField.CREATED_AT
+    order: SortOrder = SortOrder.ASC
+
+    @property
+    def descending(self) -> bool:
+        return self.order == SortOrder.DESC
+
+    def is_default(self) -> bool:
+        return self == TaskSort()
+
+
+@dataclass(frozen=True)
+class TaskVersion:
+    """Номер версии задачи и время её последнего изменения"""
+
+    version: int
+    updated_at: datetime
@@ -0,0 +1,345 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID, uuid4
+
+import orjson
+
+from src.domain.task.entity import TaskEntity
+from src.domain.task.value_object import TaskStatus
+from src.infra.config import CacheSettings
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class CachedTask:
+    """Запись кэша; task=None означает закэшированное «не найдено»"""
+
+    task: Optional[TaskEntity]
+
+
+class TaskCacheBackend(ABC):
+    def __init__(self, ttl: float, negative_ttl: float) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stats = CacheStats()
+
+    @abstractmethod
+    async def get(self, task_id: UUID) -> Optional[CachedTask]:
+        pass
+
+    @abstractmethod
+    async def set(self, task_id: UUID, task: Optional[TaskEntity]) -> None:
+        pass
+
+    async def get_many(self, task_ids: Sequence[UUID]) -> Dict[UUID, CachedTask]:
+        """Записи для нескольких задач; промахов в ответе нет"""
+        found = {}
+        for task_id in task_ids:
+            cached = await self.get(task_id)
+            if cached is not None:
+                found[task_id] = cached
+        return found
+
+    @abstractmethod
+    async def invalidate(self, task_ids: Iterable[UUID]) -> None:
+        pass
+
+    @abstractmethod
+    async def generation(self, task_id: UUID) -> Hashable:
+        """Метка инвалидаций задачи; меняется при каждом invalidate"""
+
+    async def generations(self, task_ids: Sequence[UUID]) -> Dict[UUID, Hashable]:
+        """Метки для нескольких задач"""
+        return {task_id: await self.generation(task_id) for task_id in task_ids}
+
+    async def set_if_unchanged(
+        self, task_id: UUID, task: Optional[TaskEntity], generation: Hashable
+    ) -> bool:
+        """Кладёт прочитанную из базы задачу, если её не инвалидировали.
+
+        generation берётся до чтения; если метка с тех пор сменилась,
+        прочитанное могло устареть, и в кэш оно не попадает.
+        """
+        stored = await self.set_many_if_unchanged(
+            {task_id: task}, {task_id: generation}
+        )
+        return bool(stored)
+
+    async def set_many_if_unchanged(
+        self,
+        tasks: Dict[UUID, Optional[TaskEntity]],
+        generations: Dict[UUID, Hashable],
+    ) -> int:
+        """set_if_unchanged для нескольких задач; возвращает, сколько положено"""
+        current = await self.generations(list(tasks))
+        stored = 0
+        for task_id, task in tasks.items():
+            if current[task_id] == generations[task_id]:
+                await self.set(task_id, task)
+                stored += 1
+        return stored
+
+    def _ttl_for(self, task: Optional[TaskEntity]) -> float:
+        return self.ttl if task is not None else self.negative_ttl
+
+
+class InMemoryTaskCache(TaskCacheBackend):
+    """LRU с TTL внутри процесса"""
+
+    def __init__(self, max_size: int, ttl: float, negative_ttl: float) -> None:
+        super().__init__(ttl, negative_ttl)
+        self.max_size = max_size
+        self._entries: OrderedDict[UUID, Tuple[float, Optional[TaskEntity]]] = (
+            OrderedDict()
+        )
+        # номер последней инвалидации по задаче; старые номера вытесняются,
+        # и для их задач меткой служит наибольший вытесненный номер
+        self._invalidations = 0
+        self._invalidated: OrderedDict[UUID, int] = OrderedDict()
+        self._invalidated_floor = 0
+
+    async def get(self, task_id: UUID) -> Optional[CachedTask]:
+        entry = self._entries.get(task_id)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, task = entry
+        if expires_at <= time.monotonic():
+            del self._entries[task_id]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(task_id)
+        self.stats.hits += 1
+        # сущность мутабельна, наружу отдаётся копия
+        return CachedTask(replace(task) if task is not None else None)
+
+    async def set(self, task_id: UUID, task: Optional[TaskEntity]) -> None:
+        expires_at = time.monotonic() + self._ttl_for(task)
+        self._entries[task_id] = (
+            expires_at,
+            replace(task) if task is not None else None,
+        )
+        self._entries.move_to_end(task_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def invalidate(self, task_ids: Iterable[UUID]) -> None:
+        for task_id in task_ids:
+            if self._entries.pop(task_id, None) is not None:
+                self.stats.invalidations += 1
+            self._invalidations += 1
+            self._invalidated[task_id] = self._invalidations
+            self._invalidated.move_to_end(task_id)
+            if len(self._invalidated) > self.max_size:
+                _, number = self._invalidated.popitem(last=False)
+                self._invalidated_floor = number
+
+    async def generation(self, task_id: UUID) -> Hashable:
+        return self._invalidated.get(task_id, self._invalidated_floor)
+
+    async def generations(self, task_ids: Sequence[UUID]) -> Dict[UUID, Hashable]:
+        return {
+            task_id: self._invalidated.get(task_id, self._invalidated_floor)
+            for task_id in task_ids
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class KeyValueClient(Protocol):
+    """Подмножество API redis.asyncio.Redis, которое нужно кэшу"""
+
+    async def get(self, name: str) -> Optional[bytes]: ...
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]: ...
+
+    async def set(self, name: str, value: bytes, px: int) -> Any: ...
+
+    async def delete(self, *names: str) -> Any: ...
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any: ...
+
+
+# KEYS: пары (ключ задачи, ключ метки); ARGV: тройки (метка, значение, px).
+# Метка сравнивается и значение пишется в одном скрипте: invalidate другого
+# процесса не может попасть между проверкой и записью
+SET_IF_GENERATION_SCRIPT = """
+local stored = 0
+for i = 1, #KEYS / 2 do
+    local current = redis.call('GET', KEYS[2 * i]) or ''
+    if current == ARGV[3 * i - 2] then
+        redis.call('SET', KEYS[2 * i - 1], ARGV[3 * i - 1], 'PX', ARGV[3 * i])
+        stored = stored + 1
+    end
+end
+return stored
+"""
+
+
+class SharedTaskCache(TaskCacheBackend):
+    """Кэш во внешнем key-value хранилище, общий для всех процессов.
+
+    Вытеснением по размеру управляет само хранилище (maxmemory-policy),
+    поэтому счётчик evictions здесь не растёт.
+    """
+
+    def __init__(
+        self,
+        client: KeyValueClient,
+        ttl: float,
+        negative_ttl: float,
+        prefix: str = "task",
+    ) -> None:
+        super().__init__(ttl, negative_ttl)
+        self.client = client
+        self.prefix = prefix
+
+    async def get(self, task_id: UUID) -> Optional[CachedTask]:
+        raw = await self.client.get(self._key(task_id))
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return CachedTask(self._loads(raw))
+
+    async def get_many(self, task_ids: Sequence[UUID]) -> Dict[UUID, CachedTask]:
+        if not task_ids:
+            return {}
+        # один MGET вместо обращения к хранилищу на каждый id
+        raws = await self.client.mget([self._key(task_id) for task_id in task_ids])
+        found = {
+            task_id: CachedTask(self._loads(raw))
+            for task_id, raw in zip(task_ids, raws)
+            if raw is not None
+        }
+        self.stats.hits += len(found)
+        self.stats.misses += len(task_ids) - len(found)
+        return found
+
+    async def set(self, task_id: UUID, task: Optional[TaskEntity]) -> None:
+        await self.client.set(
+            self._key(task_id),
+            orjson.dumps(task),
+            px=int(self._ttl_for(task) * 1000),
+        )
+
+    async def invalidate(self, task_ids: Iterable[UUID]) -> None:
+        task_ids = list(task_ids)
+        if not task_ids:
+            return
+        # метку пишем до удаления: чтение, начатое между ними, не попадёт в кэш
+        px = int(max(self.ttl, self.negative_ttl) * 1000)
+        for task_id in task_ids:
+            await self.client.set(self._generation_key(task_id), uuid4().bytes, px=px)
+        await self.client.delete(*(self._key(task_id) for task_id in task_ids))
+        self.stats.invalidations += len(task_ids)
+
+    async def generation(self, task_id: UUID) -> Hashable:
+        return await self.client.get(self._generation_key(task_id))
+
+    async def generations(self, task_ids: Sequence[UUID]) -> Dict[UUID, Hashable]:
+        if not task_ids:
+            return {}
+        # один MGET, как и в get_many
+        raws = await self.client.mget(
+            [self._generation_key(task_id) for task_id in task_ids]
+        )
+        return dict(zip(task_ids, raws))
+
+    async def set_many_if_unchanged(
+        self,
+        tasks: Dict[UUID, Optional[TaskEntity]],
+        generations: Dict[UUID, Hashable],
+    ) -> int:
+        if not tasks:
+            return 0
+        keys: List[str] = []
+        args: List[Any] = []
+        for task_id, task in tasks.items():
+            generation = generations[task_id]
+            keys += [self._key(task_id), self._generation_key(task_id)]
+            args += [
+                # метки ещё не было: в скрипте отсутствующий ключ читается как ''
+                generation if isinstance(generation, bytes) else b"",
+                orjson.dumps(task),
+                int(self._ttl_for(task) * 1000),
+            ]
+        stored = await self.client.eval(
+            SET_IF_GENERATION_SCRIPT, len(keys), *keys, *args
+        )
+        return int(stored)
+
+    def _key(self, task_id: UUID) -> str:
+        return f"{self.prefix}:{task_id}"
+
+    def _generation_key(self, task_id: UUID) -> str:
+        return f"{self.prefix}:generation:{task_id}"
+
+    def _loads(self, raw: bytes) -> Optional[TaskEntity]:
+        data = orjson.loads(raw)
+        if data is None:
+            return None
+        return TaskEntity(
+            id=UUID(data["id"]),
+            title=data["title"],
+            description=data["description"],
+            status=TaskStatus(data["status"]),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            # записи, сделанные до появления версий, читаются как версия 1
+            version=data.get("version", 1),
+            updated_at=datetime.fromisoformat(
+                data.get("updated_at", data["created_at"])
+            ),
+        )
+
+
+def build_task_cache(settings: CacheSettings) -> Optional[TaskCacheBackend]:
+    if settings.backend == "none":
+        return None
+    if settings.backend == "redis":
+        try:
+            from redis.asyncio import Redis  # noqa: PLC0415
+        except ImportError as e:
+            raise RuntimeError(
+                "Для TASK_CACHE_BACKEND=redis нужен установленный пакет redis"
+            ) from e
+        return SharedTaskCache(
+            Redis.from_url(settings.redis_url),
+            ttl=settings.ttl,
+            negative_ttl=settings.negative_ttl,
+        )
+    return InMemoryTaskCache(
+        max_size=settings.max_size,
+        ttl=settings.ttl,
+        negative_ttl=settings.negative_ttl,
+    )
@@ -0,0 +1,84 @@
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class CoalescingStats:
+    # чтения, которые сходили в базу сами
+    leaders: int = 0
+    # чтения, дождавшиеся чужого результата вместо своего запроса
+    coalesced: int = 0
+    # ведущего отменили, и ожидавший повторил чтение сам
+    retries: int = 0
+    errors: int = 0
+    in_flight: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _consume_exception(future: "asyncio.Future[Any]") -> None:
+    # ошибку, которую никто не дождался, asyncio иначе пишет в лог при сборке
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """Одинаковые одновременные чтения внутри процесса выполняются один раз.
+
+    Первый вызов с ключом (ведущий) выполняет загрузку в своём запросе,
+    остальные с тем же ключом ждут его результат или его ошибку. Если
+    ведущего отменили (клиент ушёл), ожидающие не получают отмену чужого
+    запроса: один из них повторяет загрузку и становится ведущим.
+    """
+
+    def __init__(self) -> None:
+        self.stats = CoalescingStats()
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        while (call := self._calls.get(key)) is not None:
+            self.stats.coalesced += 1
+            try:
+                # shield: отмена ожидающего не должна отменять общий результат
+                result: T = await asyncio.shield(call)
+                return result
+            except asyncio.CancelledError:
+                if not call.cancelled():
+                    raise
+                self.stats.retries += 1
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume_exception)
+        self._calls[key] = future
+        self.stats.leaders += 1
+        self.stats.in_flight = len(self._calls)
+        try:
+            value = await load()
+        except Exception as e:
+            self.stats.errors += 1
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+            self.stats.in_flight = len(self._calls)
+            # ведущего отменили: ожидающие повторят загрузку сами
+            if not future.done():
+                future.cancel()
+
+    def forget(self, match: Callable[[Any], bool]) -> None:
+        """Новые вызовы с этими ключами не присоединяются к текущим.
+
+        Нужно после записи: чтение, начатое до коммита, может вернуть
+        старые данные, и ждать его тем, кто пришёл после, нельзя.
+        """
+        for key in [key for key in self._calls if match(key)]:
+            del self._calls[key]
+        self.stats.in_flight = len(self._calls)
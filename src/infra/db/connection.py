@@ -1,17 +1,83 @@
-from typing import AsyncGenerator
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import QueuePool
 
 from src.infra.config import PostgresSettings
-
-engine = create_async_engine(
-    PostgresSettings().dsn.unicode_string(),
-    echo=False,
-    future=True,
-    poolclass=NullPool,
+from src.infra.db.pool import (
+    InstrumentedNullPool,
+    InstrumentedQueuePool,
+    PoolStats,
+    collect_pool_stats,
+)
+from src.infra.db.replicas import ReplicaRouter, ReplicaStats
+from src.infra.db.statements import (
+    StatementCache,
+    StatementStats,
+    collect_statement_stats,
 )
+from src.infra.db.unit_of_work import UnitOfWork
+
+
+def build_engine(
+    settings: Optional[PostgresSettings] = None,
+    pool_mode: Optional[str] = None,
+    url: Optional[str] = None,
+) -> AsyncEngine:
+    settings = settings or PostgresSettings()
+    pool_mode = pool_mode or settings.pool_mode
+    url = url or settings.dsn.unicode_string()
+
+    engine_kwargs: Dict[str, Any] = {
+        "echo": False,
+        "future": True,
+        "query_cache_size": settings.query_cache_size,
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        engine_kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.statement_cache_size
+        }
+    if pool_mode == "null":
+        engine_kwargs["poolclass"] = InstrumentedNullPool
+    else:
+        engine_kwargs.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.pool_size,
+            max_overflow=settings.pool_max_overflow,
+            pool_recycle=settings.pool_recycle,
+            pool_pre_ping=settings.pool_pre_ping,
+            pool_timeout=settings.pool_timeout,
+            pool_use_lifo=True,
+        )
+    db_engine = create_async_engine(url, **engine_kwargs)
+    StatementCache(prewarm_count=settings.statement_prewarm).attach(db_engine)
+    return db_engine
+
+
+def build_replica_router(
+    primary: AsyncEngine, settings: Optional[PostgresSettings] = None
+) -> ReplicaRouter:
+    settings = settings or PostgresSettings()
+    return ReplicaRouter(
+        primary,
+        [build_engine(settings, url=dsn) for dsn in settings.replica_dsns],
+        max_lag=settings.replica_max_lag,
+    )
+
+
+engine = build_engine()
+replica_router = build_replica_router(engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -21,17 +87,108 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+# тот же пул соединений, но без BEGIN/COMMIT: для запросов только на чтение
+ReadOnlySessionLocal = async_sessionmaker(
+    bind=engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
 class Base(DeclarativeBase):
     pass
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
+@asynccontextmanager
+async def unit_of_work(read_only: bool = False) -> AsyncIterator[UnitOfWork]:
+    session_factory = ReadOnlySessionLocal if read_only else AsyncSessionLocal
+    async with session_factory() as session:
+        # незафиксированные изменения откатываются при закрытии сессии
+        yield UnitOfWork(session, read_only=read_only)
+
+
+@asynccontextmanager
+async def replica_unit_of_work(
+    router: ReplicaRouter = replica_router,
+) -> AsyncIterator[UnitOfWork]:
+    """Чтение через реплику, а если здоровых реплик нет, через primary"""
+    async with router.read_session() as session:
+        yield UnitOfWork(session, read_only=True)
+
+
+@asynccontextmanager
+async def lazy_replica_session(
+    router: ReplicaRouter = replica_router,
+) -> AsyncIterator[Callable[[], AsyncSession]]:
+    """Сессия чтения, которая открывается при первом обращении.
+
+    Движок выбирается и учитывается в статистике роутера только тогда,
+    поэтому запрос, который ничего не читал через реплику, её не трогает.
+    """
+    session: Optional[AsyncSession] = None
+
+    def open_session() -> AsyncSession:
+        nonlocal session
+        if session is None:
+            session = router.read_session()
+        return session
+
+    try:
+        yield open_session
+    finally:
+        if session is not None:
             await session.close()
+
+
+@asynccontextmanager
+async def streaming_unit_of_work(
+    router: ReplicaRouter = replica_router,
+) -> AsyncIterator[UnitOfWork]:
+    """Чтение в транзакции REPEATABLE READ, READ ONLY, через реплику, если она есть.
+
+    Для session.stream: asyncpg создаёт server-side курсор только внутри
+    транзакции, а на AUTOCOMMIT-соединении BEGIN не отправляется.
+    """
+    session = router.read_session(autocommit=False)
+    async with session, session.begin():
+        if session.bind.dialect.name == "postgresql":
+            # выгрузка читает tasks и архив двумя запросами: REPEATABLE READ
+            # даёт им один снимок, и перенос в архив между ними не задвоит задачу
+            await session.execute(
+                text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            )
+        yield UnitOfWork(session, read_only=True)
+
+
+async def warm_up_pool(db_engine: AsyncEngine, connections: int) -> int:
+    """Заранее открывает соединения, чтобы первые запросы не платили за handshake"""
+    pool = db_engine.pool
+    if not isinstance(pool, QueuePool) or connections <= 0:
+        return 0
+
+    # соединения удерживаются одновременно, иначе пул будет отдавать одно и то же
+    results = await asyncio.gather(
+        *(db_engine.connect().start() for _ in range(min(connections, pool.size()))),
+        return_exceptions=True,
+    )
+    opened = [conn for conn in results if isinstance(conn, AsyncConnection)]
+    for conn in opened:
+        await conn.close()
+
+    errors = [error for error in results if isinstance(error, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(opened)
+
+
+def get_pool_stats(db_engine: AsyncEngine = engine) -> PoolStats:
+    return collect_pool_stats(db_engine.pool)
+
+
+def get_statement_stats(db_engine: AsyncEngine = engine) -> StatementStats:
+    return collect_statement_stats(db_engine)
+
+
+def get_replica_stats(router: ReplicaRouter = replica_router) -> ReplicaStats:
+    return router.stats()
@@ -0,0 +1,37 @@
+"""tasks created_at id index
+
+Revision ID: 4d2a7c9e1b35
+Revises: 9cf910b0ae25
+Create Date: 2025-09-02 11:12:40.218531
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d2a7c9e1b35"
+down_revision: Union[str, None] = "9cf910b0ae25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY строит индекс, не блокируя запись в tasks, но не работает
+    # внутри транзакции, поэтому миграция выходит из неё на время построения
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_created_at_id",
+            "tasks",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_created_at_id", table_name="tasks", postgresql_concurrently=True
+        )
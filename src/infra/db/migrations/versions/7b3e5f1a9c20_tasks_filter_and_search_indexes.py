@@ -0,0 +1,60 @@
+"""tasks filter and search indexes
+
+Revision ID: 7b3e5f1a9c20
+Revises: 4d2a7c9e1b35
+Create Date: 2025-09-09 10:41:07.512904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b3e5f1a9c20"
+down_revision: Union[str, None] = "4d2a7c9e1b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # GIN по триграммам на большой таблице строится долго: без CONCURRENTLY
+    # запись в tasks стояла бы всё это время
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_status_created_at_id",
+            "tasks",
+            ["status", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_title_trgm",
+            "tasks",
+            ["title"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_description_trgm",
+            "tasks",
+            ["description"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in (
+            "ix_tasks_description_trgm",
+            "ix_tasks_title_trgm",
+            "ix_tasks_status_created_at_id",
+        ):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
+    # расширение pg_trgm не удаляется: им могут пользоваться другие объекты базы
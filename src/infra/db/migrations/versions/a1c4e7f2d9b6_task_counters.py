@@ -0,0 +1,112 @@
+"""task counters
+
+Revision ID: a1c4e7f2d9b6
+Revises: 7b3e5f1a9c20
+Create Date: 2025-09-16 14:03:52.781144
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a1c4e7f2d9b6"
+down_revision: Union[str, None] = "7b3e5f1a9c20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_counters",
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("status"),
+    )
+    # запись в tasks блокируется до конца миграции, чтобы между заполнением
+    # счётчиков и появлением триггеров не потерялись изменения
+    op.execute("LOCK TABLE tasks IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_counters_on_insert() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_counters (status, count)
+            SELECT status::text, count(*) FROM new_rows GROUP BY status
+            ON CONFLICT (status)
+            DO UPDATE SET count = task_counters.count + EXCLUDED.count;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_counters_on_delete() RETURNS trigger AS $$
+        BEGIN
+            UPDATE task_counters
+            SET count = task_counters.count - deleted.count
+            FROM (
+                SELECT status::text AS status, count(*) AS count
+                FROM old_rows GROUP BY status
+            ) AS deleted
+            WHERE task_counters.status = deleted.status;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_counters_on_update() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_counters (status, count)
+            SELECT status::text, sum(delta) FROM (
+                SELECT status, -1 AS delta FROM old_rows
+                UNION ALL
+                SELECT status, 1 AS delta FROM new_rows
+            ) AS changes
+            GROUP BY status
+            HAVING sum(delta) <> 0
+            ON CONFLICT (status)
+            DO UPDATE SET count = task_counters.count + EXCLUDED.count;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_counters_on_insert AFTER INSERT ON tasks
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_insert()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_counters_on_delete AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_delete()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_counters_on_update AFTER UPDATE ON tasks
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_update()
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO task_counters (status, count)
+        SELECT status::text, count(*) FROM tasks GROUP BY status
+        """
+    )
+
+
+def downgrade() -> None:
+    for operation in ("insert", "delete", "update"):
+        op.execute(f"DROP TRIGGER IF EXISTS task_counters_on_{operation} ON tasks")
+        op.execute(f"DROP FUNCTION IF EXISTS task_counters_on_{operation}()")
+    op.drop_table("task_counters")
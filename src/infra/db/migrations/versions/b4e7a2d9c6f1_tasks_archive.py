@@ -0,0 +1,149 @@
+"""tasks archive for completed tasks
+
+Revision ID: b4e7a2d9c6f1
+Revises: f3b9d1e7a4c8
+Create Date: 2025-10-13 09:41:55.730162
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+TOMBSTONES_FUNCTION = """
+CREATE OR REPLACE FUNCTION task_tombstones_on_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO task_tombstones (task_id, change_seq, deleted_at)
+    SELECT id, pg_current_xact_id()::text::bigint, now() FROM old_rows
+    {skip}ON CONFLICT (task_id) DO UPDATE
+    SET change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+# строки, которые архиватор перенёс в tasks_archive, не удалены для клиентов
+SKIP_ARCHIVED = """WHERE NOT EXISTS (
+        SELECT 1 FROM tasks_archive WHERE tasks_archive.id = old_rows.id
+    )
+    """
+# счётчики архива по статусам, как task_counters для tasks
+ARCHIVE_COUNTER_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION task_archive_counters_on_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO task_archive_counters (status, count)
+        SELECT status::text, count(*) FROM new_rows GROUP BY status
+        ON CONFLICT (status)
+        DO UPDATE SET count = task_archive_counters.count + EXCLUDED.count;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION task_archive_counters_on_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE task_archive_counters
+        SET count = task_archive_counters.count - deleted.count
+        FROM (
+            SELECT status::text AS status, count(*) AS count
+            FROM old_rows GROUP BY status
+        ) AS deleted
+        WHERE task_archive_counters.status = deleted.status;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER task_archive_counters_on_insert AFTER INSERT ON tasks_archive
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_archive_counters_on_insert()
+    """,
+    """
+    CREATE TRIGGER task_archive_counters_on_delete AFTER DELETE ON tasks_archive
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_archive_counters_on_delete()
+    """,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e7a2d9c6f1"
+down_revision: Union[str, None] = "f3b9d1e7a4c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("title", sa.String(length=100), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "CREATED",
+                "IN_PROGRESS",
+                "COMPLETED",
+                name="taskstatus",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # архив пуст, поэтому счётчики не нужно заполнять: их ведут триггеры
+    op.create_table(
+        "task_archive_counters",
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("status"),
+    )
+    for statement in ARCHIVE_COUNTER_TRIGGERS:
+        op.execute(statement)
+    op.execute(TOMBSTONES_FUNCTION.format(skip=SKIP_ARCHIVED))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_archivable",
+            "tasks",
+            ["updated_at"],
+            unique=False,
+            postgresql_where=sa.text("status = 'COMPLETED'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    # задачи из архива возвращаются в tasks, иначе пропадут при удалении таблицы
+    op.execute(
+        """
+        INSERT INTO tasks (id, title, description, status, created_at, updated_at,
+                           version)
+        SELECT id, title, description, status, created_at, updated_at, version
+        FROM tasks_archive
+        ON CONFLICT (id) DO NOTHING
+        """
+    )
+    op.execute(TOMBSTONES_FUNCTION.format(skip=""))
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_archivable", table_name="tasks", postgresql_concurrently=True
+        )
+    for operation in ("insert", "delete"):
+        op.execute(
+            f"DROP TRIGGER IF EXISTS task_archive_counters_on_{operation} "
+            "ON tasks_archive"
+        )
+        op.execute(f"DROP FUNCTION IF EXISTS task_archive_counters_on_{operation}()")
+    op.drop_table("task_archive_counters")
+    op.drop_table("tasks_archive")
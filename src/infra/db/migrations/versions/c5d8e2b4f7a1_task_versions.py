@@ -0,0 +1,41 @@
+"""task versions
+
+Revision ID: c5d8e2b4f7a1
+Revises: a1c4e7f2d9b6
+Create Date: 2025-09-22 11:26:40.318207
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d8e2b4f7a1"
+down_revision: Union[str, None] = "a1c4e7f2d9b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # значения по умолчанию не volatile, поэтому Postgres не переписывает
+    # таблицу; updated_at существующих задач равен времени миграции
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "version")
+    op.drop_column("tasks", "updated_at")
@@ -0,0 +1,110 @@
+"""task change sequence and tombstones
+
+Revision ID: e8f1a3c6d9b2
+Revises: c5d8e2b4f7a1
+Create Date: 2025-09-29 16:48:12.604391
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8f1a3c6d9b2"
+down_revision: Union[str, None] = "c5d8e2b4f7a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # существующие задачи получают позицию 0 и попадают в первую полную
+    # синхронизацию, переписывать таблицу ради них не нужно
+    op.add_column(
+        "tasks",
+        sa.Column("change_seq", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_change_seq_id",
+            "tasks",
+            ["change_seq", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+    op.create_table(
+        "task_tombstones",
+        sa.Column("task_id", sa.UUID(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+    op.create_index(
+        "ix_task_tombstones_change_seq_task_id",
+        "task_tombstones",
+        ["change_seq", "task_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_task_tombstones_deleted_at",
+        "task_tombstones",
+        ["deleted_at"],
+        unique=False,
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION tasks_change_seq() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_seq := pg_current_xact_id()::text::bigint;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_tombstones_on_delete() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO task_tombstones (task_id, change_seq, deleted_at)
+            SELECT id, pg_current_xact_id()::text::bigint, now() FROM old_rows
+            ON CONFLICT (task_id) DO UPDATE
+            SET change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER tasks_change_seq BEFORE INSERT OR UPDATE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION tasks_change_seq()
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER task_tombstones_on_delete AFTER DELETE ON tasks
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION task_tombstones_on_delete()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS task_tombstones_on_delete ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS task_tombstones_on_delete()")
+    op.execute("DROP TRIGGER IF EXISTS tasks_change_seq ON tasks")
+    op.execute("DROP FUNCTION IF EXISTS tasks_change_seq()")
+    op.drop_index("ix_task_tombstones_deleted_at", table_name="task_tombstones")
+    op.drop_index("ix_task_tombstones_change_seq_task_id", table_name="task_tombstones")
+    op.drop_table("task_tombstones")
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_change_seq_id", table_name="tasks", postgresql_concurrently=True
+        )
+    op.drop_column("tasks", "change_seq")
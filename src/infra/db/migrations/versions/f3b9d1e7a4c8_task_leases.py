@@ -0,0 +1,67 @@
+"""task leases for the worker queue
+
+Revision ID: f3b9d1e7a4c8
+Revises: e8f1a3c6d9b2
+Create Date: 2025-10-06 11:02:37.218804
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+CHANGE_SEQ_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_change_seq() RETURNS trigger AS $$
+BEGIN
+    {skip}NEW.change_seq := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+# продление аренды меняет только lease_expires_at, версию не трогает
+SKIP_UNVERSIONED_UPDATE = """IF TG_OP = 'UPDATE' AND NEW.version = OLD.version THEN
+        RETURN NEW;
+    END IF;
+    """
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b9d1e7a4c8"
+down_revision: Union[str, None] = "e8f1a3c6d9b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tasks", sa.Column("lease_owner", sa.String(64), nullable=True))
+    op.add_column(
+        "tasks",
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(CHANGE_SEQ_FUNCTION.format(skip=SKIP_UNVERSIONED_UPDATE))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_claimable",
+            "tasks",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_where=sa.text("status = 'CREATED'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_lease_expires_at",
+            "tasks",
+            ["lease_expires_at"],
+            unique=False,
+            postgresql_where=sa.text("lease_expires_at IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.execute(CHANGE_SEQ_FUNCTION.format(skip=""))
+    with op.get_context().autocommit_block():
+        for name in ("ix_tasks_lease_expires_at", "ix_tasks_claimable"):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
+    op.drop_column("tasks", "lease_expires_at")
+    op.drop_column("tasks", "lease_owner")
@@ -1,7 +1,18 @@
 import uuid
 from datetime import datetime
+from typing import Optional
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -12,6 +23,46 @@ from src.infra.db.connection import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tasks_change_seq_id", "change_seq", "id"),
+        # очередь воркеров: индекс только по задачам, ждущим исполнителя,
+        # поэтому история выполненных задач на размер индекса не влияет
+        Index(
+            "ix_tasks_claimable",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'CREATED'"),
+            sqlite_where=text("status = 'CREATED'"),
+        ),
+        # кандидаты в архив: выполненные задачи по времени последнего изменения
+        Index(
+            "ix_tasks_archivable",
+            "updated_at",
+            postgresql_where=text("status = 'COMPLETED'"),
+            sqlite_where=text("status = 'COMPLETED'"),
+        ),
+        Index(
+            "ix_tasks_lease_expires_at",
+            "lease_expires_at",
+            postgresql_where=text("lease_expires_at IS NOT NULL"),
+            sqlite_where=text("lease_expires_at IS NOT NULL"),
+        ),
+        # триграммы для поиска подстроки через ILIKE; на sqlite это обычный индекс
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_tasks_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PG_UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -22,3 +73,321 @@ class Task(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    # номер версии для ETag и If-Match, растёт при каждом UPDATE в TaskRepository
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1, server_default="1"
+    )
+    # позиция в ленте изменений для GET /tasks/changes, ставит триггер
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    # аренда задачи воркером, взявшим её через POST /tasks/claim
+    lease_owner: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class TaskCounter(Base):
+    """Число задач по статусам; поддерживается триггерами на tasks"""
+
+    __tablename__ = "task_counters"
+
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class TaskArchive(Base):
+    """Выполненные задачи, перенесённые из tasks архиватором.
+
+    Списки видят только tasks, задача из архива доступна по id и попадает
+    в выгрузку. Индекс здесь только первичный ключ.
+    """
+
+    __tablename__ = "tasks_archive"
+
+    id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    title: Mapped[str] = mapped_column(String(100), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=True)
+    status: Mapped[TaskStatus] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class TaskArchiveCounter(Base):
+    """Число задач в архиве по статусам; поддерживается триггерами на tasks_archive"""
+
+    __tablename__ = "task_archive_counters"
+
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+
+class TaskTombstone(Base):
+    """След удалённой задачи для дельта-синхронизации; хранится retention дней"""
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_change_seq_task_id", "change_seq", "task_id"),
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+    task_id: Mapped[uuid.UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+# Триггеры для create_all; в рабочей базе их создаёт миграция a1c4e7f2d9b6.
+# Postgres вызывает триггер один раз на оператор и передаёт ему transition
+# tables, поэтому COPY и массовые UPDATE/DELETE обновляют счётчик один раз.
+POSTGRES_COUNTER_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION task_counters_on_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO task_counters (status, count)
+        SELECT status::text, count(*) FROM new_rows GROUP BY status
+        ON CONFLICT (status)
+        DO UPDATE SET count = task_counters.count + EXCLUDED.count;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION task_counters_on_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE task_counters
+        SET count = task_counters.count - deleted.count
+        FROM (
+            SELECT status::text AS status, count(*) AS count
+            FROM old_rows GROUP BY status
+        ) AS deleted
+        WHERE task_counters.status = deleted.status;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION task_counters_on_update() RETURNS trigger AS $$
+    BEGIN
+        -- строки, где статус не менялся, дают нулевую разницу и не трогают счётчик
+        INSERT INTO task_counters (status, count)
+        SELECT status::text, sum(delta) FROM (
+            SELECT status, -1 AS delta FROM old_rows
+            UNION ALL
+            SELECT status, 1 AS delta FROM new_rows
+        ) AS changes
+        GROUP BY status
+        HAVING sum(delta) <> 0
+        ON CONFLICT (status)
+        DO UPDATE SET count = task_counters.count + EXCLUDED.count;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER task_counters_on_insert AFTER INSERT ON tasks
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_insert()
+    """,
+    """
+    CREATE TRIGGER task_counters_on_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_delete()
+    """,
+    """
+    CREATE TRIGGER task_counters_on_update AFTER UPDATE ON tasks
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_counters_on_update()
+    """,
+)
+
+# sqlite (тесты) умеет только построчные триггеры
+SQLITE_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER task_counters_on_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER task_counters_on_delete AFTER DELETE ON tasks
+    BEGIN
+        UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+    END
+    """,
+    """
+    CREATE TRIGGER task_counters_on_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE task_counters SET count = count - 1 WHERE status = OLD.status;
+        INSERT INTO task_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+)
+
+# Счётчики архива: перенос из tasks уменьшает task_counters и ровно на столько
+# же увеличивает task_archive_counters, итог /tasks/stats не меняется.
+# Повторный перенос того же id идёт через ON CONFLICT DO UPDATE и в INSERT-
+# триггеры не попадает, статус в архиве всегда COMPLETED.
+POSTGRES_ARCHIVE_COUNTER_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION task_archive_counters_on_insert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO task_archive_counters (status, count)
+        SELECT status::text, count(*) FROM new_rows GROUP BY status
+        ON CONFLICT (status)
+        DO UPDATE SET count = task_archive_counters.count + EXCLUDED.count;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION task_archive_counters_on_delete() RETURNS trigger AS $$
+    BEGIN
+        UPDATE task_archive_counters
+        SET count = task_archive_counters.count - deleted.count
+        FROM (
+            SELECT status::text AS status, count(*) AS count
+            FROM old_rows GROUP BY status
+        ) AS deleted
+        WHERE task_archive_counters.status = deleted.status;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER task_archive_counters_on_insert AFTER INSERT ON tasks_archive
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_archive_counters_on_insert()
+    """,
+    """
+    CREATE TRIGGER task_archive_counters_on_delete AFTER DELETE ON tasks_archive
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_archive_counters_on_delete()
+    """,
+)
+
+SQLITE_ARCHIVE_COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER task_archive_counters_on_insert AFTER INSERT ON tasks_archive
+    BEGIN
+        INSERT INTO task_archive_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER task_archive_counters_on_delete AFTER DELETE ON tasks_archive
+    BEGIN
+        UPDATE task_archive_counters SET count = count - 1 WHERE status = OLD.status;
+    END
+    """,
+)
+
+# Позиция изменения на Postgres: id записавшей транзакции. Чтение ленты
+# берёт только транзакции старше xmin своего снимка, поэтому транзакция,
+# зафиксированная позже соседей по номеру, не будет пропущена клиентом,
+# который уже получил токен дальше неё.
+POSTGRES_CHANGE_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION tasks_change_seq() RETURNS trigger AS $$
+    BEGIN
+        -- UPDATE без новой версии (продление аренды) в ленту изменений не попадает
+        IF TG_OP = 'UPDATE' AND NEW.version = OLD.version THEN
+            RETURN NEW;
+        END IF;
+        NEW.change_seq := pg_current_xact_id()::text::bigint;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION task_tombstones_on_delete() RETURNS trigger AS $$
+    BEGIN
+        -- перенос в архив не удаление: задача по-прежнему читается по id
+        INSERT INTO task_tombstones (task_id, change_seq, deleted_at)
+        SELECT id, pg_current_xact_id()::text::bigint, now() FROM old_rows
+        WHERE NOT EXISTS (
+            SELECT 1 FROM tasks_archive WHERE tasks_archive.id = old_rows.id
+        )
+        ON CONFLICT (task_id) DO UPDATE
+        SET change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tasks_change_seq BEFORE INSERT OR UPDATE ON tasks
+    FOR EACH ROW EXECUTE FUNCTION tasks_change_seq()
+    """,
+    """
+    CREATE TRIGGER task_tombstones_on_delete AFTER DELETE ON tasks
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_tombstones_on_delete()
+    """,
+)
+
+# sqlite пишет в одну транзакцию за раз, поэтому хватает счётчика в таблице
+SQLITE_CHANGE_TRIGGERS = (
+    "CREATE TABLE IF NOT EXISTS task_change_seq (value INTEGER NOT NULL)",
+    """
+    INSERT INTO task_change_seq (value)
+    SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM task_change_seq)
+    """,
+    """
+    CREATE TRIGGER tasks_change_seq_on_insert AFTER INSERT ON tasks
+    BEGIN
+        UPDATE task_change_seq SET value = value + 1;
+        UPDATE tasks SET change_seq = (SELECT value FROM task_change_seq)
+        WHERE id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_change_seq_on_update AFTER UPDATE ON tasks
+    WHEN NEW.change_seq IS OLD.change_seq AND NEW.version IS NOT OLD.version
+    BEGIN
+        UPDATE task_change_seq SET value = value + 1;
+        UPDATE tasks SET change_seq = (SELECT value FROM task_change_seq)
+        WHERE id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER task_tombstones_on_delete AFTER DELETE ON tasks
+    WHEN NOT EXISTS (SELECT 1 FROM tasks_archive WHERE tasks_archive.id = OLD.id)
+    BEGIN
+        UPDATE task_change_seq SET value = value + 1;
+        INSERT INTO task_tombstones (task_id, change_seq, deleted_at)
+        VALUES (OLD.id, (SELECT value FROM task_change_seq), CURRENT_TIMESTAMP)
+        ON CONFLICT (task_id) DO UPDATE
+        SET change_seq = excluded.change_seq, deleted_at = excluded.deleted_at;
+    END
+    """,
+)
+
+for table, dialect, statements in (
+    (
+        Task.__table__,
+        "postgresql",
+        POSTGRES_COUNTER_TRIGGERS + POSTGRES_CHANGE_TRIGGERS,
+    ),
+    (Task.__table__, "sqlite", SQLITE_COUNTER_TRIGGERS + SQLITE_CHANGE_TRIGGERS),
+    (TaskArchive.__table__, "postgresql", POSTGRES_ARCHIVE_COUNTER_TRIGGERS),
+    (TaskArchive.__table__, "sqlite", SQLITE_ARCHIVE_COUNTER_TRIGGERS),
+):
+    for statement in statements:
+        ddl = DDL(statement)  # type: ignore [no-untyped-call]
+        event.listen(table, "after_create", ddl.execute_if(dialect=dialect))
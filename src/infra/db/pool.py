@@ -0,0 +1,112 @@
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    NullPool,
+    Pool,
+    QueuePool,
+)
+
+
+@dataclass
+class AcquireStats:
+    """Счётчики ожидания соединения из пула"""
+
+    waiting: int = 0
+    checked_out: int = 0
+    acquired: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    mode: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    waiting: int
+    acquired: int
+    timeouts: int
+    avg_acquire_wait_ms: float
+    max_acquire_wait_ms: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _AcquireStatsMixin:
+    """Замеряет время, которое checkout проводит в ожидании соединения.
+
+    Pool._do_get вызывается синхронно внутри greenlet, поэтому счётчики
+    не требуют блокировок.
+    """
+
+    acquire_stats: AcquireStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.acquire_stats = AcquireStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        stats = self.acquire_stats
+        stats.waiting += 1
+        started = time.perf_counter()
+        try:
+            entry: ConnectionPoolEntry = super()._do_get()  # type: ignore [misc]
+        except exc.TimeoutError:
+            stats.timeouts += 1
+            raise
+        finally:
+            stats.waiting -= 1
+        elapsed = time.perf_counter() - started
+        stats.acquired += 1
+        stats.checked_out += 1
+        stats.total_wait_seconds += elapsed
+        stats.max_wait_seconds = max(stats.max_wait_seconds, elapsed)
+        return entry
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        self.acquire_stats.checked_out -= 1
+        super()._do_return_conn(record)  # type: ignore [misc]
+
+
+class InstrumentedQueuePool(_AcquireStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_AcquireStatsMixin, NullPool):
+    pass
+
+
+def collect_pool_stats(pool: Pool) -> PoolStats:
+    stats: AcquireStats = getattr(pool, "acquire_stats", AcquireStats())
+    avg_wait = stats.total_wait_seconds / stats.acquired if stats.acquired else 0.0
+    if isinstance(pool, QueuePool):
+        mode = "queue"
+        size = pool.size()
+        checked_in = pool.checkedin()
+        checked_out = pool.checkedout()
+        overflow = max(pool.overflow(), 0)
+    else:
+        mode = "null"
+        size = checked_in = overflow = 0
+        checked_out = stats.checked_out
+    return PoolStats(
+        mode=mode,
+        size=size,
+        checked_in=checked_in,
+        checked_out=checked_out,
+        overflow=overflow,
+        waiting=stats.waiting,
+        acquired=stats.acquired,
+        timeouts=stats.timeouts,
+        avg_acquire_wait_ms=avg_wait * 1000,
+        max_acquire_wait_ms=stats.max_wait_seconds * 1000,
+    )
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from itertools import count
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+# отставание реплики в секундах; если весь полученный WAL уже применён,
+# отставания нет, даже когда primary давно ничего не писал
+POSTGRES_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(
+            extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+@dataclass
+class ReplicaStatus:
+    name: str
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    error: Optional[str] = None
+    checked_at: Optional[float] = None
+    reads: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ReplicaStats:
+    # чтения, ушедшие в primary, потому что здоровых реплик не было
+    primary_reads: int
+    replicas: List[ReplicaStatus]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _Replica:
+    engine: AsyncEngine
+    status: ReplicaStatus
+
+
+class ReplicaRouter:
+    """Выбирает движок для чтения: здоровую реплику или primary.
+
+    Реплика считается здоровой, если последняя проверка прошла и отставание
+    не больше max_lag секунд. Если здоровых реплик нет, чтение идёт
+    в primary, поэтому падение реплики не ломает GET-запросы.
+    """
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: Sequence[AsyncEngine] = (),
+        max_lag: float = 5.0,
+        check_timeout: float = 2.0,
+    ) -> None:
+        self.primary = primary
+        self.max_lag = max_lag
+        self.check_timeout = check_timeout
+        self.primary_reads = 0
+        self._replicas = [
+            _Replica(engine, ReplicaStatus(name=_engine_name(engine)))
+            for engine in replicas
+        ]
+        self._turn = count()
+        self._session_factories: Dict[
+            Tuple[AsyncEngine, bool], async_sessionmaker[AsyncSession]
+        ] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._replicas)
+
+    def read_engine(self) -> AsyncEngine:
+        healthy = [replica for replica in self._replicas if replica.status.healthy]
+        if not healthy:
+            self.primary_reads += 1
+            return self.primary
+        replica = healthy[next(self._turn) % len(healthy)]
+        replica.status.reads += 1
+        return replica.engine
+
+    def read_session(self, autocommit: bool = True) -> AsyncSession:
+        """Сессия выбранного для чтения движка.
+
+        По умолчанию на AUTOCOMMIT-соединении; autocommit=False нужен
+        потоковому чтению: server-side курсор живёт только в транзакции.
+        """
+        engine = self.read_engine()
+        factory = self._session_factories.get((engine, autocommit))
+        if factory is None:
+            bind = (
+                engine.execution_options(isolation_level="AUTOCOMMIT")
+                if autocommit
+                else engine
+            )
+            factory = async_sessionmaker(
+                bind=bind,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+            )
+            self._session_factories[(engine, autocommit)] = factory
+        return factory()
+
+    async def check(self) -> List[ReplicaStatus]:
+        await asyncio.gather(*(self._check(replica) for replica in self._replicas))
+        return self.statuses()
+
+    async def run_checks(self, interval: float) -> None:
+        """Периодическая проверка реплик, запускается фоновой задачей"""
+        while True:
+            await self.check()
+            await asyncio.sleep(interval)
+
+    def statuses(self) -> List[ReplicaStatus]:
+        return [replica.status for replica in self._replicas]
+
+    def stats(self) -> ReplicaStats:
+        return ReplicaStats(primary_reads=self.primary_reads, replicas=self.statuses())
+
+    async def dispose(self) -> None:
+        for replica in self._replicas:
+            await replica.engine.dispose()
+
+    async def _check(self, replica: _Replica) -> None:
+        status = replica.status
+        try:
+            lag = await asyncio.wait_for(
+                self._measure_lag(replica.engine), self.check_timeout
+            )
+        except Exception as e:
+            status.healthy = False
+            status.lag_seconds = None
+            status.error = f"{type(e).__name__}: {e}"
+        else:
+            status.lag_seconds = lag
+            status.healthy = lag <= self.max_lag
+            status.error = None if status.healthy else "lag exceeds max_lag"
+        status.checked_at = time.time()
+
+    async def _measure_lag(self, engine: AsyncEngine) -> float:
+        async with engine.connect() as conn:
+            if engine.dialect.name != "postgresql":
+                # отставание измеряется только для Postgres, здесь хватит SELECT 1
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            return float((await conn.execute(POSTGRES_LAG_QUERY)).scalar_one())
+
+
+def _engine_name(engine: AsyncEngine) -> str:
+    return engine.url.render_as_string(hide_password=True)
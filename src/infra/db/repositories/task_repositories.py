@@ -1,13 +1,115 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 from uuid import UUID
 
-from sqlalchemy import delete, select, update
+import orjson
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
-from src.domain.task.entity import TaskEntity
-from src.domain.task.value_object import TaskStatus
-from src.infra.db.models.task import Task
+from src.domain.task.entity import TaskChange, TaskEntity
+from src.domain.task.value_object import (
+    TaskField,
+    TaskFilter,
+    TaskSort,
+    TaskSortField,
+    TaskStatus,
+    TaskVersion,
+)
+from src.infra.db.models.task import (
+    Task,
+    TaskArchive,
+    TaskArchiveCounter,
+    TaskCounter,
+    TaskTombstone,
+)
+
+# asyncpg COPY выгоднее многострочного INSERT для пачек от этого размера
+COPY_MIN_ROWS = 200
+COPY_COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "status",
+    "created_at",
+    "version",
+    "updated_at",
+]
+# колонки ответа API; версия сверх них нужна для ETag и TaskEntity
+TASK_COLUMNS = (Task.id, Task.title, Task.description, Task.status, Task.created_at)
+VERSION_COLUMNS = (Task.version, Task.updated_at)
+ENTITY_COLUMNS = (*TASK_COLUMNS, *VERSION_COLUMNS)
+# те же колонки в том же порядке: INSERT ... SELECT переносит строки один в один
+ARCHIVE_COLUMNS = (
+    TaskArchive.id,
+    TaskArchive.title,
+    TaskArchive.description,
+    TaskArchive.status,
+    TaskArchive.created_at,
+    TaskArchive.version,
+    TaskArchive.updated_at,
+)
+FIELD_COLUMNS: Dict[TaskField, InstrumentedAttribute[Any]] = {
+    TaskField.ID: Task.id,
+    TaskField.TITLE: Task.title,
+    TaskField.DESCRIPTION: Task.description,
+    TaskField.STATUS: Task.status,
+    TaskField.CREATED_AT: Task.created_at,
+}
+SORT_COLUMNS = {
+    TaskSortField.CREATED_AT: Task.created_at,
+    TaskSortField.TITLE: Task.title,
+    TaskSortField.STATUS: Task.status,
+}
+LIKE_ESCAPE = "\\"
+# статус константой в тексте запроса, не параметром: только так generic plan
+# подготовленного запроса докажет условие частичного индекса ix_tasks_claimable
+CLAIMABLE = Task.status == literal_column("'CREATED'")
+# то же для ix_tasks_archivable
+ARCHIVABLE = Task.status == literal_column("'COMPLETED'")
+# все транзакции до этого id уже завершены: их изменения видны целиком
+CHANGE_HORIZON_QUERY = text(
+    "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+)
+
+
+def escape_like(value: str) -> str:
+    """Экранирует %, _ и сам символ экранирования для LIKE/ILIKE"""
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
 
 
 class TaskRepositoryInterface(ABC):
@@ -43,27 +145,623 @@ class TaskRepository:
         task = result.scalar_one_or_none()
         return self._to_entity(task) if task else None
 
-    async def list(self, skip: int = 0, limit: int = 100) -> List[TaskEntity]:
-        result = await self.session.execute(select(Task).offset(skip).limit(limit))
+    async def get_many(self, task_ids: Sequence[UUID]) -> Dict[UUID, TaskEntity]:
+        """Задачи по списку id одним запросом; ненайденных id в ответе нет.
+
+        На Postgres список уходит одним параметром-массивом (id = ANY):
+        текст запроса не зависит от числа id, и подготовленный запрос
+        переиспользуется для списков любой длины.
+        """
+        return await self._get_many(Task.id, ENTITY_COLUMNS, task_ids)
+
+    async def get_archived(self, task_id: UUID) -> Optional[TaskEntity]:
+        result = await self.session.execute(
+            select(*ARCHIVE_COLUMNS).where(TaskArchive.id == task_id)
+        )
+        row = result.one_or_none()
+        return self._row_to_entity(row) if row else None
+
+    async def get_archived_many(
+        self, task_ids: Sequence[UUID]
+    ) -> Dict[UUID, TaskEntity]:
+        return await self._get_many(TaskArchive.id, ARCHIVE_COLUMNS, task_ids)
+
+    async def get_row(
+        self, task_id: UUID, fields: Sequence[TaskField]
+    ) -> Optional[Row[Any]]:
+        """Только нужные колонки: описание не читается, если его не просили.
+
+        Версия задачи стоит в конце строки после запрошенных колонок.
+        """
+        result = await self.session.execute(
+            select(*self._columns(fields), *VERSION_COLUMNS).where(Task.id == task_id)
+        )
+        return result.one_or_none()
+
+    async def get_version(self, task_id: UUID) -> Optional[TaskVersion]:
+        """Только версия: для If-None-Match и If-Match сама задача не нужна"""
+        result = await self.session.execute(
+            select(*VERSION_COLUMNS).where(Task.id == task_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return TaskVersion(version=row.version, updated_at=row.updated_at)
+
+    async def list(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[Any, UUID]] = None,
+        task_filter: Optional[TaskFilter] = None,
+        sort: Optional[TaskSort] = None,
+    ) -> List[TaskEntity]:
+        query = self._list_query(select(Task), skip, limit, after, task_filter, sort)
+        result = await self.session.execute(query)
         tasks = result.scalars().all()
         return [self._to_entity(task) for task in tasks]
 
+    async def list_rows(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[Any, UUID]] = None,
+        task_filter: Optional[TaskFilter] = None,
+        sort: Optional[TaskSort] = None,
+        fields: Optional[Sequence[TaskField]] = None,
+    ) -> Sequence[Row[Any]]:
+        """То же, что list, но строки Core: без ORM-объектов и TaskEntity.
+
+        fields ограничивает выборку этими колонками в заданном порядке,
+        версия задачи всегда стоит в конце строки.
+        """
+        query = self._list_query(
+            select(*self._columns(fields), *VERSION_COLUMNS),
+            skip,
+            limit,
+            after,
+            task_filter,
+            sort,
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def list_versions(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[Any, UUID]] = None,
+        task_filter: Optional[TaskFilter] = None,
+        sort: Optional[TaskSort] = None,
+    ) -> Sequence[Row[Any]]:
+        """Та же страница, что у list_rows, но только id, версии и ключ курсора"""
+        sort_column = SORT_COLUMNS[(sort or TaskSort()).field]
+        query = self._list_query(
+            select(Task.id, *VERSION_COLUMNS, sort_column),
+            skip,
+            limit,
+            after,
+            task_filter,
+            sort,
+        )
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def list_changes(
+        self, after: Tuple[int, UUID], limit: int
+    ) -> List[TaskChange]:
+        """Задачи и удаления с позицией после after, по возрастанию позиции.
+
+        Оба запроса идут по индексам (change_seq, id), поэтому стоят
+        пропорционально числу изменений, а не размеру таблицы. На Postgres
+        берутся только транзакции, завершённые к началу чтения.
+        """
+        horizon = await self._change_horizon()
+        task_query = (
+            select(*ENTITY_COLUMNS, Task.change_seq)
+            .where(tuple_(Task.change_seq, Task.id) > after)
+            .order_by(Task.change_seq, Task.id)
+            .limit(limit)
+        )
+        # задачу могли удалить, затем создать заново под тем же id (upsert)
+        recreated = select(Task.id).where(Task.id == TaskTombstone.task_id).exists()
+        tombstone_query = (
+            select(TaskTombstone.task_id, TaskTombstone.change_seq)
+            .where(
+                tuple_(TaskTombstone.change_seq, TaskTombstone.task_id) > after,
+                ~recreated,
+            )
+            .order_by(TaskTombstone.change_seq, TaskTombstone.task_id)
+            .limit(limit)
+        )
+        if horizon is not None:
+            task_query = task_query.where(Task.change_seq < horizon)
+            tombstone_query = tombstone_query.where(TaskTombstone.change_seq < horizon)
+
+        tasks = (await self.session.execute(task_query)).all()
+        tombstones = (await self.session.execute(tombstone_query)).all()
+        changes = [
+            TaskChange(row.change_seq, row.id, self._row_to_entity(row))
+            for row in tasks
+        ] + [TaskChange(row.change_seq, row.task_id) for row in tombstones]
+        changes.sort(key=lambda change: (change.change_seq, change.task_id))
+        return changes[:limit]
+
+    async def purge_tombstones(self, before: datetime, limit: int) -> int:
+        chunk = (
+            select(TaskTombstone.task_id)
+            .where(TaskTombstone.deleted_at < before)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            delete(TaskTombstone)
+            .where(TaskTombstone.task_id.in_(chunk.scalar_subquery()))
+            .returning(TaskTombstone.task_id)
+            .execution_options(synchronize_session=False)
+        )
+        return len(result.all())
+
+    async def count_by_status(self) -> Dict[TaskStatus, int]:
+        """Задачи в tasks по статусам, без архива"""
+        return await self._read_counters(TaskCounter)
+
+    async def count_archived_by_status(self) -> Dict[TaskStatus, int]:
+        return await self._read_counters(TaskArchiveCounter)
+
+    async def estimate_count(self, task_filter: TaskFilter) -> Optional[int]:
+        """Без фильтра точное число из счётчиков, с фильтром оценка планировщика.
+
+        Оценка берётся из EXPLAIN и стоит как планирование запроса, без его
+        выполнения. На sqlite планировщик оценок не даёт, поэтому там None.
+        """
+        if task_filter.is_empty():
+            return sum((await self.count_by_status()).values())
+
+        connection = await self.session.connection()
+        if connection.dialect.name != "postgresql":
+            return None
+        query = select(Task.id).where(*self._filter_clauses(task_filter))
+        compiled = query.compile(
+            dialect=connection.dialect, compile_kwargs={"literal_binds": True}
+        )
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+        plan = result.scalar_one()
+        if isinstance(plan, (str, bytes)):
+            plan = orjson.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def reconcile_counters(
+        self,
+    ) -> Tuple[Dict[TaskStatus, int], Dict[TaskStatus, int]]:
+        """Пересчитывает счётчики по таблице tasks, возвращает (было, стало)"""
+        return await self._reconcile(Task, TaskCounter)
+
+    async def reconcile_archive_counters(
+        self,
+    ) -> Tuple[Dict[TaskStatus, int], Dict[TaskStatus, int]]:
+        """То же для tasks_archive и task_archive_counters"""
+        return await self._reconcile(TaskArchive, TaskArchiveCounter)
+
+    async def stream(
+        self, task_filter: TaskFilter, chunk_size: int, archived: bool = False
+    ) -> AsyncIterator[List[TaskEntity]]:
+        """Задачи из tasks или, с archived=True, из архива.
+
+        Архив идёт по первичному ключу: других индексов у него нет,
+        и порядок по created_at потребовал бы сортировки всей таблицы.
+        """
+        # колонки вместо ORM-объектов: строки не копятся в identity map сессии
+        if archived:
+            query = (
+                select(*ARCHIVE_COLUMNS)
+                .where(*self._filter_clauses(task_filter, TaskArchive))
+                .order_by(TaskArchive.id)
+            )
+        else:
+            query = (
+                select(*ENTITY_COLUMNS)
+                .where(*self._filter_clauses(task_filter))
+                .order_by(Task.created_at, Task.id)
+            )
+        query = query.execution_options(yield_per=chunk_size)
+        result = await self.session.stream(query)
+        async for rows in result.partitions():
+            yield [self._row_to_entity(row) for row in rows]
+
     async def create(self, task: TaskEntity) -> None:
         db_task = self._to_model(task)
         self.session.add(db_task)
-        await self.session.commit()
+        await self.session.flush()
+
+    async def create_many(self, tasks: Sequence[TaskEntity]) -> None:
+        if not tasks:
+            return
+        connection = await self.session.connection()
+        if len(tasks) >= COPY_MIN_ROWS and connection.dialect.driver == "asyncpg":
+            raw_connection = await connection.get_raw_connection()
+            asyncpg_connection: Any = raw_connection.driver_connection
+            await asyncpg_connection.copy_records_to_table(
+                Task.__tablename__,
+                records=[self._to_record(task) for task in tasks],
+                columns=COPY_COLUMNS,
+            )
+        else:
+            # insertmanyvalues: один INSERT ... VALUES (...), (...) на пачку строк
+            await self.session.execute(
+                insert(Task),
+                [dict(zip(COPY_COLUMNS, self._to_record(task))) for task in tasks],
+            )
 
-    async def update(self, task: TaskEntity) -> None:
+    async def upsert_many(self, tasks: Sequence[TaskEntity]) -> None:
+        if not tasks:
+            return
+        connection = await self.session.connection()
+        dialect_insert = (
+            sqlite_insert if connection.dialect.name == "sqlite" else postgresql_insert
+        )
+        query = dialect_insert(Task).values(
+            [dict(zip(COPY_COLUMNS, self._to_record(task))) for task in tasks]
+        )
         await self.session.execute(
+            query.on_conflict_do_update(
+                index_elements=[Task.id],
+                set_={
+                    "title": query.excluded.title,
+                    "description": query.excluded.description,
+                    "status": query.excluded.status,
+                    "created_at": query.excluded.created_at,
+                    **self._next_version(),
+                },
+            )
+        )
+
+    async def update(
+        self,
+        task_id: UUID,
+        values: Dict[str, Any],
+        expected_versions: Optional[Sequence[int]] = None,
+    ) -> Optional[TaskEntity]:
+        """UPDATE ... RETURNING: пустой результат означает, что задачи нет.
+
+        С expected_versions строка меняется, только если её версия среди
+        них, иначе результат тоже пустой. Проверка версии и запись идут
+        одним UPDATE, поэтому строку не нужно блокировать заранее.
+        """
+        query = update(Task).where(Task.id == task_id)
+        if expected_versions is not None:
+            query = query.where(Task.version.in_(expected_versions))
+        result = await self.session.execute(
+            query.values(**values, **self._next_version())
+            .returning(*ENTITY_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        return self._row_to_entity(row) if row else None
+
+    async def delete(self, task_id: UUID) -> bool:
+        result = await self.session.execute(
+            delete(Task)
+            .where(Task.id == task_id)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def update_status_by_ids(
+        self, ids: Sequence[UUID], status: TaskStatus
+    ) -> List[UUID]:
+        result = await self.session.execute(
             update(Task)
-            .where(Task.id == task.id)
-            .values(title=task.title, description=task.description, status=task.status)
+            .where(Task.id.in_(ids))
+            .values(status=status, **self._next_version())
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
         )
-        await self.session.commit()
+        return list(result.scalars().all())
 
-    async def delete(self, task_id: UUID) -> None:
-        await self.session.execute(delete(Task).where(Task.id == task_id))
-        await self.session.commit()
+    async def update_status_by_filter(
+        self, task_filter: TaskFilter, status: TaskStatus, limit: int
+    ) -> List[UUID]:
+        # строки уже в целевом статусе исключаются, иначе пачки не закончатся
+        chunk = (
+            select(Task.id)
+            .where(*self._filter_clauses(task_filter), Task.status != status)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            update(Task)
+            .where(Task.id.in_(chunk.scalar_subquery()))
+            .values(status=status, **self._next_version())
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def claim(
+        self, worker: str, limit: int, expires_at: datetime
+    ) -> List[TaskEntity]:
+        """Переводит до limit самых старых задач CREATED в работу worker.
+
+        SKIP LOCKED пропускает строки, которые в этот момент забирают другие
+        воркеры: параллельные claim получают разные задачи, не ожидая друг
+        друга, и каждый обходится одним запросом.
+        """
+        claimable = (
+            select(Task.id)
+            .where(CLAIMABLE)
+            .order_by(Task.created_at, Task.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("claimable")
+        )
+        result = await self.session.execute(
+            update(Task)
+            .where(Task.id == claimable.c.id)
+            .values(
+                status=TaskStatus.IN_PROGRESS,
+                lease_owner=worker,
+                lease_expires_at=expires_at,
+                **self._next_version(),
+            )
+            .returning(*ENTITY_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        # порядок строк RETURNING не гарантирован
+        tasks = [self._row_to_entity(row) for row in result.all()]
+        return sorted(tasks, key=lambda task: (task.created_at, task.id))
+
+    async def extend_leases(
+        self, ids: Sequence[UUID], worker: str, expires_at: datetime
+    ) -> List[UUID]:
+        """Продлевает аренду задач, которые всё ещё в работе у worker.
+
+        Версия не растёт: для клиентов задача не изменилась.
+        """
+        result = await self.session.execute(
+            update(Task)
+            .where(
+                Task.id.in_(ids),
+                Task.status == TaskStatus.IN_PROGRESS,
+                Task.lease_owner == worker,
+            )
+            .values(lease_expires_at=expires_at)
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def complete_leased(self, task_id: UUID, worker: str) -> Optional[TaskEntity]:
+        """COMPLETED, если задача ещё в работе у worker; иначе None"""
+        result = await self.session.execute(
+            update(Task)
+            .where(
+                Task.id == task_id,
+                Task.status == TaskStatus.IN_PROGRESS,
+                Task.lease_owner == worker,
+            )
+            .values(
+                status=TaskStatus.COMPLETED,
+                lease_owner=None,
+                lease_expires_at=None,
+                **self._next_version(),
+            )
+            .returning(*ENTITY_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        return self._row_to_entity(row) if row else None
+
+    async def requeue_expired(self, now: datetime, limit: int) -> List[UUID]:
+        """Возвращает в CREATED задачи, аренда которых истекла к now"""
+        expired = (
+            select(Task.id)
+            .where(Task.status == TaskStatus.IN_PROGRESS, Task.lease_expires_at < now)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("expired")
+        )
+        result = await self.session.execute(
+            update(Task)
+            .where(Task.id == expired.c.id)
+            .values(
+                status=TaskStatus.CREATED,
+                lease_owner=None,
+                lease_expires_at=None,
+                **self._next_version(),
+            )
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def archive_completed(self, before: datetime, limit: int) -> List[UUID]:
+        """Переносит до limit задач COMPLETED, не менявшихся с before, в архив.
+
+        Пачка выбирается FOR UPDATE SKIP LOCKED: параллельные архиваторы
+        берут разные строки, а запись в задачу из пачки дождётся коммита и
+        задачу в tasks уже не найдёт. Копия в архиве перезаписывается, если
+        задачу с тем же id туда уже переносили.
+        """
+        chunk = (
+            select(Task.id)
+            .where(ARCHIVABLE, Task.updated_at < before)
+            .order_by(Task.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        ids = list((await self.session.execute(chunk)).scalars().all())
+        if not ids:
+            return []
+
+        connection = await self.session.connection()
+        dialect_insert = (
+            sqlite_insert if connection.dialect.name == "sqlite" else postgresql_insert
+        )
+        query = dialect_insert(TaskArchive).from_select(
+            [column.key for column in ARCHIVE_COLUMNS],
+            select(*ENTITY_COLUMNS).where(Task.id.in_(ids)),
+        )
+        await self.session.execute(
+            query.on_conflict_do_update(
+                index_elements=[TaskArchive.id],
+                set_={
+                    "title": query.excluded.title,
+                    "description": query.excluded.description,
+                    "status": query.excluded.status,
+                    "created_at": query.excluded.created_at,
+                    "version": query.excluded.version,
+                    "updated_at": query.excluded.updated_at,
+                    "archived_at": func.now(),
+                },
+            )
+        )
+        await self.session.execute(
+            delete(Task)
+            .where(Task.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        return ids
+
+    async def delete_by_ids(self, ids: Sequence[UUID]) -> List[UUID]:
+        result = await self.session.execute(
+            delete(Task)
+            .where(Task.id.in_(ids))
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def delete_by_filter(self, task_filter: TaskFilter, limit: int) -> List[UUID]:
+        chunk = select(Task.id).where(*self._filter_clauses(task_filter)).limit(limit)
+        result = await self.session.execute(
+            delete(Task)
+            .where(Task.id.in_(chunk.scalar_subquery()))
+            .returning(Task.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def _change_horizon(self) -> Optional[int]:
+        """xmin снимка на Postgres; sqlite пишет по одной транзакции, там None"""
+        connection = await self.session.connection()
+        if connection.dialect.name != "postgresql":
+            return None
+        return int((await self.session.execute(CHANGE_HORIZON_QUERY)).scalar_one())
+
+    async def _read_counters(
+        self, counter: Type[TaskCounter] | Type[TaskArchiveCounter]
+    ) -> Dict[TaskStatus, int]:
+        result = await self.session.execute(select(counter.status, counter.count))
+        counts = dict.fromkeys(TaskStatus, 0)
+        for status, count in result.all():
+            counts[TaskStatus(status)] = count
+        return counts
+
+    async def _reconcile(
+        self,
+        source: Type[Task] | Type[TaskArchive],
+        counter: Type[TaskCounter] | Type[TaskArchiveCounter],
+    ) -> Tuple[Dict[TaskStatus, int], Dict[TaskStatus, int]]:
+        connection = await self.session.connection()
+        if connection.dialect.name == "postgresql":
+            # запись в таблицу ждёт до конца транзакции, чтение не блокируется
+            await connection.exec_driver_sql(
+                f"LOCK TABLE {source.__tablename__} IN SHARE MODE"
+            )
+        before = await self._read_counters(counter)
+
+        result = await self.session.execute(
+            select(source.status, func.count()).group_by(source.status)
+        )
+        after = dict.fromkeys(TaskStatus, 0)
+        for status, count in result.all():
+            after[status] = count
+
+        await self.session.execute(delete(counter))
+        await self.session.execute(
+            insert(counter),
+            [
+                {"status": status.value, "count": count}
+                for status, count in after.items()
+            ],
+        )
+        return before, after
+
+    async def _get_many(
+        self,
+        id_column: InstrumentedAttribute[UUID],
+        columns: Sequence[InstrumentedAttribute[Any]],
+        task_ids: Sequence[UUID],
+    ) -> Dict[UUID, TaskEntity]:
+        if not task_ids:
+            return {}
+        connection = await self.session.connection()
+        if connection.dialect.name == "postgresql":
+            ids = bindparam("task_ids", list(task_ids), ARRAY(PG_UUID(as_uuid=True)))
+            clause = id_column == any_(ids)
+        else:
+            clause = id_column.in_(task_ids)
+        result = await self.session.execute(select(*columns).where(clause))
+        return {row.id: self._row_to_entity(row) for row in result.all()}
+
+    def _next_version(self) -> Dict[str, Any]:
+        return {"version": Task.version + 1, "updated_at": func.now()}
+
+    def _columns(
+        self, fields: Optional[Sequence[TaskField]]
+    ) -> Sequence[InstrumentedAttribute[Any]]:
+        if not fields:
+            return TASK_COLUMNS
+        return [FIELD_COLUMNS[field] for field in fields]
+
+    def _list_query(
+        self,
+        query: Select[Any],
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[Any, UUID]],
+        task_filter: Optional[TaskFilter],
+        sort: Optional[TaskSort],
+    ) -> Select[Any]:
+        sort = sort or TaskSort()
+        column = SORT_COLUMNS[sort.field]
+        ordering = (
+            (column.desc(), Task.id.desc()) if sort.descending else (column, Task.id)
+        )
+        query = (
+            query.where(*self._filter_clauses(task_filter or TaskFilter()))
+            .order_by(*ordering)
+            .limit(limit)
+        )
+        if after is not None:
+            # keyset: поиск по индексу (поле сортировки, id) вместо пропуска skip строк
+            keyset = tuple_(column, Task.id)
+            return query.where(keyset < after if sort.descending else keyset > after)
+        return query.offset(skip)
+
+    def _filter_clauses(
+        self,
+        task_filter: TaskFilter,
+        model: Union[Type[Task], Type[TaskArchive]] = Task,
+    ) -> List[ColumnElement[bool]]:
+        clauses: List[ColumnElement[bool]] = []
+        if task_filter.statuses:
+            clauses.append(model.status.in_(task_filter.statuses))
+        if task_filter.created_after is not None:
+            clauses.append(model.created_at >= task_filter.created_after)
+        if task_filter.created_before is not None:
+            clauses.append(model.created_at < task_filter.created_before)
+        if task_filter.search:
+            # ILIKE на Postgres использует GIN-индексы pg_trgm,
+            # на sqlite компилируется в lower(...) LIKE lower(...)
+            pattern = f"%{escape_like(task_filter.search)}%"
+            clauses.append(
+                or_(
+                    model.title.ilike(pattern, escape=LIKE_ESCAPE),
+                    model.description.ilike(pattern, escape=LIKE_ESCAPE),
+                )
+            )
+        return clauses
 
     def _to_entity(self, task: Task) -> TaskEntity:
         return TaskEntity(
@@ -72,6 +770,30 @@ class TaskRepository:
             description=task.description,
             status=task.status,
             created_at=task.created_at,
+            version=task.version,
+            updated_at=task.updated_at,
+        )
+
+    def _row_to_entity(self, row: Row[Any]) -> TaskEntity:
+        return TaskEntity(
+            id=row.id,
+            title=row.title,
+            description=row.description or "",
+            status=row.status,
+            created_at=row.created_at,
+            version=row.version,
+            updated_at=row.updated_at,
+        )
+
+    def _to_record(self, task: TaskEntity) -> Tuple[Any, ...]:
+        return (
+            task.id,
+            task.title,
+            task.description,
+            task.status.value,
+            task.created_at,
+            task.version,
+            task.updated_at,
         )
 
     def _to_model(self, task: TaskEntity) -> Task:
@@ -81,4 +803,6 @@ class TaskRepository:
             description=task.description,
             status=task.status,
             created_at=task.created_at,
+            version=task.version,
+            updated_at=task.updated_at,
         )
@@ -0,0 +1,134 @@
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Dialect, Engine, ExecutionContext
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import ConnectionPoolEntry
+
+# предел числа разных запросов, для которых считаются частоты: IN (...)
+# даёт новый текст запроса на каждую длину списка
+MAX_TRACKED_STATEMENTS = 1000
+
+
+@dataclass
+class StatementStats:
+    """Счётчики переиспользования запросов.
+
+    compiled_* относятся к кэшу скомпилированных выражений SQLAlchemy,
+    prepared_* к кэшу prepared statements asyncpg на соединении.
+    """
+
+    compiled_hits: int = 0
+    compiled_misses: int = 0
+    prepared_hits: int = 0
+    prepared_misses: int = 0
+    prewarmed: int = 0
+    prewarm_errors: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class StatementCache:
+    """Следит за кэшами запросов движка и готовит частые запросы заранее.
+
+    На новом соединении asyncpg выполняется PREPARE для prewarm_count самых
+    частых запросов, которые движок уже выполнял, и они сразу попадают
+    в кэш prepared statements соединения.
+    """
+
+    def __init__(self, prewarm_count: int = 0) -> None:
+        self.prewarm_count = prewarm_count
+        self.stats = StatementStats()
+        self._frequency: Counter[str] = Counter()
+        self._dialect: Optional[Dialect] = None
+
+    def attach(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        self._dialect = sync_engine.dialect
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(sync_engine, "connect", self._on_connect)
+        _caches[sync_engine] = self
+
+    def hot_statements(self) -> List[str]:
+        return [
+            statement
+            for statement, _ in self._frequency.most_common(self.prewarm_count)
+        ]
+
+    def _before_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Optional[ExecutionContext],
+        executemany: bool,
+    ) -> None:
+        if executemany:
+            # asyncpg выполняет executemany мимо кэша prepared statements
+            return
+        if (
+            statement in self._frequency
+            or len(self._frequency) < MAX_TRACKED_STATEMENTS
+        ):
+            self._frequency[statement] += 1
+
+        cache = _prepared_cache(conn.connection.dbapi_connection)
+        if cache is None:
+            return
+        if statement in cache:
+            self.stats.prepared_hits += 1
+        else:
+            self.stats.prepared_misses += 1
+
+    def _after_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Optional[ExecutionContext],
+        executemany: bool,
+    ) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CacheStats.CACHE_HIT:
+            self.stats.compiled_hits += 1
+        elif cache_hit is CacheStats.CACHE_MISS:
+            self.stats.compiled_misses += 1
+
+    def _on_connect(self, dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        prepare = getattr(dbapi_connection, "_prepare", None)
+        if _prepared_cache(dbapi_connection) is None or prepare is None:
+            return
+        # отметка инвалидации схемы та же, что передаёт курсор адаптера; при
+        # текущем времени адаптер счёл бы кэш устаревшим и вызвал reload_schema_state
+        invalidated_at = getattr(self._dialect, "_invalidate_schema_cache_asof", 0)
+        for statement in self.hot_statements():
+            try:
+                # адаптер SQLAlchemy кладёт результат PREPARE в свой LRU-кэш,
+                # и первое выполнение запроса берёт готовый план оттуда
+                dbapi_connection.await_(prepare(statement, invalidated_at))
+            except Exception:
+                # запрос мог устареть после миграции: соединение всё равно годно
+                self.stats.prewarm_errors += 1
+            else:
+                self.stats.prewarmed += 1
+
+
+_caches: "WeakKeyDictionary[Engine, StatementCache]" = WeakKeyDictionary()
+
+
+def _prepared_cache(dbapi_connection: Any) -> Optional[Any]:
+    """LRU-кэш prepared statements адаптера asyncpg; у других драйверов его нет"""
+    return getattr(dbapi_connection, "_prepared_statement_cache", None)
+
+
+def collect_statement_stats(engine: AsyncEngine) -> StatementStats:
+    cache = _caches.get(engine.sync_engine)
+    return cache.stats if cache is not None else StatementStats()
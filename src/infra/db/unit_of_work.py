@@ -0,0 +1,33 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class UnitOfWork:
+    """Граница транзакции запроса.
+
+    Репозитории только выполняют запросы и flush, фиксирует изменения
+    сервисный слой через commit. В режиме read_only сессия работает на
+    AUTOCOMMIT-соединении: нет ни BEGIN, ни COMMIT/ROLLBACK.
+    """
+
+    def __init__(self, session: AsyncSession, read_only: bool = False) -> None:
+        self.session = session
+        self.read_only = read_only
+        self.commits = 0
+
+    async def commit(self) -> None:
+        if self.read_only:
+            return
+        await self.session.commit()
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
+
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncIterator[None]:
+        """Вложенная транзакция: ошибка внутри откатывает только её"""
+        async with self.session.begin_nested():
+            yield
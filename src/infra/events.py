@@ -0,0 +1,295 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.infra.config import EventSettings
+
+logger = logging.getLogger(__name__)
+
+# payload NOTIFY ограничен 8000 байт: около 100 UUID в одном уведомлении
+NOTIFY_MAX_IDS = 100
+# потолок задержки между неудачными попытками переподключения слушателя
+MAX_RECONNECT_DELAY = 30.0
+
+
+class TaskEventType(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    # события могли потеряться: клиент должен перечитать список задач
+    RESET = "reset"
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    type: TaskEventType
+    task_ids: Tuple[UUID, ...]
+
+    def to_json(self) -> bytes:
+        return orjson.dumps({"type": self.type, "task_ids": self.task_ids})
+
+    @classmethod
+    def from_json(cls, raw: str) -> "TaskEvent":
+        data = orjson.loads(raw)
+        return cls(
+            type=TaskEventType(data["type"]),
+            task_ids=tuple(UUID(task_id) for task_id in data["task_ids"]),
+        )
+
+
+@dataclass
+class EventStats:
+    subscribers: int = 0
+    published: int = 0
+    delivered: int = 0
+    # подписчики, отключённые из-за переполненной очереди
+    dropped: int = 0
+    listener_reconnects: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class TaskSubscription:
+    """Очередь событий одного клиента.
+
+    Очередь ограничена: если клиент не успевает её разбирать, брокер
+    отключает его вместо того, чтобы копить события в памяти.
+    """
+
+    def __init__(self, broker: "TaskEventBroker", queue_size: int) -> None:
+        self.broker = broker
+        self.overflowed = False
+        self.closed = False
+        self._queue: asyncio.Queue[Optional[TaskEvent]] = asyncio.Queue(queue_size)
+
+    async def events(self) -> AsyncIterator[Optional[TaskEvent]]:
+        """События по мере поступления; None, если за keepalive секунд их не было"""
+        while not (self.closed and self._queue.empty()):
+            try:
+                event = await asyncio.wait_for(self._queue.get(), self.broker.keepalive)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if event is not None:
+                yield event
+
+    def offer(self, event: TaskEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.broker.unsubscribe(self)
+        # будит ожидающего клиента; в полной очереди он и так не ждёт
+        with suppress(asyncio.QueueFull):
+            self._queue.put_nowait(None)
+
+    def __enter__(self) -> "TaskSubscription":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class TaskEventBroker(ABC):
+    """Раздаёт события изменений задач подписчикам этого процесса.
+
+    Подписчик стоит одну ограниченную очередь: пока событий нет,
+    ни задач, ни соединений с базой на него не тратится.
+    """
+
+    def __init__(self, queue_size: int, keepalive: Optional[float] = None) -> None:
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self.stats = EventStats()
+        self._subscribers: Set[TaskSubscription] = set()
+
+    def subscribe(self) -> TaskSubscription:
+        subscription = TaskSubscription(self, self.queue_size)
+        self._subscribers.add(subscription)
+        self.stats.subscribers = len(self._subscribers)
+        return subscription
+
+    def unsubscribe(self, subscription: TaskSubscription) -> None:
+        self._subscribers.discard(subscription)
+        self.stats.subscribers = len(self._subscribers)
+
+    @abstractmethod
+    async def prepare(self, session: AsyncSession, events: Sequence[TaskEvent]) -> None:
+        """Отправляет события в транзакции записи, до её коммита"""
+
+    def committed(self, events: Sequence[TaskEvent]) -> None:
+        """Вызывается после коммита транзакции, в которой был prepare"""
+        self.stats.published += len(events)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        for subscription in list(self._subscribers):
+            subscription.close()
+
+    def dispatch(self, event: TaskEvent) -> None:
+        for subscription in list(self._subscribers):
+            if subscription.offer(event):
+                self.stats.delivered += 1
+                continue
+            subscription.overflowed = True
+            subscription.close()
+            self.stats.dropped += 1
+
+
+class InMemoryTaskEventBroker(TaskEventBroker):
+    """События только внутри процесса: sqlite, тесты, один воркер"""
+
+    async def prepare(self, session: AsyncSession, events: Sequence[TaskEvent]) -> None:
+        pass
+
+    def committed(self, events: Sequence[TaskEvent]) -> None:
+        super().committed(events)
+        for event in events:
+            self.dispatch(event)
+
+
+class PostgresTaskEventBroker(TaskEventBroker):
+    """NOTIFY при записи и одно LISTEN-соединение на процесс.
+
+    NOTIFY выполняется в транзакции самой записи: Postgres доставляет его
+    только после коммита, поэтому подписчики видят ровно зафиксированные
+    изменения. Уведомление получают все процессы, включая отправивший,
+    и каждый раздаёт его своим подписчикам. Потерянное LISTEN-соединение
+    переоткрывается; события, пришедшие в этот момент, теряются, поэтому
+    после переподключения подписчики получают RESET.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str,
+        queue_size: int,
+        keepalive: Optional[float] = None,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        super().__init__(queue_size, keepalive)
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    async def prepare(self, session: AsyncSession, events: Sequence[TaskEvent]) -> None:
+        payloads = [
+            TaskEvent(event.type, event.task_ids[start : start + NOTIFY_MAX_IDS])
+            .to_json()
+            .decode()
+            for event in events
+            for start in range(0, len(event.task_ids), NOTIFY_MAX_IDS)
+        ]
+        if not payloads:
+            return
+        # все уведомления одним запросом
+        await session.execute(
+            text(
+                "SELECT pg_notify(:channel, payload) "
+                "FROM unnest(CAST(:payloads AS text[])) AS payload"
+            ),
+            {"channel": self.channel, "payloads": payloads},
+        )
+
+    async def start(self) -> None:
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+        await super().stop()
+
+    async def _listen(self) -> None:
+        import asyncpg  # noqa: PLC0415
+
+        dsn = self.engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        delay = self.reconnect_delay
+        connected_before = False
+        while True:
+            terminated = asyncio.Event()
+            connection = None
+            failed = False
+            try:
+                connection = await asyncpg.connect(dsn)
+                # событие этой итерации: обратный вызов может прийти после close
+                connection.add_termination_listener(
+                    lambda _, terminated=terminated: terminated.set()
+                )
+                await connection.add_listener(self.channel, self._on_notify)
+                delay = self.reconnect_delay
+                if connected_before:
+                    # пока соединения не было, уведомления терялись
+                    self.dispatch(TaskEvent(TaskEventType.RESET, ()))
+                connected_before = True
+                await terminated.wait()
+                logger.warning("Task events listener connection lost, reconnecting")
+            except Exception as e:
+                failed = True
+                # не только OSError и PostgresError: InterfaceError или
+                # ConnectionDoesNotExistError тоже не должны останавливать
+                # слушателя; CancelledError сюда не попадает
+                logger.warning(
+                    "Task events listener failed, retrying in %.1fs: %s: %s",
+                    delay,
+                    type(e).__name__,
+                    e,
+                )
+            finally:
+                if connection is not None:
+                    with suppress(Exception):
+                        await connection.close(timeout=1)
+            if connection is not None:
+                self.stats.listener_reconnects += 1
+            await asyncio.sleep(delay)
+            if failed:
+                delay = min(delay * 2, max(self.reconnect_delay, MAX_RECONNECT_DELAY))
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = TaskEvent.from_json(payload)
+        except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+            logger.warning("Malformed task event skipped: %s", payload[:200])
+            return
+        self.dispatch(event)
+
+
+def build_task_event_broker(
+    settings: EventSettings, engine: AsyncEngine
+) -> TaskEventBroker:
+    if settings.backend == "postgres":
+        if engine.dialect.driver != "asyncpg":
+            raise RuntimeError("Для TASK_EVENTS_BACKEND=postgres нужен драйвер asyncpg")
+        return PostgresTaskEventBroker(
+            engine,
+            channel=settings.channel,
+            queue_size=settings.queue_size,
+            keepalive=settings.keepalive,
+            reconnect_delay=settings.reconnect_delay,
+        )
+    return InMemoryTaskEventBroker(
+        queue_size=settings.queue_size, keepalive=settings.keepalive
+    )
@@ -1,27 +1,235 @@
-from fastapi import Depends, FastAPI
-from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import Depends, FastAPI, Request
+from observer import get_custom_logger as get_logger
 
 from src.application.task.task_service import TaskService
-from src.infra.db.connection import engine, get_session
+from src.infra.cache import CacheStats, build_task_cache
+from src.infra.coalescing import CoalescingStats, SingleFlight
+from src.infra.config import (
+    ArchiveSettings,
+    CacheSettings,
+    CoalescingSettings,
+    EventSettings,
+    PostgresSettings,
+    QueueSettings,
+)
+from src.infra.db.connection import (
+    engine,
+    get_pool_stats,
+    get_replica_stats,
+    get_statement_stats,
+    lazy_replica_session,
+    replica_router,
+    streaming_unit_of_work,
+    unit_of_work,
+    warm_up_pool,
+)
+from src.infra.db.pool import PoolStats
+from src.infra.db.replicas import ReplicaStats
 from src.infra.db.repositories.task_repositories import TaskRepository
+from src.infra.db.statements import StatementStats
+from src.infra.db.unit_of_work import UnitOfWork
+from src.infra.events import EventStats, TaskEventBroker, build_task_event_broker
 from src.infra.observability import setup_observability
+from src.presentation.web_api.endpoints.diagnostics import diagnostics_router
 from src.presentation.web_api.endpoints.task import task_router
-from src.presentation.web_api.providers.abstract.task import task_service_provider
+from src.presentation.web_api.providers.abstract.diagnostics import (
+    cache_stats_provider,
+    coalescing_stats_provider,
+    event_stats_provider,
+    pool_stats_provider,
+    replica_stats_provider,
+    statement_stats_provider,
+)
+from src.presentation.web_api.providers.abstract.task import (
+    task_events_provider,
+    task_service_provider,
+)
+
+logger = get_logger(__name__)
+
+task_cache = build_task_cache(CacheSettings())
+task_events = build_task_event_broker(EventSettings(), engine)
+task_flights = SingleFlight() if CoalescingSettings().enabled else None
+
+# GET/HEAD работают без BEGIN/COMMIT
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+
+async def requeue_expired_leases(interval: float) -> None:
+    """Возвращает в очередь задачи упавших воркеров, запускается фоновой задачей.
+
+    Идёт в каждом процессе: SKIP LOCKED не даёт им мешать друг другу.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with unit_of_work() as uow:
+                service = TaskService(
+                    TaskRepository(uow.session),
+                    cache=task_cache,
+                    uow=uow,
+                    events=task_events,
+                    flights=task_flights,
+                )
+                await service.requeue_expired_leases()
+        except Exception as e:
+            logger.warning("Expired task leases requeue failed: %s", e)
+
+
+async def archive_completed_tasks(interval: float) -> None:
+    """Переносит старые выполненные задачи в архив, запускается фоновой задачей.
+
+    Как и возврат аренды, идёт в каждом процессе: пачки выбираются через
+    SKIP LOCKED, и процессы делят работу, а не повторяют её.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with unit_of_work() as uow:
+                service = TaskService(
+                    TaskRepository(uow.session), uow=uow, flights=task_flights
+                )
+                await service.archive_completed()
+        except Exception as e:
+            logger.warning("Completed tasks archiving failed: %s", e)
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    try:
+        warmed = await warm_up_pool(engine, PostgresSettings().pool_warmup)
+        logger.info("Connection pool warmed up: connections=%d", warmed)
+    except Exception as e:
+        # пул всё равно откроет соединения лениво, старт приложения не блокируем
+        logger.warning("Connection pool warm-up failed: %s", e)
+
+    # одно LISTEN-соединение на процесс, на всех подписчиков ленты изменений
+    await task_events.start()
+
+    lease_requeue = asyncio.create_task(
+        requeue_expired_leases(QueueSettings().requeue_interval)
+    )
+
+    archive_settings = ArchiveSettings()
+    archiver = None
+    if archive_settings.enabled:
+        archiver = asyncio.create_task(
+            archive_completed_tasks(archive_settings.interval)
+        )
+
+    replica_checks = None
+    if replica_router.enabled:
+        # до первой проверки реплики считаются нездоровыми и чтения идут в primary
+        replica_checks = asyncio.create_task(
+            replica_router.run_checks(PostgresSettings().replica_check_interval)
+        )
+    yield
+    lease_requeue.cancel()
+    with suppress(asyncio.CancelledError):
+        await lease_requeue
+    if archiver is not None:
+        archiver.cancel()
+        with suppress(asyncio.CancelledError):
+            await archiver
+    await task_events.stop()
+    if replica_checks is not None:
+        replica_checks.cancel()
+        with suppress(asyncio.CancelledError):
+            await replica_checks
+    await replica_router.dispose()
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
 setup_observability(engine, app)
 
 app.include_router(task_router)
+app.include_router(diagnostics_router)
+
+
+async def get_unit_of_work(request: Request) -> AsyncIterator[UnitOfWork]:
+    async with unit_of_work(read_only=request.method in READ_ONLY_METHODS) as uow:
+        yield uow
 
 
-def get_task_repository(session: AsyncSession = Depends(get_session)) -> TaskRepository:
-    return TaskRepository(session)
+def get_task_repository(uow: UnitOfWork = Depends(get_unit_of_work)) -> TaskRepository:
+    return TaskRepository(uow.session)
+
+
+async def get_read_repository() -> AsyncIterator[
+    Optional[Callable[[], TaskRepository]]
+]:
+    if not replica_router.enabled:
+        yield None
+        return
+    # сессия реплики открывается только при первом чтении через неё
+    async with lazy_replica_session() as open_session:
+        yield lambda: TaskRepository(open_session())
+
+
+@asynccontextmanager
+async def task_repository_scope() -> AsyncIterator[TaskRepository]:
+    # выгрузка только читает, поэтому тоже идёт в реплику, если она есть;
+    # курсору выгрузки нужна транзакция, AUTOCOMMIT здесь не подходит
+    async with streaming_unit_of_work() as uow:
+        yield TaskRepository(uow.session)
 
 
 def get_task_service(
+    uow: UnitOfWork = Depends(get_unit_of_work),
     task_repository: TaskRepository = Depends(get_task_repository),
+    read_repository: Optional[Callable[[], TaskRepository]] = Depends(
+        get_read_repository
+    ),
 ) -> TaskService:
-    return TaskService(task_repository)
+    return TaskService(
+        task_repository,
+        cache=task_cache,
+        repository_scope=task_repository_scope,
+        uow=uow,
+        read_repository=read_repository,
+        events=task_events,
+        flights=task_flights,
+    )
+
+
+def get_task_events() -> TaskEventBroker:
+    return task_events
+
+
+def get_engine_pool_stats() -> PoolStats:
+    return get_pool_stats(engine)
+
+
+def get_engine_statement_stats() -> StatementStats:
+    return get_statement_stats(engine)
+
+
+def get_engine_replica_stats() -> ReplicaStats:
+    return get_replica_stats(replica_router)
+
+
+def get_task_event_stats() -> EventStats:
+    return task_events.stats
+
+
+def get_task_cache_stats() -> CacheStats:
+    return task_cache.stats if task_cache is not None else CacheStats()
+
+
+def get_task_coalescing_stats() -> CoalescingStats:
+    return task_flights.stats if task_flights is not None else CoalescingStats()
 
 
 app.dependency_overrides[task_service_provider] = get_task_service
+app.dependency_overrides[task_events_provider] = get_task_events
+app.dependency_overrides[pool_stats_provider] = get_engine_pool_stats
+app.dependency_overrides[cache_stats_provider] = get_task_cache_stats
+app.dependency_overrides[statement_stats_provider] = get_engine_statement_stats
+app.dependency_overrides[replica_stats_provider] = get_engine_replica_stats
+app.dependency_overrides[event_stats_provider] = get_task_event_stats
+app.dependency_overrides[coalescing_stats_provider] = get_task_coalescing_stats
@@ -0,0 +1,38 @@
+"""Перенос выполненных задач старше TASK_ARCHIVE_AFTER_DAYS в tasks_archive.
+
+    python -m src.presentation.cli.archive_tasks
+
+То же делает фоновая задача приложения раз в TASK_ARCHIVE_INTERVAL секунд;
+команда нужна, чтобы разобрать накопившуюся историю разом, например после
+включения архива на большой базе. Задачи переносятся пачками по
+TASK_ARCHIVE_BATCH_SIZE, каждая в своей транзакции, так что команду можно
+прервать и запустить снова.
+"""
+
+import asyncio
+
+from observer import get_custom_logger as get_logger
+
+from src.application.task.task_service import TaskService
+from src.infra.db.connection import engine, unit_of_work
+from src.infra.db.repositories.task_repositories import TaskRepository
+
+logger = get_logger(__name__)
+
+
+async def archive() -> int:
+    try:
+        async with unit_of_work() as uow:
+            service = TaskService(TaskRepository(uow.session), uow=uow)
+            return await service.archive_completed()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    archived = asyncio.run(archive())
+    logger.info("Перенесено в архив задач: %d", archived)
+
+
+if __name__ == "__main__":
+    main()
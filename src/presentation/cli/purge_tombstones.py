@@ -0,0 +1,37 @@
+"""Удаление следов удалённых задач старше TASK_SYNC_TOMBSTONE_RETENTION_DAYS.
+
+    python -m src.presentation.cli.purge_tombstones
+
+Следы нужны GET /tasks/changes, чтобы клиент узнал об удалении. Клиент,
+не синхронизировавшийся дольше срока хранения, получает 410 и делает
+полную синхронизацию, поэтому более старые следы можно удалять.
+Запускать периодически, например раз в сутки.
+"""
+
+import asyncio
+
+from observer import get_custom_logger as get_logger
+
+from src.application.task.task_service import TaskService
+from src.infra.db.connection import engine, unit_of_work
+from src.infra.db.repositories.task_repositories import TaskRepository
+
+logger = get_logger(__name__)
+
+
+async def purge() -> int:
+    try:
+        async with unit_of_work() as uow:
+            service = TaskService(TaskRepository(uow.session), uow=uow)
+            return await service.purge_tombstones()
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    purged = asyncio.run(purge())
+    logger.info("Удалено следов: %d", purged)
+
+
+if __name__ == "__main__":
+    main()
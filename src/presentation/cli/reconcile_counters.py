@@ -0,0 +1,42 @@
+"""Точный пересчёт task_counters по таблице tasks.
+
+    python -m src.presentation.cli.reconcile_counters
+
+Триггеры держат счётчики в актуальном состоянии, пересчёт нужен после
+ручных правок в обход триггеров (например, TRUNCATE) или для проверки.
+Код возврата 1, если счётчики расходились с таблицей.
+"""
+
+import asyncio
+import sys
+
+from observer import get_custom_logger as get_logger
+
+from src.application.task.task_service import TaskService
+from src.infra.db.connection import engine, unit_of_work
+from src.infra.db.repositories.task_repositories import TaskRepository
+
+logger = get_logger(__name__)
+
+
+async def reconcile() -> bool:
+    try:
+        async with unit_of_work() as uow:
+            service = TaskService(TaskRepository(uow.session), uow=uow)
+            result = await service.reconcile_stats()
+    finally:
+        await engine.dispose()
+
+    for status, count in result.after.by_status.items():
+        logger.info(
+            "%s: %d (было %d)", status.value, count, result.before.by_status[status]
+        )
+    return not result.drift
+
+
+def main() -> None:
+    sys.exit(0 if asyncio.run(reconcile()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -57,6 +57,66 @@ class NotFound(HTTPErrorModel):
     )
 
 
+class PreconditionFailed(HTTPErrorModel):
+    """
+    Response модель для статус кода HTTPPreconditionFailed
+    """
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "detail": [
+                    {
+                        "msg": "Entity was modified",
+                        "body": {"field": "value"},
+                        "type": "ErrorType",
+                    }
+                ]
+            }
+        }
+    )
+
+
+class Conflict(HTTPErrorModel):
+    """
+    Response модель для статус кода HTTPConflict
+    """
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "detail": [
+                    {
+                        "msg": "Entity is in a conflicting state",
+                        "body": {"field": "value"},
+                        "type": "ErrorType",
+                    }
+                ]
+            }
+        }
+    )
+
+
+class Gone(HTTPErrorModel):
+    """
+    Response модель для статус кода HTTPGone
+    """
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "detail": [
+                    {
+                        "msg": "Resource is no longer available",
+                        "body": {"field": "value"},
+                        "type": "ErrorType",
+                    }
+                ]
+            }
+        }
+    )
+
+
 def to_error_detail_dict(error: DomainError) -> dict[str, Any]:
     return {
         "detail": [
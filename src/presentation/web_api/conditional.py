@@ -0,0 +1,78 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import Row
+
+from src.domain.task.value_object import TaskVersion
+
+ETAG_HEADER = "ETag"
+LAST_MODIFIED_HEADER = "Last-Modified"
+
+
+def task_etag(version: int) -> str:
+    """Сильный ETag задачи: меняется вместе с её версией"""
+    return f'"{version}"'
+
+
+def page_etag(rows: Sequence[Row[Any]]) -> str:
+    """Слабый ETag страницы из id и версий задач на ней.
+
+    Меняется, если на странице изменилась, появилась или пропала задача.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for row in rows:
+        digest.update(f"{row.id}:{row.version};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        # sqlite отдаёт время без зоны, в базе оно хранится в UTC
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def version_headers(version: TaskVersion) -> Dict[str, str]:
+    return {
+        ETAG_HEADER: task_etag(version.version),
+        LAST_MODIFIED_HEADER: http_date(version.updated_at),
+    }
+
+
+def page_headers(rows: Sequence[Row[Any]]) -> Dict[str, str]:
+    headers = {ETAG_HEADER: page_etag(rows)}
+    if rows:
+        headers[LAST_MODIFIED_HEADER] = http_date(max(row.updated_at for row in rows))
+    return headers
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Слабое сравнение для If-None-Match: префикс W/ не учитывается"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[List[int]]:
+    """Версии из If-Match; None, если условия нет или это "*".
+
+    If-Match сравнивает ETag строго: слабые и чужие ETag не совпадают
+    ни с одной версией, и такой запрос получит 412.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = []
+    for tag in if_match.split(","):
+        value = tag.strip()
+        if value.startswith('"') and value.endswith('"') and value[1:-1].isdigit():
+            versions.append(int(value[1:-1]))
+    return versions
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """304 без тела: клиент берёт ответ из своего кэша"""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,100 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from src.infra.cache import CacheStats
+from src.infra.coalescing import CoalescingStats
+from src.infra.db.pool import PoolStats
+from src.infra.db.replicas import ReplicaStats
+from src.infra.db.statements import StatementStats
+from src.infra.events import EventStats
+from src.presentation.web_api.providers.abstract.diagnostics import (
+    cache_stats_provider,
+    coalescing_stats_provider,
+    event_stats_provider,
+    pool_stats_provider,
+    replica_stats_provider,
+    statement_stats_provider,
+)
+from src.presentation.web_api.schemas.diagnostics import (
+    CacheStatsDTO,
+    CoalescingStatsDTO,
+    EventStatsDTO,
+    PoolStatsDTO,
+    ReplicaStatsDTO,
+    StatementStatsDTO,
+)
+
+diagnostics_router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@diagnostics_router.get(
+    path="/pool",
+    response_model=PoolStatsDTO,
+    name="Состояние пула соединений",
+    operation_id="get_pool_stats",
+)
+async def get_pool_stats(
+    stats: PoolStats = Depends(pool_stats_provider),
+) -> PoolStats | Any:
+    return stats
+
+
+@diagnostics_router.get(
+    path="/cache",
+    response_model=CacheStatsDTO,
+    name="Счётчики кэша задач",
+    operation_id="get_cache_stats",
+)
+async def get_cache_stats(
+    stats: CacheStats = Depends(cache_stats_provider),
+) -> CacheStats | Any:
+    return stats
+
+
+@diagnostics_router.get(
+    path="/statements",
+    response_model=StatementStatsDTO,
+    name="Переиспользование скомпилированных и подготовленных запросов",
+    operation_id="get_statement_stats",
+)
+async def get_statement_stats(
+    stats: StatementStats = Depends(statement_stats_provider),
+) -> StatementStats | Any:
+    return stats
+
+
+@diagnostics_router.get(
+    path="/replicas",
+    response_model=ReplicaStatsDTO,
+    name="Состояние реплик для чтения",
+    operation_id="get_replica_stats",
+)
+async def get_replica_stats(
+    stats: ReplicaStats = Depends(replica_stats_provider),
+) -> ReplicaStats | Any:
+    return stats
+
+
+@diagnostics_router.get(
+    path="/events",
+    response_model=EventStatsDTO,
+    name="Подписчики и доставка событий изменений задач",
+    operation_id="get_event_stats",
+)
+async def get_event_stats(
+    stats: EventStats = Depends(event_stats_provider),
+) -> EventStats | Any:
+    return stats
+
+
+@diagnostics_router.get(
+    path="/coalescing",
+    response_model=CoalescingStatsDTO,
+    name="Объединение одинаковых одновременных чтений",
+    operation_id="get_coalescing_stats",
+)
+async def get_coalescing_stats(
+    stats: CoalescingStats = Depends(coalescing_stats_provider),
+) -> CoalescingStats | Any:
+    return stats
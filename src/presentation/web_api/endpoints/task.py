@@ -1,23 +1,138 @@
+from datetime import datetime
 from http import HTTPStatus
-from typing import Any, List
+from typing import Any, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
+from src.application.task.batch import TaskBulkResult, TaskLookupResult
+from src.application.task.queue import TaskClaim, TaskHeartbeat
+from src.application.task.stats import TaskStats
+from src.application.task.sync import TaskChanges
 from src.application.task.task_service import TaskService
 from src.domain.task.entity import TaskEntity
-from src.domain.task.exception import TaskNotFoundError, TaskValidationError
-from src.domain.task.value_object import TaskStatus
-from src.presentation.errors import BadRequest, NotFound, to_error_detail
-from src.presentation.web_api.providers.abstract.task import task_service_provider
+from src.domain.task.exception import (
+    TaskArchivedError,
+    TaskLeaseLostError,
+    TaskNotFoundError,
+    TaskSyncExpiredError,
+    TaskValidationError,
+    TaskVersionConflictError,
+)
+from src.domain.task.value_object import (
+    SortOrder,
+    TaskFilter,
+    TaskSort,
+    TaskSortField,
+    TaskStatus,
+    TaskVersion,
+)
+from src.infra.events import TaskEventBroker
+from src.presentation.errors import (
+    BadRequest,
+    Conflict,
+    Gone,
+    NotFound,
+    PreconditionFailed,
+    to_error_detail,
+)
+from src.presentation.web_api.conditional import (
+    ETAG_HEADER,
+    LAST_MODIFIED_HEADER,
+    etag_matches,
+    not_modified,
+    page_headers,
+    parse_if_match,
+    version_headers,
+)
+from src.presentation.web_api.export import ExportFormat, encode_export
+from src.presentation.web_api.ndjson import iter_lines
+from src.presentation.web_api.providers.abstract.task import (
+    task_events_provider,
+    task_service_provider,
+)
 from src.presentation.web_api.schemas.task import (
     DeleteResponse,
+    TaskBatchCreateRequest,
+    TaskBatchCreateResponse,
+    TaskBatchErrorDTO,
+    TaskBulkDeleteRequest,
+    TaskBulkResponse,
+    TaskBulkStatusRequest,
+    TaskChangesResponse,
+    TaskClaimResponse,
     TaskCreateRequest,
     TaskDTO,
+    TaskHeartbeatRequest,
+    TaskHeartbeatResponse,
+    TaskImportErrorDTO,
+    TaskImportResponse,
+    TaskLookupRequest,
+    TaskLookupResponse,
+    TaskPatchRequest,
+    TaskStatsResponse,
 )
+from src.presentation.web_api.sse import SSE_MEDIA_TYPE, encode_sse
+from src.presentation.web_api.task_json import TaskJSONResponse, TaskRowsResponse
 
 task_router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+VERSION_RESPONSE_HEADERS = {
+    ETAG_HEADER: {
+        "description": "Версия ответа для If-None-Match и If-Match",
+        "schema": {"type": "string"},
+    },
+    LAST_MODIFIED_HEADER: {
+        "description": "Время последнего изменения",
+        "schema": {"type": "string"},
+    },
+}
+NOT_MODIFIED_RESPONSE = {
+    "description": "Не изменилось с версии из If-None-Match, тела нет",
+    "headers": VERSION_RESPONSE_HEADERS,
+}
+
+
+def task_filter_query(
+    status: List[TaskStatus] = Query([]),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    q: Optional[str] = Query(None, description="Подстрока в названии или описании"),
+) -> TaskFilter:
+    return TaskFilter(
+        statuses=tuple(status),
+        created_after=created_after,
+        created_before=created_before,
+        search=(q or "").strip() or None,
+    )
+
+
+def task_fields_query(
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            "Поля ответа через запятую, например id,title,status; "
+            "остальные поля в ответе отсутствуют"
+        ),
+    ),
+) -> Optional[str]:
+    return fields
+
+
+def entity_version(task: TaskEntity) -> TaskVersion:
+    return TaskVersion(version=task.version, updated_at=task.updated_at)
+
+
+def task_sort_query(
+    sort: TaskSortField = TaskSortField.CREATED_AT,
+    order: SortOrder = SortOrder.ASC,
+) -> TaskSort:
+    return TaskSort(field=sort, order=order)
+
 
 @task_router.post(
     path="/",
@@ -42,10 +157,207 @@ async def create_task(
         return to_error_detail(e, HTTPStatus.BAD_REQUEST)
 
 
+@task_router.post(
+    path="/batch",
+    response_model=TaskBatchCreateResponse,
+    status_code=HTTPStatus.CREATED,
+    responses={
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+    },
+    name="Пакетное создание задач",
+    operation_id="create_tasks_batch",
+)
+async def create_tasks_batch(
+    tasks_data: TaskBatchCreateRequest,
+    service: TaskService = Depends(task_service_provider),
+) -> TaskBatchCreateResponse | Any:
+    try:
+        result = await service.create_many(
+            [(task_data.title, task_data.description) for task_data in tasks_data.root]
+        )
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+    return TaskBatchCreateResponse(
+        created=[TaskDTO.model_validate(task) for task in result.created],
+        errors=[
+            TaskBatchErrorDTO(
+                index=item.index,
+                msg=item.error.message,
+                body=item.error.body(),
+                type=item.error.name(),
+            )
+            for item in result.errors
+        ],
+    )
+
+
+@task_router.post(
+    path="/import",
+    response_model=TaskImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+    name="Потоковый импорт задач из NDJSON",
+    operation_id="import_tasks",
+)
+async def import_tasks(
+    request: Request,
+    upsert: bool = False,
+    service: TaskService = Depends(task_service_provider),
+) -> TaskImportResponse:
+    result = await service.import_lines(iter_lines(request.stream()), upsert=upsert)
+    return TaskImportResponse(
+        accepted=result.accepted,
+        rejected_total=result.rejected_total,
+        rejected=[
+            TaskImportErrorDTO(
+                line=item.index,
+                msg=item.error.message,
+                body=item.error.body(),
+                type=item.error.name(),
+            )
+            for item in result.rejected
+        ],
+    )
+
+
+@task_router.post(
+    path="/bulk/status",
+    response_model=TaskBulkResponse,
+    responses={
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+    },
+    name="Массовое изменение статуса задач",
+    operation_id="bulk_update_task_status",
+)
+async def bulk_update_task_status(
+    bulk_data: TaskBulkStatusRequest,
+    service: TaskService = Depends(task_service_provider),
+) -> TaskBulkResult | Any:
+    try:
+        return await service.bulk_update_status(
+            bulk_data.status,
+            ids=bulk_data.ids,
+            task_filter=bulk_data.filter.to_filter() if bulk_data.filter else None,
+        )
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
+@task_router.post(
+    path="/bulk/delete",
+    response_model=TaskBulkResponse,
+    responses={
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+    },
+    name="Массовое удаление задач",
+    operation_id="bulk_delete_tasks",
+)
+async def bulk_delete_tasks(
+    bulk_data: TaskBulkDeleteRequest,
+    service: TaskService = Depends(task_service_provider),
+) -> TaskBulkResult | Any:
+    try:
+        return await service.bulk_delete(
+            ids=bulk_data.ids,
+            task_filter=bulk_data.filter.to_filter() if bulk_data.filter else None,
+        )
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
+@task_router.post(
+    path="/claim",
+    response_model=TaskClaimResponse,
+    responses={
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+    },
+    name="Взять в работу задачи из очереди",
+    operation_id="claim_tasks",
+)
+async def claim_tasks(
+    worker: str = Query(..., description="Имя воркера, берущего задачи"),
+    n: int = Query(1, description="Сколько задач взять, до 100"),
+    lease: Optional[float] = Query(
+        None, description="Срок аренды в секундах; по умолчанию TASK_QUEUE_LEASE"
+    ),
+    service: TaskService = Depends(task_service_provider),
+) -> TaskClaim | Any:
+    try:
+        return await service.claim(worker, n=n, lease=lease)
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
+@task_router.post(
+    path="/heartbeat",
+    response_model=TaskHeartbeatResponse,
+    responses={
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+    },
+    name="Продлить аренду задач воркера",
+    operation_id="heartbeat_tasks",
+)
+async def heartbeat_tasks(
+    request: TaskHeartbeatRequest,
+    service: TaskService = Depends(task_service_provider),
+) -> TaskHeartbeat | Any:
+    try:
+        return await service.heartbeat(request.worker, request.ids, lease=request.lease)
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
+@task_router.post(
+    path="/{id}/complete",
+    response_model=TaskDTO,
+    responses={
+        HTTPStatus.NOT_FOUND.value: {"model": NotFound},
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+        HTTPStatus.CONFLICT.value: {"model": Conflict},
+    },
+    name="Завершить задачу, взятую в работу",
+    operation_id="complete_task",
+)
+async def complete_task(
+    id: UUID,
+    worker: str = Query(..., description="Воркер, который держит аренду задачи"),
+    service: TaskService = Depends(task_service_provider),
+) -> TaskEntity | Any:
+    try:
+        return await service.complete(worker, id)
+    except TaskNotFoundError as e:
+        return to_error_detail(e, HTTPStatus.NOT_FOUND)
+    except TaskLeaseLostError as e:
+        return to_error_detail(e, HTTPStatus.CONFLICT)
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
 @task_router.get(
     path="/",
     response_model=list[TaskDTO],
     responses={
+        HTTPStatus.OK.value: {
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Курсор следующей страницы",
+                    "schema": {"type": "string"},
+                },
+                TOTAL_COUNT_HEADER: {
+                    "description": (
+                        "Число задач при with_total=true: точное без фильтров, "
+                        "с фильтрами оценка планировщика"
+                    ),
+                    "schema": {"type": "integer"},
+                },
+                **VERSION_RESPONSE_HEADERS,
+            }
+        },
+        HTTPStatus.NOT_MODIFIED.value: NOT_MODIFIED_RESPONSE,
         HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
     },
     name="Список задач",
@@ -54,55 +366,294 @@ async def create_task(
 async def list_tasks(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    task_filter: TaskFilter = Depends(task_filter_query),
+    sort: TaskSort = Depends(task_sort_query),
+    with_total: bool = False,
+    fields: Optional[str] = Depends(task_fields_query),
+    if_none_match: Optional[str] = Header(None),
     service: TaskService = Depends(task_service_provider),
-) -> List[TaskEntity] | Any:
+) -> Response:
     try:
-        tasks = await service.list(skip, limit)
-        return tasks
+        if if_none_match is not None:
+            # сначала дешёвая страница из id и версий: при совпадении ETag
+            # задачи не читаются и не сериализуются
+            versions = await service.list_versions(
+                skip, limit, cursor, task_filter, sort
+            )
+            headers = page_headers(versions.items)
+            if etag_matches(if_none_match, headers[ETAG_HEADER]):
+                if versions.next_cursor is not None:
+                    headers[NEXT_CURSOR_HEADER] = versions.next_cursor
+                return not_modified(headers)
+        page = await service.list_rows(skip, limit, cursor, task_filter, sort, fields)
     except TaskValidationError as e:
         return to_error_detail(e, HTTPStatus.BAD_REQUEST)
 
+    headers = page_headers(page.items)
+    if page.next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if with_total:
+        total = await service.estimate_total(task_filter)
+        if total is not None:
+            headers[TOTAL_COUNT_HEADER] = str(total)
+    # готовый Response FastAPI не валидирует по response_model;
+    # схема ответа в OpenAPI по-прежнему берётся из list[TaskDTO]
+    return TaskRowsResponse(page.items, fields=page.fields, headers=headers)
+
+
+@task_router.get(
+    path="/lookup",
+    response_model=TaskLookupResponse,
+    responses={
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+    },
+    name="Получение задач по списку id",
+    operation_id="lookup_tasks",
+)
+async def lookup_tasks(
+    ids: List[UUID] = Query(
+        ...,
+        description=(
+            "id задач, параметр повторяется: ?ids=...&ids=...; "
+            "для длинных списков POST /tasks/lookup"
+        ),
+    ),
+    service: TaskService = Depends(task_service_provider),
+) -> TaskLookupResult | Any:
+    try:
+        return await service.get_many(ids)
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
+@task_router.post(
+    path="/lookup",
+    response_model=TaskLookupResponse,
+    responses={
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+    },
+    name="Получение задач по списку id в теле запроса",
+    operation_id="lookup_tasks_by_body",
+)
+async def lookup_tasks_by_body(
+    request: TaskLookupRequest,
+    service: TaskService = Depends(task_service_provider),
+) -> TaskLookupResult | Any:
+    try:
+        return await service.get_many(request.ids)
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
+@task_router.get(
+    path="/export",
+    response_class=StreamingResponse,
+    responses={
+        HTTPStatus.OK.value: {
+            "description": "Сначала задачи из tasks, затем из архива",
+            "content": {
+                ExportFormat.NDJSON.media_type: {},
+                ExportFormat.CSV.media_type: {},
+            },
+        },
+    },
+    name="Потоковая выгрузка задач",
+    operation_id="export_tasks",
+)
+async def export_tasks(
+    format: ExportFormat = ExportFormat.NDJSON,
+    task_filter: TaskFilter = Depends(task_filter_query),
+    service: TaskService = Depends(task_service_provider),
+) -> StreamingResponse:
+    return StreamingResponse(
+        encode_export(service.export(task_filter), format),
+        media_type=format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format.value}"'},
+    )
+
+
+@task_router.get(
+    path="/stats",
+    response_model=TaskStatsResponse,
+    name="Число задач по статусам",
+    operation_id="get_task_stats",
+)
+async def get_task_stats(
+    service: TaskService = Depends(task_service_provider),
+) -> TaskStats | Any:
+    return await service.stats()
+
+
+@task_router.get(
+    path="/changes",
+    response_model=TaskChangesResponse,
+    responses={
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+        HTTPStatus.GONE.value: {"model": Gone},
+    },
+    name="Изменения задач с прошлой синхронизации",
+    operation_id="list_task_changes",
+)
+async def list_task_changes(
+    since: Optional[str] = Query(
+        None,
+        description=(
+            "token из прошлого ответа; без него отдаются все задачи. "
+            "410 значит, что токен устарел и нужна полная синхронизация"
+        ),
+    ),
+    limit: int = 100,
+    service: TaskService = Depends(task_service_provider),
+) -> TaskChanges | Any:
+    try:
+        return await service.changes(since=since, limit=limit)
+    except TaskSyncExpiredError as e:
+        return to_error_detail(e, HTTPStatus.GONE)
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
+@task_router.get(
+    path="/events",
+    response_class=StreamingResponse,
+    responses={
+        HTTPStatus.OK.value: {
+            "description": (
+                "События created/updated/deleted с id задач; событие reset "
+                "значит, что клиент отстал или события могли потеряться, "
+                "и список нужно перечитать"
+            ),
+            "content": {SSE_MEDIA_TYPE: {}},
+        },
+    },
+    name="Поток изменений задач (SSE)",
+    operation_id="stream_task_events",
+)
+async def stream_task_events(
+    broker: TaskEventBroker = Depends(task_events_provider),
+) -> StreamingResponse:
+    return StreamingResponse(
+        encode_sse(broker),
+        media_type=SSE_MEDIA_TYPE,
+        # без буферизации в прокси события доходят сразу
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @task_router.get(
     path="/{id}",
     response_model=TaskDTO,
     responses={
+        HTTPStatus.OK.value: {"headers": VERSION_RESPONSE_HEADERS},
+        HTTPStatus.NOT_MODIFIED.value: NOT_MODIFIED_RESPONSE,
         HTTPStatus.NOT_FOUND.value: {"model": NotFound},
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
     },
     name="Получение задачи по id",
     operation_id="get_task_by_id",
 )
 async def get_task(
-    id: UUID, service: TaskService = Depends(task_service_provider)
+    id: UUID,
+    response: Response,
+    fields: Optional[str] = Depends(task_fields_query),
+    if_none_match: Optional[str] = Header(None),
+    service: TaskService = Depends(task_service_provider),
 ) -> TaskEntity | Any:
     try:
+        if if_none_match is not None:
+            # версия читается без самой задачи: при совпадении тело не нужно
+            headers = version_headers(await service.get_version(id))
+            if etag_matches(if_none_match, headers[ETAG_HEADER]):
+                return not_modified(headers)
+        if fields is not None:
+            projection = await service.get_fields(id, fields)
+            return TaskJSONResponse(
+                projection.values, headers=version_headers(projection.version)
+            )
         task = await service.get(id)
+        response.headers.update(version_headers(entity_version(task)))
         return task
     except TaskNotFoundError as e:
         return to_error_detail(e, HTTPStatus.NOT_FOUND)
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
 
 
 @task_router.put(
     path="/{id}",
     response_model=TaskDTO,
     responses={
+        HTTPStatus.OK.value: {"headers": VERSION_RESPONSE_HEADERS},
         HTTPStatus.NOT_FOUND.value: {"model": NotFound},
         HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+        HTTPStatus.PRECONDITION_FAILED.value: {"model": PreconditionFailed},
+        HTTPStatus.CONFLICT.value: {"model": Conflict},
     },
     name="Изменение данных задачи по id",
+    operation_id="update_task",
 )
 async def update_task(
     id: UUID,
     title: str,
     description: str,
     status: TaskStatus,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    service: TaskService = Depends(task_service_provider),
+) -> TaskEntity | Any:
+    try:
+        task = await service.update(
+            id, title, description, status, expected_versions=parse_if_match(if_match)
+        )
+        response.headers.update(version_headers(entity_version(task)))
+        return task
+    except TaskNotFoundError as e:
+        return to_error_detail(e, HTTPStatus.NOT_FOUND)
+    except TaskVersionConflictError as e:
+        return to_error_detail(e, HTTPStatus.PRECONDITION_FAILED)
+    except TaskArchivedError as e:
+        return to_error_detail(e, HTTPStatus.CONFLICT)
+    except TaskValidationError as e:
+        return to_error_detail(e, HTTPStatus.BAD_REQUEST)
+
+
+@task_router.patch(
+    path="/{id}",
+    response_model=TaskDTO,
+    responses={
+        HTTPStatus.OK.value: {"headers": VERSION_RESPONSE_HEADERS},
+        HTTPStatus.NOT_FOUND.value: {"model": NotFound},
+        HTTPStatus.BAD_REQUEST.value: {"model": BadRequest},
+        HTTPStatus.PRECONDITION_FAILED.value: {"model": PreconditionFailed},
+        HTTPStatus.CONFLICT.value: {"model": Conflict},
+    },
+    name="Частичное изменение задачи по id",
+    operation_id="patch_task",
+)
+async def patch_task(
+    id: UUID,
+    task_data: TaskPatchRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     service: TaskService = Depends(task_service_provider),
 ) -> TaskEntity | Any:
     try:
-        task = await service.update(id, title, description, status)
+        task = await service.patch(
+            id,
+            title=task_data.title,
+            description=task_data.description,
+            status=task_data.status,
+            expected_versions=parse_if_match(if_match),
+        )
+        response.headers.update(version_headers(entity_version(task)))
         return task
     except TaskNotFoundError as e:
         return to_error_detail(e, HTTPStatus.NOT_FOUND)
+    except TaskVersionConflictError as e:
+        return to_error_detail(e, HTTPStatus.PRECONDITION_FAILED)
+    except TaskArchivedError as e:
+        return to_error_detail(e, HTTPStatus.CONFLICT)
     except TaskValidationError as e:
         return to_error_detail(e, HTTPStatus.BAD_REQUEST)
 
@@ -113,8 +664,10 @@ async def update_task(
     response_model=DeleteResponse,
     responses={
         HTTPStatus.NOT_FOUND.value: {"model": NotFound},
+        HTTPStatus.CONFLICT.value: {"model": Conflict},
     },
     name="Удаление задачи по id",
+    operation_id="delete_task",
 )
 async def delete_task(
     id: UUID, service: TaskService = Depends(task_service_provider)
@@ -124,3 +677,5 @@ async def delete_task(
         return DeleteResponse(message=f"Задача с ID {id} была успешно удалена")
     except TaskNotFoundError as e:
         return to_error_detail(e, HTTPStatus.NOT_FOUND)
+    except TaskArchivedError as e:
+        return to_error_detail(e, HTTPStatus.CONFLICT)
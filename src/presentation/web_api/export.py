@@ -0,0 +1,56 @@
+import csv
+import io
+from enum import Enum
+from typing import AsyncIterator, List
+
+import orjson
+
+from src.domain.task.entity import TaskEntity
+
+CSV_HEADER = ("id", "title", "description", "status", "created_at")
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        if self is ExportFormat.CSV:
+            return "text/csv"
+        return "application/x-ndjson"
+
+
+def encode_ndjson(tasks: List[TaskEntity]) -> bytes:
+    # orjson сериализует dataclass напрямую, без промежуточных dict
+    return b"".join(orjson.dumps(task) + b"\n" for task in tasks)
+
+
+def encode_csv(tasks: List[TaskEntity], header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(CSV_HEADER)
+    writer.writerows(
+        (
+            task.id,
+            task.title,
+            task.description,
+            task.status.value,
+            task.created_at.isoformat(),
+        )
+        for task in tasks
+    )
+    return buffer.getvalue().encode()
+
+
+async def encode_export(
+    chunks: AsyncIterator[List[TaskEntity]], export_format: ExportFormat
+) -> AsyncIterator[bytes]:
+    if export_format is ExportFormat.CSV:
+        yield encode_csv([], header=True)
+        async for chunk in chunks:
+            yield encode_csv(chunk)
+    else:
+        async for chunk in chunks:
+            yield encode_ndjson(chunk)
@@ -0,0 +1,29 @@
+from typing import AsyncIterator
+
+MAX_LINE_BYTES = 64 * 1024
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[bytes]:
+    """Режет поток тела запроса на строки, не собирая его целиком в памяти.
+
+    Строка длиннее max_line_bytes обрезается: остаток до перевода строки
+    отбрасывается, а усечённое начало уходит дальше и не пройдёт валидацию.
+    """
+    buffer = b""
+    skipping = False
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+                continue
+            yield line
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield buffer[:max_line_bytes]
+                skipping = True
+            buffer = b""
+    if buffer and not skipping:
+        yield buffer
@@ -0,0 +1,25 @@
+from typing import NoReturn
+
+
+def pool_stats_provider() -> NoReturn:
+    raise NotImplementedError
+
+
+def cache_stats_provider() -> NoReturn:
+    raise NotImplementedError
+
+
+def statement_stats_provider() -> NoReturn:
+    raise NotImplementedError
+
+
+def replica_stats_provider() -> NoReturn:
+    raise NotImplementedError
+
+
+def event_stats_provider() -> NoReturn:
+    raise NotImplementedError
+
+
+def coalescing_stats_provider() -> NoReturn:
+    raise NotImplementedError
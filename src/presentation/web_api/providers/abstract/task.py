@@ -3,3 +3,7 @@ from typing import NoReturn
 
 def task_service_provider() -> NoReturn:
     raise NotImplementedError
+
+
+def task_events_provider() -> NoReturn:
+    raise NotImplementedError
@@ -0,0 +1,75 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class PoolStatsDTO(BaseModel):
+    mode: str
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    waiting: int
+    acquired: int
+    timeouts: int
+    avg_acquire_wait_ms: float
+    max_acquire_wait_ms: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CacheStatsDTO(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StatementStatsDTO(BaseModel):
+    compiled_hits: int
+    compiled_misses: int
+    prepared_hits: int
+    prepared_misses: int
+    prewarmed: int
+    prewarm_errors: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReplicaStatusDTO(BaseModel):
+    name: str
+    healthy: bool
+    lag_seconds: float | None
+    error: str | None
+    checked_at: float | None
+    reads: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReplicaStatsDTO(BaseModel):
+    primary_reads: int
+    replicas: list[ReplicaStatusDTO]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CoalescingStatsDTO(BaseModel):
+    leaders: int
+    coalesced: int
+    retries: int
+    errors: int
+    in_flight: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EventStatsDTO(BaseModel):
+    subscribers: int
+    published: int
+    delivered: int
+    dropped: int
+    listener_reconnects: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,9 +1,11 @@
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, RootModel
 
-from src.domain.task.value_object import TaskStatus
+from src.application.task.batch import MAX_BATCH_SIZE
+from src.domain.task.value_object import TaskFilter, TaskStatus
 
 
 class TaskDTO(BaseModel):
@@ -23,3 +25,123 @@ class DeleteResponse(BaseModel):
 class TaskCreateRequest(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     description: str = Field("", max_length=1000)
+
+
+class TaskBatchItemRequest(BaseModel):
+    # без ограничений длины: ошибку одной задачи create_many вернёт по индексу,
+    # вместо 422 на весь пакет
+    title: str = ""
+    description: str = ""
+
+
+class TaskBatchCreateRequest(RootModel[list[TaskBatchItemRequest]]):
+    root: list[TaskBatchItemRequest] = Field(..., max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchErrorDTO(BaseModel):
+    index: int
+    msg: str
+    body: dict[str, Any]
+    type: str
+
+
+class TaskBatchCreateResponse(BaseModel):
+    created: list[TaskDTO]
+    errors: list[TaskBatchErrorDTO]
+
+
+class TaskFilterRequest(BaseModel):
+    status: list[TaskStatus] = []
+    created_after: datetime | None = None
+    created_before: datetime | None = None
+
+    def to_filter(self) -> TaskFilter:
+        return TaskFilter(
+            statuses=tuple(self.status),
+            created_after=self.created_after,
+            created_before=self.created_before,
+        )
+
+
+class TaskBulkDeleteRequest(BaseModel):
+    ids: list[UUID] | None = None
+    filter: TaskFilterRequest | None = None
+
+
+class TaskBulkStatusRequest(TaskBulkDeleteRequest):
+    status: TaskStatus
+
+
+class TaskBulkResponse(BaseModel):
+    affected: int
+    chunks: list[int]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskLookupRequest(BaseModel):
+    ids: list[UUID]
+
+
+class TaskLookupResponse(BaseModel):
+    tasks: list[TaskDTO]
+    missing: list[UUID]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskClaimResponse(BaseModel):
+    tasks: list[TaskDTO]
+    lease_expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskHeartbeatRequest(BaseModel):
+    worker: str = Field(..., min_length=1, max_length=64)
+    ids: list[UUID]
+    lease: float | None = None
+
+
+class TaskHeartbeatResponse(BaseModel):
+    extended: list[UUID]
+    lost: list[UUID]
+    lease_expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskImportErrorDTO(BaseModel):
+    line: int
+    msg: str
+    body: dict[str, Any]
+    type: str
+
+
+class TaskImportResponse(BaseModel):
+    accepted: int
+    rejected_total: int
+    rejected: list[TaskImportErrorDTO]
+
+
+class TaskPatchRequest(BaseModel):
+    title: str | None = Field(None, min_length=1, max_length=255)
+    description: str | None = Field(None, max_length=1000)
+    status: TaskStatus | None = None
+
+
+class TaskChangesResponse(BaseModel):
+    tasks: list[TaskDTO]
+    deleted: list[UUID]
+    token: str
+    has_more: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    by_status: dict[TaskStatus, int]
+    archived: dict[TaskStatus, int]
+
+    model_config = ConfigDict(from_attributes=True)
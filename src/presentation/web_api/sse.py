@@ -0,0 +1,32 @@
+from typing import AsyncIterator
+
+from src.infra.events import TaskEventBroker, TaskEventType
+
+SSE_MEDIA_TYPE = "text/event-stream"
+SSE_KEEPALIVE = b": keepalive\n\n"
+# клиент, отключённый за медленное чтение или пропустивший события из-за
+# переподключения брокера, должен перечитать список задач
+SSE_RESET = b"event: reset\ndata: {}\n\n"
+
+
+async def encode_sse(broker: TaskEventBroker) -> AsyncIterator[bytes]:
+    """События изменений задач в формате text/event-stream.
+
+    Подписка живёт, пока клиент читает поток: при отключении клиента
+    генератор закрывается и подписка снимается.
+    """
+    with broker.subscribe() as subscription:
+        async for event in subscription.events():
+            if event is None:
+                # комментарий SSE: прокси не закроют простаивающее соединение
+                yield SSE_KEEPALIVE
+                continue
+            if event.type is TaskEventType.RESET:
+                yield SSE_RESET
+                continue
+            yield b"event: %s\ndata: %s\n\n" % (
+                event.type.value.encode(),
+                event.to_json(),
+            )
+        if subscription.overflowed:
+            yield SSE_RESET
@@ -0,0 +1,56 @@
+from typing import Any, Mapping, Optional, Sequence
+
+import orjson
+from fastapi import Response
+from sqlalchemy import Row
+
+from src.domain.task.value_object import TaskField
+
+# UTC как "Z", как это делает pydantic при сериализации TaskDTO
+TASK_JSON_OPTIONS = orjson.OPT_UTC_Z
+# поля TaskDTO в том же порядке; колонки сверх них (версия) в ответ не попадают
+TASK_FIELD_NAMES = [field.value for field in TaskField]
+
+
+def encode_task_rows(
+    rows: Sequence[Row[Any]], fields: Optional[Sequence[TaskField]] = None
+) -> bytes:
+    """JSON-массив задач из строк Core без промежуточных pydantic-моделей.
+
+    Без fields строки начинаются с колонок TASK_COLUMNS, поэтому ключи и
+    порядок полей совпадают с TaskDTO; UUID, datetime и TaskStatus orjson
+    пишет сам. С fields в ответ попадают только они. Служебные колонки
+    (ключ курсора, версия) стоят в конце строки, и zip их отрезает.
+    """
+    if not rows:
+        return b"[]"
+    # имена полей один раз на страницу: Row._asdict на каждую строку в разы дороже
+    names = [field.value for field in fields] if fields else TASK_FIELD_NAMES
+    return orjson.dumps(
+        [dict(zip(names, row)) for row in rows], option=TASK_JSON_OPTIONS
+    )
+
+
+class TaskRowsResponse(Response):
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Sequence[Row[Any]],
+        fields: Optional[Sequence[TaskField]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.fields = fields
+        super().__init__(content, headers=headers)
+
+    def render(self, content: Sequence[Row[Any]]) -> bytes:
+        return encode_task_rows(content, self.fields)
+
+
+class TaskJSONResponse(Response):
+    """Одна задача, в том числе частичная, теми же правилами, что и список"""
+
+    media_type = "application/json"
+
+    def render(self, content: Mapping[str, Any]) -> bytes:
+        return orjson.dumps(content, option=TASK_JSON_OPTIONS)
@@ -1,6 +1,9 @@
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
 
+from src.application.task.batch import MAX_BATCH_SIZE
 from src.main import app
 
 
@@ -27,3 +30,158 @@ def test_get_tasks_list(client: TestClient) -> None:
 
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+
+def test_get_tasks_list_by_cursor(client: TestClient) -> None:
+    """Test keyset pagination via X-Next-Cursor header."""
+    for i in range(2):
+        client.post("/tasks/", json={"title": f"Cursor Task {i}"})
+
+    first = client.get("/tasks/", params={"limit": 1})
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/tasks/", params={"limit": 1, "cursor": cursor})
+
+    assert second.status_code == 200
+    assert second.json()[0]["id"] != first.json()[0]["id"]
+
+
+def test_get_tasks_list_invalid_cursor(client: TestClient) -> None:
+    """Test malformed cursor is rejected."""
+    response = client.get("/tasks/", params={"cursor": "broken"})
+
+    assert response.status_code == 400
+
+
+def test_create_tasks_batch(client: TestClient) -> None:
+    """Test batch creation reports invalid items by index."""
+    response = client.post(
+        "/tasks/batch",
+        json=[
+            {"title": "Batch Task"},
+            {"title": "   "},
+            {"title": "x" * 101},
+            {"title": ""},
+            {"title": "x" * 300},
+            {},
+            {"title": "Long", "description": "x" * 1001},
+        ],
+    )
+
+    assert response.status_code == 201
+    data = response.json()
+    assert [task["title"] for task in data["created"]] == ["Batch Task"]
+    assert [error["index"] for error in data["errors"]] == [1, 2, 3, 4, 5, 6]
+    assert data["errors"][-1]["body"]["field"] == "description"
+
+
+def test_create_tasks_batch_too_large(client: TestClient) -> None:
+    """Test oversized batch is rejected before items are validated."""
+    response = client.post(
+        "/tasks/batch", json=[{"title": "Batch Task"}] * (MAX_BATCH_SIZE + 1)
+    )
+
+    assert response.status_code == 422
+
+
+def test_bulk_update_status_by_ids(client: TestClient) -> None:
+    """Test set-based status change for explicit IDs."""
+    ids = [
+        client.post("/tasks/", json={"title": f"Bulk {i}"}).json()["id"]
+        for i in range(2)
+    ]
+
+    response = client.post(
+        "/tasks/bulk/status", json={"ids": ids, "status": "COMPLETED"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["affected"] == 2
+    assert client.get(f"/tasks/{ids[0]}").json()["status"] == "COMPLETED"
+
+
+def test_export_tasks_ndjson(client: TestClient) -> None:
+    """Test streaming export returns one JSON object per line."""
+    client.post("/tasks/", json={"title": "Export Task"})
+
+    response = client.get("/tasks/export", params={"status": "CREATED"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert lines
+    assert all('"status":"CREATED"' in line for line in lines)
+
+
+def test_import_tasks_ndjson(client: TestClient) -> None:
+    """Test NDJSON import accepts valid lines and reports the rest."""
+    body = b'{"title": "Imported"}\n{"title": ""}\n{"title": "Imported 2"}\n'
+
+    response = client.post(
+        "/tasks/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["accepted"] == 2
+    assert [error["line"] for error in data["rejected"]] == [2]
+
+
+def test_patch_task(client: TestClient) -> None:
+    """Test partial update keeps untouched fields."""
+    task = client.post(
+        "/tasks/", json={"title": "Patch Me", "description": "Keep"}
+    ).json()
+
+    response = client.patch(f"/tasks/{task['id']}", json={"status": "IN_PROGRESS"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "IN_PROGRESS"
+    assert data["description"] == "Keep"
+
+
+def test_get_tasks_list_filtered_and_searched(client: TestClient) -> None:
+    """Test status filter combined with title search."""
+    marker = uuid4().hex
+    created = client.post("/tasks/", json={"title": f"Deploy {marker}"}).json()
+    client.patch(f"/tasks/{created['id']}", json={"status": "IN_PROGRESS"})
+    client.post("/tasks/", json={"title": f"Deploy {marker} draft"})
+
+    response = client.get(
+        "/tasks/",
+        params={"status": "IN_PROGRESS", "q": marker.upper(), "sort": "title"},
+    )
+
+    assert response.status_code == 200
+    assert [task["id"] for task in response.json()] == [created["id"]]
+
+
+def test_get_task_stats(client: TestClient) -> None:
+    """Test counters grow with created tasks and match X-Total-Count."""
+    before = client.get("/tasks/stats").json()
+    client.post("/tasks/", json={"title": "Counted"})
+
+    response = client.get("/tasks/stats")
+    listed = client.get("/tasks/", params={"with_total": True})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["by_status"]["CREATED"] == before["by_status"]["CREATED"] + 1
+    assert data["total"] == before["total"] + 1
+    assert int(listed.headers["X-Total-Count"]) == data["total"]
+
+
+def test_get_tasks_with_sparse_fields(client: TestClient) -> None:
+    """Test fields= limits the keys of list items and of a single task."""
+    created = client.post("/tasks/", json={"title": "Sparse", "description": "x"})
+    task_id = created.json()["id"]
+
+    listed = client.get("/tasks/", params={"fields": "id,title", "limit": 1})
+    single = client.get(f"/tasks/{task_id}", params={"fields": "status"})
+    invalid = client.get("/tasks/", params={"fields": "id,owner"})
+
+    assert [set(task) for task in listed.json()] == [{"id", "title"}]
+    assert single.json() == {"status": "CREATED"}
+    assert invalid.status_code == 400
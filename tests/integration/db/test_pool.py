@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.infra.db.connection import get_pool_stats, warm_up_pool
+from src.infra.db.pool import InstrumentedNullPool, InstrumentedQueuePool
+
+
+async def test_warm_up_fills_queue_pool(tmp_path: Path) -> None:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=3,
+        max_overflow=0,
+    )
+
+    warmed = await warm_up_pool(engine, 5)
+    stats = get_pool_stats(engine)
+
+    assert warmed == 3
+    assert stats.mode == "queue"
+    assert stats.checked_in == 3
+    assert stats.checked_out == 0
+    assert stats.acquired == 3
+    await engine.dispose()
+
+
+async def test_null_pool_tracks_checkouts(tmp_path: Path) -> None:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedNullPool
+    )
+
+    assert await warm_up_pool(engine, 5) == 0
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert get_pool_stats(engine).checked_out == 1
+
+    stats = get_pool_stats(engine)
+    assert stats.mode == "null"
+    assert stats.checked_out == 0
+    assert stats.acquired == 1
+    await engine.dispose()
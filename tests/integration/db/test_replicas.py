@@ -0,0 +1,103 @@
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from src.domain.task.entity import TaskEntity
+from src.domain.task.value_object import TaskFilter
+from src.infra.db.connection import (
+    Base,
+    lazy_replica_session,
+    replica_unit_of_work,
+    streaming_unit_of_work,
+)
+from src.infra.db.replicas import ReplicaRouter
+from src.infra.db.repositories.task_repositories import TaskRepository
+
+
+async def _database(path: Path) -> AsyncEngine:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+async def test_reads_go_to_healthy_replica(tmp_path: Path) -> None:
+    primary = await _database(tmp_path / "primary.db")
+    replica = await _database(tmp_path / "replica.db")
+    router = ReplicaRouter(primary, [replica])
+
+    async with AsyncSession(replica) as session:
+        await TaskRepository(session).create(TaskEntity(title="On replica"))
+        await session.commit()
+
+    # до первой проверки реплика не получает чтений
+    assert router.read_engine() is primary
+    [status] = await router.check()
+    async with replica_unit_of_work(router) as uow:
+        tasks = await TaskRepository(uow.session).list()
+
+    assert status.healthy and status.lag_seconds == 0
+    assert [task.title for task in tasks] == ["On replica"]
+    assert router.stats().replicas[0].reads == 1
+    await router.dispose()
+    await primary.dispose()
+
+
+async def test_unhealthy_or_lagging_replica_falls_back_to_primary(
+    tmp_path: Path,
+) -> None:
+    primary = await _database(tmp_path / "primary.db")
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'no' / 'x.db'}")
+    lagging = await _database(tmp_path / "replica.db")
+    router = ReplicaRouter(primary, [broken, lagging], max_lag=-1)
+
+    statuses = await router.check()
+
+    assert [status.healthy for status in statuses] == [False, False]
+    assert statuses[0].error is not None
+    assert statuses[1].error == "lag exceeds max_lag"
+    assert router.read_engine() is primary
+    assert router.stats().primary_reads == 1
+    await router.dispose()
+    await primary.dispose()
+
+
+async def test_lazy_replica_session_is_counted_on_first_use(tmp_path: Path) -> None:
+    primary = await _database(tmp_path / "primary.db")
+    router = ReplicaRouter(primary)
+
+    async with lazy_replica_session(router):
+        pass
+    assert router.stats().primary_reads == 0
+
+    async with lazy_replica_session(router) as open_session:
+        session = open_session()
+        await TaskRepository(session).list()
+        assert open_session() is session
+    assert router.stats().primary_reads == 1
+    await primary.dispose()
+
+
+async def test_export_streams_inside_a_transaction(tmp_path: Path) -> None:
+    primary = await _database(tmp_path / "primary.db")
+    router = ReplicaRouter(primary)
+    async with AsyncSession(primary) as session:
+        await TaskRepository(session).create_many(
+            [TaskEntity(title=f"Exported {i}") for i in range(5)]
+        )
+        await session.commit()
+
+    async with streaming_unit_of_work(router) as uow:
+        connection = await uow.session.connection()
+        isolation = await connection.get_isolation_level()
+        chunks = [
+            chunk async for chunk in TaskRepository(uow.session).stream(TaskFilter(), 2)
+        ]
+        in_transaction = uow.session.in_transaction()
+
+    # server-side курсор asyncpg не открывается на AUTOCOMMIT-соединении
+    assert isolation != "AUTOCOMMIT"
+    assert in_transaction
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    await router.dispose()
+    await primary.dispose()
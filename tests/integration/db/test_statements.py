@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.domain.task.entity import TaskEntity
+from src.infra.db.connection import Base, get_statement_stats
+from src.infra.db.repositories.task_repositories import TaskRepository
+from src.infra.db.statements import StatementCache
+
+
+async def test_repeated_queries_hit_compiled_cache(tmp_path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stmt.db'}")
+    statement_cache = StatementCache(prewarm_count=1)
+    statement_cache.attach(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        repo = TaskRepository(session)
+        await repo.list(limit=10)
+        for _ in range(3):
+            await repo.get(TaskEntity().id)
+
+    stats = get_statement_stats(engine)
+    assert stats.compiled_misses == 2
+    assert stats.compiled_hits == 2
+    assert stats.prepared_hits == stats.prepared_misses == 0
+    assert statement_cache.hot_statements()[0].startswith("SELECT tasks.id")
+    await engine.dispose()
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.domain.task.entity import TaskEntity
+from src.infra.db.repositories.task_repositories import TaskRepository
+from src.infra.db.unit_of_work import UnitOfWork
+
+
+@pytest.fixture
+def session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+async def test_changes_are_visible_only_after_commit(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    committed = TaskEntity(title="Committed")
+    discarded = TaskEntity(title="Discarded")
+
+    async with session_factory() as session:
+        uow = UnitOfWork(session)
+        await TaskRepository(session).create(committed)
+        await uow.commit()
+        await TaskRepository(session).create(discarded)
+
+    async with session_factory() as session:
+        repo = TaskRepository(session)
+        assert await repo.get(committed.id) is not None
+        assert await repo.get(discarded.id) is None
+
+
+async def test_savepoint_rolls_back_only_nested_work(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    outer = TaskEntity(title="Outer")
+    inner = TaskEntity(title="Inner")
+
+    async with session_factory() as session:
+        uow = UnitOfWork(session)
+        repo = TaskRepository(session)
+        await repo.create(outer)
+        with pytest.raises(RuntimeError):
+            async with uow.savepoint():
+                await repo.create(inner)
+                raise RuntimeError
+        await uow.commit()
+
+    async with session_factory() as session:
+        repo = TaskRepository(session)
+        assert await repo.get(outer.id) is not None
+        assert await repo.get(inner.id) is None
+
+
+async def test_read_only_commit_is_noop(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        uow = UnitOfWork(session, read_only=True)
+        await uow.commit()
+
+        assert uow.commits == 0
@@ -1,7 +1,19 @@
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
 import pytest
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.domain.task.entity import TaskEntity
+from src.domain.task.value_object import (
+    SortOrder,
+    TaskFilter,
+    TaskSort,
+    TaskSortField,
+    TaskStatus,
+)
+from src.infra.db.models.task import Task, TaskCounter, TaskTombstone
 from src.infra.db.repositories.task_repositories import TaskRepository
 
 
@@ -16,3 +28,365 @@ async def test_create_and_get_task(db_session: AsyncSession) -> None:
     assert result is not None
     assert result.title == task.title
     assert result.id == task.id
+
+
+@pytest.mark.asyncio
+async def test_list_after_keyset(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    start = datetime(2100, 1, 1)
+    tasks = [
+        TaskEntity(title=f"Keyset {i}", created_at=start + timedelta(seconds=i))
+        for i in range(3)
+    ]
+    for task in reversed(tasks):
+        await repo.create(task)
+
+    first_page = await repo.list(
+        limit=2, after=(start - timedelta(seconds=1), UUID(int=0))
+    )
+    second_page = await repo.list(
+        limit=2, after=(first_page[-1].created_at, first_page[-1].id)
+    )
+
+    assert [t.id for t in first_page] == [tasks[0].id, tasks[1].id]
+    assert [t.id for t in second_page] == [tasks[2].id]
+
+
+@pytest.mark.asyncio
+async def test_create_many(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    tasks = [TaskEntity(title=f"Bulk {i}") for i in range(5)]
+
+    await repo.create_many(tasks)
+
+    for task in tasks:
+        result = await repo.get(task.id)
+        assert result is not None
+        assert result.title == task.title
+
+
+@pytest.mark.asyncio
+async def test_bulk_status_and_delete_by_filter(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    start = datetime(2200, 1, 1)
+    tasks = [
+        TaskEntity(
+            title=f"Sprint {i}",
+            status=TaskStatus.IN_PROGRESS,
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(5)
+    ]
+    await repo.create_many(tasks)
+    sprint = TaskFilter(
+        statuses=(TaskStatus.IN_PROGRESS,),
+        created_after=start,
+        created_before=start + timedelta(seconds=4),
+    )
+
+    first = await repo.update_status_by_filter(sprint, TaskStatus.COMPLETED, 3)
+    second = await repo.update_status_by_filter(sprint, TaskStatus.COMPLETED, 3)
+    deleted = await repo.delete_by_ids([tasks[0].id, tasks[4].id])
+
+    assert (len(first), len(second)) == (3, 1)
+    assert set(deleted) == {tasks[0].id, tasks[4].id}
+    remaining = await repo.get(tasks[1].id)
+    assert remaining is not None
+    assert remaining.status == TaskStatus.COMPLETED
+    assert await repo.get(tasks[4].id) is None
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_filtered_chunks(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    start = datetime(2300, 1, 1)
+    tasks = [
+        TaskEntity(title=f"Export {i}", created_at=start + timedelta(seconds=i))
+        for i in range(5)
+    ]
+    await repo.create_many(tasks)
+
+    chunks = [
+        chunk
+        async for chunk in repo.stream(TaskFilter(created_after=start), chunk_size=2)
+    ]
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [task.id for chunk in chunks for task in chunk] == [t.id for t in tasks]
+
+
+@pytest.mark.asyncio
+async def test_upsert_many_is_idempotent(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    task = TaskEntity(title="Before")
+    await repo.upsert_many([task])
+
+    task.title = "After"
+    task.status = TaskStatus.COMPLETED
+    await repo.upsert_many([task])
+
+    result = await repo.get(task.id)
+    assert result is not None
+    assert (result.title, result.status) == ("After", TaskStatus.COMPLETED)
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_returning(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    task = TaskEntity(title="Returning")
+    await repo.create(task)
+
+    updated = await repo.update(task.id, {"status": TaskStatus.IN_PROGRESS})
+    missing = await repo.update(uuid4(), {"title": "Nope"})
+
+    assert updated is not None
+    assert (updated.title, updated.status) == ("Returning", TaskStatus.IN_PROGRESS)
+    assert missing is None
+    assert await repo.delete(task.id) is True
+    assert await repo.delete(task.id) is False
+
+
+@pytest.mark.asyncio
+async def test_update_bumps_version_and_checks_expected(
+    db_session: AsyncSession,
+) -> None:
+    repo = TaskRepository(db_session)
+    task = TaskEntity(title="Versioned")
+    await repo.create(task)
+
+    updated = await repo.update(task.id, {"title": "Edited"}, expected_versions=[1])
+    stale = await repo.update(task.id, {"title": "Stale"}, expected_versions=[1])
+    await repo.update_status_by_ids([task.id], TaskStatus.COMPLETED)
+    version = await repo.get_version(task.id)
+
+    assert updated is not None
+    assert updated.version == 2
+    assert stale is None
+    assert version is not None
+    assert version.version == 3
+    assert await repo.get_version(uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_list_filters_by_status_and_search(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    start = datetime(2101, 1, 1)
+    tasks = [
+        TaskEntity(title="Deploy api", status=TaskStatus.IN_PROGRESS),
+        TaskEntity(title="Review", description="before DEPLOY", created_at=start),
+        TaskEntity(title="Deploy web", status=TaskStatus.COMPLETED),
+        TaskEntity(title="100% deploy_ready", status=TaskStatus.IN_PROGRESS),
+    ]
+    for task in tasks:
+        await repo.create(task)
+
+    in_progress = await repo.list(
+        task_filter=TaskFilter(statuses=(TaskStatus.IN_PROGRESS,), search="deploy")
+    )
+    by_description = await repo.list(
+        task_filter=TaskFilter(created_after=start, search="Deploy")
+    )
+    escaped = await repo.list(task_filter=TaskFilter(search="0% deploy_"))
+
+    assert {t.id for t in in_progress} == {tasks[0].id, tasks[3].id}
+    assert [t.id for t in by_description] == [tasks[1].id]
+    assert [t.id for t in escaped] == [tasks[3].id]
+
+
+@pytest.mark.asyncio
+async def test_list_sorted_desc_with_keyset(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    start = datetime(2102, 1, 1)
+    tasks = [TaskEntity(title=f"Sorted {i}", created_at=start) for i in range(3)]
+    await repo.create_many(tasks)
+    task_filter = TaskFilter(created_after=start)
+    sort = TaskSort(field=TaskSortField.TITLE, order=SortOrder.DESC)
+
+    first_page = await repo.list(limit=2, task_filter=task_filter, sort=sort)
+    second_page = await repo.list(
+        limit=2,
+        after=(first_page[-1].title, first_page[-1].id),
+        task_filter=task_filter,
+        sort=sort,
+    )
+
+    assert [t.title for t in first_page] == ["Sorted 2", "Sorted 1"]
+    assert [t.title for t in second_page] == ["Sorted 0"]
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_writes(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    before = await repo.count_by_status()
+    tasks = [TaskEntity(title=f"Counted {i}") for i in range(3)]
+
+    await repo.create_many(tasks)
+    await repo.update(tasks[0].id, {"status": TaskStatus.COMPLETED})
+    await repo.update(tasks[1].id, {"title": "Renamed"})
+    await repo.delete(tasks[2].id)
+    after = await repo.count_by_status()
+
+    assert after[TaskStatus.CREATED] - before[TaskStatus.CREATED] == 1
+    assert after[TaskStatus.COMPLETED] - before[TaskStatus.COMPLETED] == 1
+    assert await repo.estimate_count(TaskFilter()) == sum(after.values())
+    assert await repo.estimate_count(TaskFilter(search="Counted")) is None
+
+
+@pytest.mark.asyncio
+async def test_reconcile_counters_fixes_drift(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    await repo.create(TaskEntity(title="Reconciled"))
+    exact = await repo.count_by_status()
+    await db_session.execute(
+        update(TaskCounter)
+        .where(TaskCounter.status == TaskStatus.CREATED.value)
+        .values(count=TaskCounter.count + 5)
+    )
+
+    before, after = await repo.reconcile_counters()
+
+    assert before[TaskStatus.CREATED] == exact[TaskStatus.CREATED] + 5
+    assert after == exact
+    assert await repo.count_by_status() == exact
+
+
+@pytest.mark.asyncio
+async def test_list_changes_returns_writes_and_tombstones(
+    db_session: AsyncSession,
+) -> None:
+    repo = TaskRepository(db_session)
+    after = (-1, UUID(int=0))
+    while changes := await repo.list_changes(after, 1000):
+        after = (changes[-1].change_seq, changes[-1].task_id)
+    kept, edited, removed = (TaskEntity(title=f"Synced {i}") for i in range(3))
+    await repo.create_many([kept, edited, removed])
+    await repo.update(edited.id, {"title": "Synced edited"})
+    await repo.delete(removed.id)
+
+    changes = await repo.list_changes(after, 10)
+    tail = await repo.list_changes((changes[1].change_seq, changes[1].task_id), 10)
+
+    assert [change.task_id for change in changes] == [kept.id, edited.id, removed.id]
+    assert [change.change_seq for change in changes] == sorted(
+        change.change_seq for change in changes
+    )
+    assert changes[1].task is not None
+    assert changes[1].task.title == "Synced edited"
+    assert changes[2].task is None
+    assert [change.task_id for change in tail] == [removed.id]
+    assert await repo.purge_tombstones(datetime(2000, 1, 1), 10) == 0
+    assert await repo.purge_tombstones(datetime(2999, 1, 1), 1000) >= 1
+    assert await repo.list_changes(after, 10) == changes[:2]
+
+
+@pytest.mark.asyncio
+async def test_get_many_returns_found_tasks(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    tasks = [TaskEntity(title=f"Looked up {i}") for i in range(3)]
+    await repo.create_many(tasks)
+
+    found = await repo.get_many([tasks[2].id, uuid4(), tasks[0].id])
+
+    assert set(found) == {tasks[2].id, tasks[0].id}
+    assert found[tasks[2].id].title == "Looked up 2"
+    assert await repo.get_many([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_oldest_created_tasks(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    # старше всех задач других тестов, поэтому claim берёт их первыми
+    start = datetime(1970, 1, 1)
+    tasks = [
+        TaskEntity(title=f"Queued {i}", created_at=start + timedelta(minutes=i))
+        for i in range(3)
+    ]
+    await repo.create_many(tasks)
+    lease = datetime(2999, 1, 1)
+
+    first = await repo.claim("worker-1", 2, lease)
+    second = await repo.claim("worker-2", 1, lease)
+    seq_before = await db_session.scalar(
+        select(Task.change_seq).where(Task.id == tasks[0].id)
+    )
+    extended = await repo.extend_leases(
+        [tasks[0].id, tasks[2].id], "worker-1", datetime(2999, 1, 2)
+    )
+    seq_after = await db_session.scalar(
+        select(Task.change_seq).where(Task.id == tasks[0].id)
+    )
+    stolen = await repo.complete_leased(tasks[2].id, "worker-1")
+    completed = await repo.complete_leased(tasks[0].id, "worker-1")
+    requeued = await repo.requeue_expired(datetime(2999, 1, 1, 12), 10)
+
+    assert [task.id for task in first] == [tasks[0].id, tasks[1].id]
+    assert [task.status for task in first] == [TaskStatus.IN_PROGRESS] * 2
+    assert [task.id for task in second] == [tasks[2].id]
+    assert extended == [tasks[0].id]
+    # продление аренды не меняет задачу для клиентов
+    assert seq_after == seq_before
+    assert stolen is None
+    assert completed is not None
+    assert completed.status == TaskStatus.COMPLETED
+    assert set(requeued) == {tasks[1].id, tasks[2].id}
+    assert [task.id for task in await repo.claim("worker-3", 2, lease)] == [
+        tasks[1].id,
+        tasks[2].id,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_archive_completed_moves_old_rows(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    # старше задач других тестов: в архив попадут только эти
+    old = datetime(1970, 1, 1)
+    archived = [
+        TaskEntity(
+            title=f"Archived {i}",
+            status=TaskStatus.COMPLETED,
+            updated_at=old + timedelta(minutes=i),
+        )
+        for i in range(3)
+    ]
+    recent = TaskEntity(title="Recently completed", status=TaskStatus.COMPLETED)
+    pending = TaskEntity(title="Old pending", updated_at=old)
+    await repo.create_many([*archived, recent, pending])
+    before = await repo.count_by_status()
+    archived_before = await repo.count_archived_by_status()
+
+    first = await repo.archive_completed(datetime(1971, 1, 1), 2)
+    rest = await repo.archive_completed(datetime(1971, 1, 1), 2)
+    after = await repo.count_by_status()
+    archived_after = await repo.count_archived_by_status()
+    ids = [task.id for task in archived]
+    tombstones = await db_session.scalars(
+        select(TaskTombstone.task_id).where(TaskTombstone.task_id.in_(ids))
+    )
+
+    assert first == ids[:2]
+    assert rest == ids[2:]
+    assert await repo.get_many(ids) == {}
+    archived_task = await repo.get_archived(ids[0])
+    assert archived_task is not None
+    assert archived_task.title == "Archived 0"
+    assert archived_task.status == TaskStatus.COMPLETED
+    assert set(await repo.get_archived_many([*ids, recent.id])) == set(ids)
+    assert await repo.get(recent.id) is not None
+    assert await repo.get(pending.id) is not None
+    # перенос в архив для клиентов синхронизации не удаление
+    assert list(tombstones) == []
+    assert before[TaskStatus.COMPLETED] - after[TaskStatus.COMPLETED] == 3
+    # в сумме с архивом счётчики не меняются, и пересчёт с ними согласен
+    assert (
+        archived_after[TaskStatus.COMPLETED] - archived_before[TaskStatus.COMPLETED]
+        == 3
+    )
+    _, recounted = await repo.reconcile_archive_counters()
+    assert recounted == archived_after
+    # выгрузка архива с тем же фильтром, что и у tasks
+    streamed = [
+        task.id
+        async for chunk in repo.stream(TaskFilter(search="Archived"), 2, archived=True)
+        for task in chunk
+    ]
+    assert streamed == sorted(ids)
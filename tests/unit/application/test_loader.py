@@ -0,0 +1,66 @@
+import asyncio
+from typing import Dict, List, Sequence
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.application.task.loader import TaskLoader
+from src.domain.task.entity import TaskEntity
+
+
+class Store:
+    def __init__(self, tasks: List[TaskEntity]) -> None:
+        self.tasks = {task.id: task for task in tasks}
+        self.batches: List[List[UUID]] = []
+        self.fail = False
+
+    async def load_many(self, task_ids: Sequence[UUID]) -> Dict[UUID, TaskEntity]:
+        self.batches.append(list(task_ids))
+        if self.fail:
+            raise ConnectionError("database is down")
+        return {
+            task_id: self.tasks[task_id]
+            for task_id in task_ids
+            if task_id in self.tasks
+        }
+
+
+async def test_loads_in_one_tick_share_one_batch() -> None:
+    first, second = TaskEntity(title="First"), TaskEntity(title="Second")
+    store = Store([first, second])
+    loader = TaskLoader(store.load_many)
+    missing = uuid4()
+
+    results = await asyncio.gather(
+        loader.load(second.id), loader.load(missing), loader.load(first.id)
+    )
+    again = await loader.load_many([first.id, second.id])
+
+    assert list(results) == [second, None, first]
+    assert again == [first, second]
+    assert store.batches == [[second.id, missing, first.id]]
+
+
+async def test_batches_are_capped_and_sequential() -> None:
+    tasks = [TaskEntity(title=str(i)) for i in range(5)]
+    store = Store(tasks)
+    loader = TaskLoader(store.load_many, max_batch_size=2)
+
+    results = await loader.load_many([task.id for task in tasks])
+
+    assert results == tasks
+    assert [len(batch) for batch in store.batches] == [2, 2, 1]
+
+
+async def test_failed_batch_is_not_remembered() -> None:
+    task = TaskEntity(title="Flaky")
+    store = Store([task])
+    loader = TaskLoader(store.load_many)
+
+    store.fail = True
+    with pytest.raises(ConnectionError):
+        await loader.load(task.id)
+    store.fail = False
+
+    assert await loader.load(task.id) == task
+    assert len(store.batches) == 2
@@ -0,0 +1,51 @@
+import base64
+
+import orjson
+import pytest
+
+from src.application.task.pagination import decode_cursor, encode_cursor
+from src.domain.task.entity import TaskEntity
+from src.domain.task.exception import TaskValidationError
+from src.domain.task.value_object import SortOrder, TaskSort, TaskSortField
+
+
+def test_cursor_roundtrip() -> None:
+    task = TaskEntity(title="Test")
+
+    created_at, task_id = decode_cursor(encode_cursor(task))
+
+    assert created_at == task.created_at
+    assert task_id == task.id
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "WzFd"])
+def test_decode_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(TaskValidationError):
+        decode_cursor(cursor)
+
+
+def test_cursor_roundtrip_for_custom_sort() -> None:
+    task = TaskEntity(title="Test")
+    sort = TaskSort(field=TaskSortField.TITLE, order=SortOrder.DESC)
+
+    assert decode_cursor(encode_cursor(task, sort), sort) == (task.title, task.id)
+
+
+def test_cursor_is_bound_to_sort() -> None:
+    task = TaskEntity(title="Test")
+    title_sort = TaskSort(field=TaskSortField.TITLE)
+
+    with pytest.raises(TaskValidationError):
+        decode_cursor(encode_cursor(task), title_sort)
+    with pytest.raises(TaskValidationError):
+        decode_cursor(encode_cursor(task, title_sort))
+
+
+@pytest.mark.parametrize(
+    "payload", [["2024-01-01T00:00:00+00:00", 123], ["2024-01-01T00:00:00", None]]
+)
+def test_decode_cursor_with_non_string_id(payload: list[object]) -> None:
+    cursor = base64.urlsafe_b64encode(orjson.dumps(payload)).decode()
+
+    with pytest.raises(TaskValidationError):
+        decode_cursor(cursor)
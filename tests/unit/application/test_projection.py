@@ -0,0 +1,24 @@
+import pytest
+
+from src.application.task.projection import parse_fields, with_required
+from src.domain.task.exception import TaskValidationError
+from src.domain.task.value_object import TaskField
+
+
+def test_parse_fields_keeps_order_and_drops_duplicates() -> None:
+    assert parse_fields(" status,id,,status ") == (TaskField.STATUS, TaskField.ID)
+    assert parse_fields("") is None
+    assert parse_fields(None) is None
+
+
+def test_parse_fields_rejects_unknown() -> None:
+    with pytest.raises(TaskValidationError) as error:
+        parse_fields("id,owner")
+
+    assert "owner" in error.value.reason
+
+
+def test_with_required_appends_missing_fields() -> None:
+    fields = with_required((TaskField.TITLE,), TaskField.ID, TaskField.TITLE)
+
+    assert fields == (TaskField.TITLE, TaskField.ID)
@@ -0,0 +1,81 @@
+import logging
+from typing import Any, List
+from uuid import uuid4
+
+import pytest
+
+from src.application.task.service_logger import ServiceLogger
+from src.domain.task.value_object import TaskStatus
+from src.infra.config import ServiceLogSettings
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def handler() -> RecordingHandler:
+    return RecordingHandler()
+
+
+def make_logger(
+    handler: RecordingHandler, level: int, **settings: Any
+) -> ServiceLogger:
+    logger = logging.getLogger(f"test_service_logger.{uuid4()}")
+    logger.propagate = False
+    logger.setLevel(level)
+    logger.addHandler(handler)
+    return ServiceLogger(logger, ServiceLogSettings(**settings))
+
+
+def test_disabled_level_skips_payload(handler: RecordingHandler) -> None:
+    log = make_logger(handler, logging.INFO)
+    calls = []
+
+    log.debug("debug", action="noisy", payload=lambda: calls.append(1))
+
+    assert handler.records == []
+    assert calls == []
+
+
+def test_fields_are_compacted(handler: RecordingHandler) -> None:
+    log = make_logger(handler, logging.INFO, max_items=2, max_str_length=40)
+    task_id = uuid4()
+
+    log.info(
+        "listed",
+        action="tasks_listed",
+        task_id=task_id,
+        status=TaskStatus.CREATED,
+        title="x" * 50,
+        ids=lambda: [1, 2, 3],
+    )
+
+    record = handler.records[0]
+    assert record.action == "tasks_listed"  # type: ignore[attr-defined]
+    assert record.task_id == str(task_id)  # type: ignore[attr-defined]
+    assert record.status == TaskStatus.CREATED.value  # type: ignore[attr-defined]
+    assert record.title == "x" * 40 + "…"  # type: ignore[attr-defined]
+    assert record.ids == {"count": 3, "sample": [1, 2]}  # type: ignore[attr-defined]
+
+
+def test_sampling_keeps_every_nth_event(handler: RecordingHandler) -> None:
+    log = make_logger(
+        handler, logging.INFO, sample_rates={"tasks_listed": 0.25, "muted": 0}
+    )
+
+    for i in range(8):
+        log.info("listed %d", i, action="tasks_listed")
+        log.info("muted", action="muted")
+    log.info("created", action="task_created")
+
+    assert [record.getMessage() for record in handler.records] == [
+        "listed 0",
+        "listed 4",
+        "created",
+    ]
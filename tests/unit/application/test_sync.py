@@ -0,0 +1,41 @@
+import base64
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import orjson
+import pytest
+
+from src.application.task.sync import (
+    SyncToken,
+    decode_sync_token,
+    encode_sync_token,
+)
+from src.domain.task.exception import TaskValidationError
+
+
+def test_sync_token_round_trip() -> None:
+    token = SyncToken(keyset=(42, uuid4()), synced_at=datetime.now(timezone.utc))
+
+    assert decode_sync_token(encode_sync_token(token)) == token
+
+
+@pytest.mark.parametrize("raw", ["", "not a token", encode_sync_token(SyncToken())])
+def test_decode_sync_token_rejects_malformed(raw: str) -> None:
+    with pytest.raises(TaskValidationError):
+        decode_sync_token(raw)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        # id не строка
+        [42, 123, "2024-01-01T00:00:00+00:00"],
+        # время без часового пояса нельзя сравнить со временем сервера
+        [42, str(uuid4()), "2024-01-01T00:00:00"],
+    ],
+)
+def test_decode_sync_token_rejects_crafted_payload(payload: list[object]) -> None:
+    raw = base64.urlsafe_b64encode(orjson.dumps(payload)).decode().rstrip("=")
+
+    with pytest.raises(TaskValidationError):
+        decode_sync_token(raw)
@@ -1,14 +1,53 @@
-from unittest.mock import AsyncMock
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, List
+from unittest.mock import AsyncMock, Mock
+from uuid import UUID, uuid4
 
 import pytest
 
+from src.application.task.archive import ARCHIVE_AFTER, ARCHIVE_BATCH_SIZE
+from src.application.task.batch import BULK_CHUNK_SIZE
+from src.application.task.pagination import decode_cursor
+from src.application.task.sync import (
+    TOMBSTONE_RETENTION,
+    SyncToken,
+    decode_sync_token,
+    encode_sync_token,
+)
 from src.application.task.task_service import TaskService
-from src.domain.task.exception import TaskValidationError
+from src.domain.task.entity import TaskChange, TaskEntity
+from src.domain.task.exception import (
+    TaskArchivedError,
+    TaskLeaseLostError,
+    TaskNotFoundError,
+    TaskSyncExpiredError,
+    TaskValidationError,
+    TaskVersionConflictError,
+)
+from src.domain.task.value_object import (
+    SortOrder,
+    TaskField,
+    TaskFilter,
+    TaskSort,
+    TaskSortField,
+    TaskStatus,
+    TaskVersion,
+)
+from src.infra.cache import InMemoryTaskCache
+from src.infra.coalescing import SingleFlight
+from src.infra.events import InMemoryTaskEventBroker, TaskEvent, TaskEventType
 
 
 @pytest.fixture
 def mock_repo() -> AsyncMock:
-    return AsyncMock()
+    repo = AsyncMock()
+    # архив пуст, пока тест не положит туда задачу
+    repo.get_archived.return_value = None
+    repo.get_archived_many.return_value = {}
+    repo.count_archived_by_status.return_value = {}
+    repo.reconcile_archive_counters.return_value = ({}, {})
+    return repo
 
 
 @pytest.fixture
@@ -31,3 +70,570 @@ async def test_create_task_success(service: TaskService, mock_repo: AsyncMock) -
 async def test_create_task_validation_error(service: TaskService) -> None:
     with pytest.raises(TaskValidationError):
         await service.create("", "description")
+
+
+@pytest.mark.asyncio
+async def test_create_many_collects_item_errors(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    result = await service.create_many(
+        [("Valid", ""), ("", ""), ("x" * 101, ""), ("Long", "x" * 1001)]
+    )
+
+    assert [task.title for task in result.created] == ["Valid"]
+    assert [error.index for error in result.errors] == [1, 2, 3]
+    assert result.errors[-1].error.body()["field"] == "description"
+    mock_repo.create_many.assert_called_once_with(result.created)
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_by_filter_runs_until_short_chunk(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    mock_repo.delete_by_filter = AsyncMock(
+        side_effect=[[uuid4() for _ in range(BULK_CHUNK_SIZE)], [uuid4()] * 7]
+    )
+
+    result = await service.bulk_delete(
+        task_filter=TaskFilter(statuses=(TaskStatus.COMPLETED,))
+    )
+
+    assert result.chunks == [BULK_CHUNK_SIZE, 7]
+    assert result.affected == BULK_CHUNK_SIZE + 7
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_rejects_empty_filter(service: TaskService) -> None:
+    with pytest.raises(TaskValidationError):
+        await service.bulk_delete(task_filter=TaskFilter())
+
+
+@pytest.mark.asyncio
+async def test_get_is_served_from_cache_until_delete(mock_repo: AsyncMock) -> None:
+    task = TaskEntity(title="Cached")
+    mock_repo.get = AsyncMock(return_value=task)
+    service = TaskService(
+        mock_repo, cache=InMemoryTaskCache(max_size=10, ttl=60, negative_ttl=1)
+    )
+
+    await service.get(task.id)
+    await service.get(task.id)
+    await service.delete(task.id)
+    await service.get(task.id)
+
+    assert mock_repo.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_reads_replica_and_keeps_concurrent_invalidation(
+    mock_repo: AsyncMock,
+) -> None:
+    task = TaskEntity(title="Replica")
+    cache = InMemoryTaskCache(max_size=10, ttl=60, negative_ttl=1)
+
+    async def get_during_write(task_id: UUID) -> TaskEntity:
+        # другой запрос успевает записать задачу, пока идёт чтение
+        await cache.invalidate([task_id])
+        return task
+
+    replica_repo = AsyncMock()
+    replica_repo.get = AsyncMock(side_effect=get_during_write)
+    service = TaskService(mock_repo, cache=cache, read_repository=lambda: replica_repo)
+
+    assert await service.get(task.id) == task
+    mock_repo.get.assert_not_awaited()
+    assert await cache.get(task.id) is None
+
+
+@pytest.mark.asyncio
+async def test_import_lines_reports_rejected_line_numbers(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    async def lines() -> AsyncIterator[bytes]:
+        for line in [b'{"title": "One"}', b"", b"not json", b'{"title": " "}']:
+            yield line
+
+    result = await service.import_lines(lines())
+
+    assert result.accepted == 1
+    assert [error.index for error in result.rejected] == [3, 4]
+    mock_repo.create_many.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_import_lines_checks_description(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    long_description = b'{"title": "Long", "description": "' + b"x" * 1001 + b'"}'
+
+    async def lines() -> AsyncIterator[bytes]:
+        for line in [long_description, b'{"title": "Typed", "description": 5}']:
+            yield line
+
+    result = await service.import_lines(lines())
+
+    assert result.accepted == 0
+    assert [error.error.body()["field"] for error in result.rejected] == [
+        "description",
+        "description",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_upsert_rejects_archived_ids(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    archived, fresh = TaskEntity(title="Archived"), uuid4()
+    mock_repo.get_archived_many.return_value = {archived.id: archived}
+
+    async def lines() -> AsyncIterator[bytes]:
+        for task_id in (fresh, archived.id):
+            yield b'{"id": "%s", "title": "Restored"}' % str(task_id).encode()
+
+    result = await service.import_lines(lines(), upsert=True)
+
+    assert result.accepted == 1
+    assert [error.index for error in result.rejected] == [2]
+    assert isinstance(result.rejected[0].error, TaskArchivedError)
+    [upserted] = mock_repo.upsert_many.await_args.args[0]
+    assert upserted.id == fresh
+
+
+@pytest.mark.asyncio
+async def test_export_includes_archive(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    hot, old = TaskEntity(title="Hot"), TaskEntity(title="Archived")
+
+    async def stream(
+        task_filter: TaskFilter, chunk_size: int, archived: bool = False
+    ) -> AsyncIterator[List[TaskEntity]]:
+        yield [old if archived else hot]
+
+    mock_repo.stream = stream
+
+    chunks = [chunk async for chunk in service.export(TaskFilter())]
+
+    assert chunks == [[hot], [old]]
+
+
+@pytest.mark.asyncio
+async def test_patch_writes_only_given_fields(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    task_id = uuid4()
+    mock_repo.update = AsyncMock(return_value=TaskEntity(id=task_id))
+
+    await service.patch(task_id, status=TaskStatus.COMPLETED)
+
+    mock_repo.update.assert_awaited_once_with(
+        task_id, {"status": TaskStatus.COMPLETED}, None
+    )
+    mock_repo.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_delete_missing_task_raises(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    mock_repo.delete = AsyncMock(return_value=False)
+
+    with pytest.raises(TaskNotFoundError):
+        await service.delete(uuid4())
+
+
+@pytest.mark.asyncio
+async def test_update_commits_once(service: TaskService, mock_repo: AsyncMock) -> None:
+    task_id = uuid4()
+    mock_repo.update = AsyncMock(return_value=TaskEntity(id=task_id, title="New"))
+
+    await service.update(task_id, "New", "", TaskStatus.CREATED)
+
+    mock_repo.session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_list_passes_filter_and_sort(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    task = TaskEntity(title="Deploy")
+    mock_repo.list = AsyncMock(return_value=[task])
+    task_filter = TaskFilter(statuses=(TaskStatus.IN_PROGRESS,), search="deploy")
+    sort = TaskSort(field=TaskSortField.TITLE, order=SortOrder.DESC)
+
+    page = await service.list(limit=1, task_filter=task_filter, sort=sort)
+
+    mock_repo.list.assert_awaited_once_with(
+        0, 1, after=None, task_filter=task_filter, sort=sort
+    )
+    assert decode_cursor(page.next_cursor or "", sort) == (task.title, task.id)
+
+
+@pytest.mark.asyncio
+async def test_list_rejects_long_search(service: TaskService) -> None:
+    with pytest.raises(TaskValidationError):
+        await service.list(task_filter=TaskFilter(search="x" * 101))
+
+
+@pytest.mark.asyncio
+async def test_reconcile_stats_reports_drift(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    mock_repo.reconcile_counters = AsyncMock(
+        return_value=(
+            {TaskStatus.CREATED: 3, TaskStatus.COMPLETED: 1},
+            {TaskStatus.CREATED: 2, TaskStatus.COMPLETED: 1},
+        )
+    )
+
+    result = await service.reconcile_stats()
+
+    assert result.drift == {TaskStatus.CREATED: -1}
+    assert result.after.total == 3
+    mock_repo.session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_list_rows_selects_requested_and_cursor_fields(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    mock_repo.list_rows = AsyncMock(return_value=[])
+    sort = TaskSort(field=TaskSortField.STATUS)
+
+    page = await service.list_rows(sort=sort, fields="title")
+
+    assert page.fields == (TaskField.TITLE,)
+    assert mock_repo.list_rows.await_args.kwargs["fields"] == (
+        TaskField.TITLE,
+        TaskField.ID,
+        TaskField.STATUS,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_fields_missing_task_raises(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    mock_repo.get_row = AsyncMock(return_value=None)
+
+    with pytest.raises(TaskNotFoundError):
+        await service.get_fields(uuid4(), "id,title")
+
+
+@pytest.mark.asyncio
+async def test_reads_stick_to_primary_after_write(mock_repo: AsyncMock) -> None:
+    replica_repo = AsyncMock()
+    replica_repo.list = AsyncMock(return_value=[])
+    mock_repo.list = AsyncMock(return_value=[])
+    service = TaskService(mock_repo, read_repository=lambda: replica_repo)
+
+    await service.list()
+    await service.create("Written")
+    await service.list()
+
+    replica_repo.list.assert_awaited_once()
+    mock_repo.list.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_replica_repository_is_opened_only_for_reads(
+    mock_repo: AsyncMock,
+) -> None:
+    replica_repo = AsyncMock()
+    replica_repo.list = AsyncMock(return_value=[])
+    open_replica = Mock(return_value=replica_repo)
+
+    await TaskService(mock_repo, read_repository=open_replica).create("Written")
+    open_replica.assert_not_called()
+
+    reader = TaskService(mock_repo, read_repository=open_replica)
+    await reader.list()
+    await reader.list()
+    open_replica.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_update_with_stale_version_raises_conflict(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    mock_repo.update = AsyncMock(return_value=None)
+    mock_repo.get_version = AsyncMock(
+        return_value=TaskVersion(version=3, updated_at=datetime.now())
+    )
+
+    with pytest.raises(TaskVersionConflictError):
+        await service.patch(uuid4(), title="Stale", expected_versions=[2])
+    mock_repo.session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_writes_publish_events_after_commit(mock_repo: AsyncMock) -> None:
+    broker = InMemoryTaskEventBroker(queue_size=10)
+    service = TaskService(mock_repo, events=broker)
+    subscription = broker.subscribe()
+    task_id = uuid4()
+    mock_repo.update = AsyncMock(return_value=TaskEntity(id=task_id))
+    mock_repo.delete = AsyncMock(return_value=True)
+
+    created = await service.create("Live")
+    await service.patch(task_id, title="Edited")
+    await service.delete(task_id)
+    await broker.stop()
+
+    assert [event async for event in subscription.events()] == [
+        TaskEvent(TaskEventType.CREATED, (created.id,)),
+        TaskEvent(TaskEventType.UPDATED, (task_id,)),
+        TaskEvent(TaskEventType.DELETED, (task_id,)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_events_are_sent_in_the_write_transaction(mock_repo: AsyncMock) -> None:
+    broker = InMemoryTaskEventBroker(queue_size=10)
+    committed_at_prepare: List[bool] = []
+
+    async def prepare(session: Any, events: Any) -> None:
+        assert session is mock_repo.session
+        committed_at_prepare.append(mock_repo.session.commit.await_count > 0)
+
+    broker.prepare = prepare  # type: ignore[method-assign]
+    service = TaskService(mock_repo, events=broker)
+
+    await service.create("Live")
+
+    assert committed_at_prepare == [False]
+    mock_repo.session.commit.assert_awaited_once()
+    assert broker.stats.published == 1
+
+
+@pytest.mark.asyncio
+async def test_changes_pages_and_keeps_sync_time_until_caught_up(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    task = TaskEntity(title="Changed")
+    deleted_id = uuid4()
+    mock_repo.list_changes.return_value = [
+        TaskChange(5, task.id, task),
+        TaskChange(7, deleted_id),
+    ]
+    synced_at = datetime.now(timezone.utc) - timedelta(days=1)
+    since = encode_sync_token(SyncToken(keyset=(3, uuid4()), synced_at=synced_at))
+
+    first = await service.changes(since=since, limit=1)
+    mock_repo.list_changes.return_value = [TaskChange(7, deleted_id)]
+    second = await service.changes(since=first.token, limit=1)
+
+    assert first.tasks == [task]
+    assert first.has_more is True
+    assert decode_sync_token(first.token) == SyncToken((5, task.id), synced_at)
+    assert second.deleted == [deleted_id]
+    assert second.has_more is False
+    caught_up_at = decode_sync_token(second.token).synced_at
+    assert caught_up_at is not None
+    assert caught_up_at > synced_at
+    mock_repo.list_changes.assert_called_with((5, task.id), 2)
+
+
+@pytest.mark.asyncio
+async def test_changes_with_expired_token_raises(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    synced_at = datetime.now(timezone.utc) - TOMBSTONE_RETENTION - timedelta(hours=1)
+    since = encode_sync_token(SyncToken(keyset=(3, uuid4()), synced_at=synced_at))
+
+    with pytest.raises(TaskSyncExpiredError):
+        await service.changes(since=since)
+    mock_repo.list_changes.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_one_read_until_write(
+    mock_repo: AsyncMock,
+) -> None:
+    task = TaskEntity(title="Popular")
+    release = asyncio.Event()
+
+    async def slow_get(task_id: UUID) -> TaskEntity:
+        await release.wait()
+        return task
+
+    mock_repo.get.side_effect = slow_get
+    mock_repo.update.return_value = task
+    flights = SingleFlight()
+    readers = [
+        asyncio.create_task(TaskService(mock_repo, flights=flights).get(task.id))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    await TaskService(mock_repo, flights=flights).patch(task.id, title="Edited")
+    late = asyncio.create_task(TaskService(mock_repo, flights=flights).get(task.id))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*readers, late) == [task] * 4
+    # чтение после записи не присоединилось к начатому до неё
+    assert mock_repo.get.await_count == 2
+    assert flights.stats.coalesced == 2
+
+
+@pytest.mark.asyncio
+async def test_requeue_expired_leases_forgets_coalesced_reads(
+    mock_repo: AsyncMock,
+) -> None:
+    task = TaskEntity(title="Leased")
+    release = asyncio.Event()
+
+    async def slow_get(task_id: UUID) -> TaskEntity:
+        await release.wait()
+        return task
+
+    mock_repo.get.side_effect = slow_get
+    mock_repo.requeue_expired.side_effect = [[task.id], []]
+    flights = SingleFlight()
+    reader = asyncio.create_task(TaskService(mock_repo, flights=flights).get(task.id))
+    await asyncio.sleep(0)
+    requeued = await TaskService(mock_repo, flights=flights).requeue_expired_leases()
+    late = asyncio.create_task(TaskService(mock_repo, flights=flights).get(task.id))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert requeued == 1
+    assert list(await asyncio.gather(reader, late)) == [task] * 2
+    # чтение после возврата в очередь не получило ответ, начатый до него
+    assert mock_repo.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_many_keeps_order_and_reports_missing(
+    mock_repo: AsyncMock,
+) -> None:
+    cached, stored = TaskEntity(title="Cached"), TaskEntity(title="Stored")
+    missing = uuid4()
+    cache = InMemoryTaskCache(max_size=10, ttl=60, negative_ttl=60)
+    await cache.set(cached.id, cached)
+    mock_repo.get_many.return_value = {stored.id: stored}
+    service = TaskService(mock_repo, cache=cache)
+
+    result = await service.get_many([stored.id, missing, cached.id, stored.id])
+    # «не найдено» закэшировано: второй раз в базу не идём
+    await service.get_many([missing])
+
+    assert result.tasks == [stored, cached]
+    assert result.missing == [missing]
+    mock_repo.get_many.assert_awaited_once_with([stored.id, missing])
+
+
+@pytest.mark.asyncio
+async def test_get_many_reuses_request_loader_until_write(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    task = TaskEntity(title="Loaded")
+    mock_repo.get_many.return_value = {task.id: task}
+
+    await service.get_many([task.id])
+    await service.get_many([task.id])
+    assert mock_repo.get_many.await_count == 1
+
+    await service.create("Written")
+    await service.get_many([task.id])
+    assert mock_repo.get_many.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_many_rejects_too_many_ids(service: TaskService) -> None:
+    with pytest.raises(TaskValidationError):
+        await service.get_many([uuid4() for _ in range(1001)])
+
+
+@pytest.mark.asyncio
+async def test_complete_distinguishes_lost_lease_from_missing_task(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    task_id = uuid4()
+    mock_repo.complete_leased.return_value = None
+    mock_repo.get_version.return_value = TaskVersion(2, datetime.now())
+
+    with pytest.raises(TaskLeaseLostError):
+        await service.complete("worker-1", task_id)
+    mock_repo.get_version.return_value = None
+    with pytest.raises(TaskNotFoundError):
+        await service.complete("worker-1", task_id)
+    mock_repo.session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "worker, n, lease", [("", 1, None), ("w", 0, None), ("w", 101, None), ("w", 1, 0)]
+)
+async def test_claim_rejects_invalid_arguments(
+    service: TaskService, mock_repo: AsyncMock, worker: str, n: int, lease: float
+) -> None:
+    with pytest.raises(TaskValidationError):
+        await service.claim(worker, n=n, lease=lease)
+    mock_repo.claim.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_archive(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    archived = TaskEntity(title="Archived", status=TaskStatus.COMPLETED, version=4)
+    mock_repo.get.return_value = None
+    mock_repo.get_version.return_value = None
+    mock_repo.get_many.return_value = {}
+    mock_repo.get_archived.return_value = archived
+    mock_repo.get_archived_many.return_value = {archived.id: archived}
+
+    assert await service.get(archived.id) == archived
+    assert (await service.get_version(archived.id)).version == 4
+    assert (await service.get_many([archived.id])).tasks == [archived]
+
+
+@pytest.mark.asyncio
+async def test_writes_to_archived_task_raise(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    archived = TaskEntity(title="Archived", status=TaskStatus.COMPLETED)
+    mock_repo.update.return_value = None
+    mock_repo.delete.return_value = False
+    mock_repo.get_archived.return_value = archived
+
+    with pytest.raises(TaskArchivedError):
+        await service.patch(archived.id, title="Renamed")
+    with pytest.raises(TaskArchivedError):
+        await service.delete(archived.id)
+    mock_repo.session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_archive_completed_runs_until_short_batch(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    full = [uuid4() for _ in range(ARCHIVE_BATCH_SIZE)]
+    mock_repo.archive_completed.side_effect = [full, [uuid4()]]
+
+    archived = await service.archive_completed()
+
+    assert archived == ARCHIVE_BATCH_SIZE + 1
+    assert mock_repo.archive_completed.await_count == 2
+    before, limit = mock_repo.archive_completed.await_args.args
+    assert limit == ARCHIVE_BATCH_SIZE
+    assert datetime.now(timezone.utc) - before >= ARCHIVE_AFTER
+    assert mock_repo.session.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_include_archived_tasks(
+    service: TaskService, mock_repo: AsyncMock
+) -> None:
+    mock_repo.count_by_status.return_value = {
+        TaskStatus.CREATED: 2,
+        TaskStatus.COMPLETED: 1,
+    }
+    mock_repo.count_archived_by_status.return_value = {TaskStatus.COMPLETED: 5}
+
+    stats = await service.stats()
+
+    assert stats.by_status[TaskStatus.COMPLETED] == 6
+    assert stats.archived == {TaskStatus.COMPLETED: 5}
+    assert stats.total == 8
@@ -0,0 +1,183 @@
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pytest
+
+from src.domain.task.entity import TaskEntity
+from src.infra.cache import (
+    SET_IF_GENERATION_SCRIPT,
+    InMemoryTaskCache,
+    SharedTaskCache,
+    TaskCacheBackend,
+)
+
+
+class LocalKeyValueClient:
+    """In-process stand-in for the shared key-value store."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, Tuple[float, bytes]] = {}
+        self.commands: Counter[str] = Counter()
+
+    async def get(self, name: str) -> Optional[bytes]:
+        self.commands["get"] += 1
+        return self._read(name)
+
+    def _read(self, name: str) -> Optional[bytes]:
+        entry = self.data.get(name)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def mget(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        self.commands["mget"] += 1
+        return [self._read(key) for key in keys]
+
+    async def set(self, name: str, value: bytes, px: int) -> Any:
+        self.data[name] = (time.monotonic() + px / 1000, value)
+
+    async def delete(self, *names: str) -> Any:
+        for name in names:
+            self.data.pop(name, None)
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        """Runs the compare-and-set script's logic in one step, as the store would."""
+        assert script == SET_IF_GENERATION_SCRIPT
+        self.commands["eval"] += 1
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        stored = 0
+        for i in range(numkeys // 2):
+            if (self._read(keys[2 * i + 1]) or b"") == args[3 * i]:
+                await self.set(keys[2 * i], args[3 * i + 1], px=args[3 * i + 2])
+                stored += 1
+        return stored
+
+
+async def test_lru_evicts_least_recently_used() -> None:
+    cache = InMemoryTaskCache(max_size=2, ttl=60, negative_ttl=1)
+    first, second, third = (TaskEntity(title=str(i)) for i in range(3))
+
+    await cache.set(first.id, first)
+    await cache.set(second.id, second)
+    await cache.get(first.id)
+    await cache.set(third.id, third)
+
+    assert await cache.get(second.id) is None
+    assert await cache.get(first.id) is not None
+    assert cache.stats.evictions == 1
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+
+async def test_negative_entry_expires() -> None:
+    cache = InMemoryTaskCache(max_size=10, ttl=60, negative_ttl=0)
+    task = TaskEntity()
+
+    await cache.set(task.id, None)
+
+    assert await cache.get(task.id) is None
+    assert cache.stats.expirations == 1
+
+
+async def test_cached_task_is_a_copy() -> None:
+    cache = InMemoryTaskCache(max_size=10, ttl=60, negative_ttl=1)
+    task = TaskEntity(title="Original")
+    await cache.set(task.id, task)
+
+    cached = await cache.get(task.id)
+    assert cached is not None and cached.task is not None
+    cached.task.title = "Changed"
+
+    again = await cache.get(task.id)
+    assert again is not None and again.task is not None
+    assert again.task.title == "Original"
+
+
+@pytest.mark.parametrize("found", [True, False])
+async def test_shared_cache_roundtrip_and_invalidate(found: bool) -> None:
+    cache = SharedTaskCache(LocalKeyValueClient(), ttl=60, negative_ttl=60)
+    task = TaskEntity(title="Shared")
+
+    await cache.set(task.id, task if found else None)
+    cached = await cache.get(task.id)
+    await cache.invalidate([task.id])
+
+    assert cached is not None
+    assert cached.task == (task if found else None)
+    assert await cache.get(task.id) is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+async def test_shared_cache_get_many_skips_misses() -> None:
+    cache = SharedTaskCache(LocalKeyValueClient(), ttl=60, negative_ttl=60)
+    task, missing = TaskEntity(title="Shared"), TaskEntity()
+    await cache.set(task.id, task)
+
+    found = await cache.get_many([missing.id, task.id])
+
+    assert list(found) == [task.id]
+    assert found[task.id].task == task
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "cache",
+    [
+        InMemoryTaskCache(max_size=10, ttl=60, negative_ttl=60),
+        SharedTaskCache(LocalKeyValueClient(), ttl=60, negative_ttl=60),
+    ],
+)
+async def test_invalidation_during_load_wins(cache: TaskCacheBackend) -> None:
+    task = TaskEntity(title="Stale")
+
+    generation = await cache.generation(task.id)
+    await cache.invalidate([task.id])
+    stored = await cache.set_if_unchanged(task.id, task, generation)
+
+    assert not stored
+    assert await cache.get(task.id) is None
+    assert await cache.set_if_unchanged(task.id, task, await cache.generation(task.id))
+    assert await cache.get(task.id) is not None
+
+
+async def test_evicted_invalidation_still_guards_load() -> None:
+    cache = InMemoryTaskCache(max_size=1, ttl=60, negative_ttl=60)
+    task, other = TaskEntity(title="Stale"), TaskEntity()
+
+    generation = await cache.generation(task.id)
+    await cache.invalidate([task.id])
+    await cache.invalidate([other.id])
+
+    assert not await cache.set_if_unchanged(task.id, task, generation)
+
+
+async def test_shared_cache_generations_use_one_mget() -> None:
+    client = LocalKeyValueClient()
+    cache = SharedTaskCache(client, ttl=60, negative_ttl=60)
+    invalidated, untouched = TaskEntity(), TaskEntity()
+    await cache.invalidate([invalidated.id])
+
+    generations = await cache.generations([invalidated.id, untouched.id])
+
+    assert generations[invalidated.id] is not None
+    assert generations[untouched.id] is None
+    assert client.commands["mget"] == 1
+    assert client.commands["get"] == 0
+
+
+async def test_set_many_skips_tasks_invalidated_during_load() -> None:
+    client = LocalKeyValueClient()
+    cache = SharedTaskCache(client, ttl=60, negative_ttl=60)
+    stale, fresh = TaskEntity(title="Stale"), TaskEntity(title="Fresh")
+
+    generations = await cache.generations([stale.id, fresh.id])
+    await cache.invalidate([stale.id])
+    stored = await cache.set_many_if_unchanged(
+        {stale.id: stale, fresh.id: fresh}, generations
+    )
+
+    assert stored == 1
+    assert list(await cache.get_many([stale.id, fresh.id])) == [fresh.id]
+    assert client.commands["get"] == 0
+    # проверка метки и запись одной командой хранилища
+    assert client.commands["eval"] == 1
@@ -0,0 +1,101 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from src.infra.coalescing import SingleFlight
+
+
+class Loader:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> List[int]:
+        self.calls += 1
+        call = self.calls
+        await self.release.wait()
+        return [call]
+
+
+async def test_concurrent_calls_share_one_load() -> None:
+    flights = SingleFlight()
+    load = Loader()
+
+    calls = [asyncio.create_task(flights.do("key", load)) for _ in range(5)]
+    await asyncio.sleep(0)
+    load.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert load.calls == 1
+    assert all(result is results[0] for result in results)
+    assert flights.stats.leaders == 1
+    assert flights.stats.coalesced == 4
+    assert flights.stats.in_flight == 0
+
+
+async def test_error_reaches_every_waiter() -> None:
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail() -> None:
+        await release.wait()
+        raise ValueError("boom")
+
+    calls = [asyncio.create_task(flights.do("key", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert flights.stats.errors == 1
+
+
+async def test_cancelled_leader_hands_load_to_waiter() -> None:
+    flights = SingleFlight()
+    load = Loader()
+    leader = asyncio.create_task(flights.do("key", load))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", load))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    load.release.set()
+
+    assert await follower == [2]
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert flights.stats.retries == 1
+
+
+async def test_cancelled_waiter_does_not_cancel_load() -> None:
+    flights = SingleFlight()
+    load = Loader()
+    leader = asyncio.create_task(flights.do("key", load))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", load))
+    await asyncio.sleep(0)
+
+    follower.cancel()
+    await asyncio.sleep(0)
+    load.release.set()
+
+    assert await leader == [1]
+    assert follower.cancelled()
+
+
+async def test_forgotten_key_starts_new_load() -> None:
+    flights = SingleFlight()
+    load = Loader()
+    stale = asyncio.create_task(flights.do("key", load))
+    await asyncio.sleep(0)
+
+    flights.forget(lambda key: key == "key")
+    fresh = asyncio.create_task(flights.do("key", load))
+    await asyncio.sleep(0)
+    load.release.set()
+
+    assert await stale == [1]
+    assert await fresh == [2]
+    assert flights.stats.coalesced == 0
@@ -0,0 +1,40 @@
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from src.presentation.web_api.conditional import (
+    etag_matches,
+    http_date,
+    page_etag,
+    parse_if_match,
+    task_etag,
+)
+
+
+def test_etag_matches_weak_and_lists() -> None:
+    assert etag_matches('"3"', task_etag(3))
+    assert etag_matches('W/"3", "4"', task_etag(4))
+    assert etag_matches("*", task_etag(1))
+    assert not etag_matches('"2"', task_etag(3))
+
+
+def test_parse_if_match_keeps_only_strong_versions() -> None:
+    assert parse_if_match(None) is None
+    assert parse_if_match("*") is None
+    assert parse_if_match('"2", W/"3", "x"') == [2]
+
+
+def test_page_etag_follows_versions() -> None:
+    task_id = uuid4()
+    page = [SimpleNamespace(id=task_id, version=1)]
+    changed = [SimpleNamespace(id=task_id, version=2)]
+
+    assert page_etag(page) == page_etag(list(page))  # type: ignore [arg-type]
+    assert page_etag(page) != page_etag(changed)  # type: ignore [arg-type]
+    assert page_etag(page).startswith('W/"')  # type: ignore [arg-type]
+
+
+def test_http_date_treats_naive_time_as_utc() -> None:
+    assert http_date(datetime(2025, 9, 22, 11, 26, 40)) == (
+        "Mon, 22 Sep 2025 11:26:40 GMT"
+    )
@@ -0,0 +1,25 @@
+import csv
+import io
+
+import orjson
+
+from src.domain.task.entity import TaskEntity
+from src.presentation.web_api.export import CSV_HEADER, encode_csv, encode_ndjson
+
+
+def test_encode_ndjson_one_object_per_line() -> None:
+    tasks = [TaskEntity(title="First"), TaskEntity(title="Second")]
+
+    lines = encode_ndjson(tasks).splitlines()
+
+    assert [orjson.loads(line)["title"] for line in lines] == ["First", "Second"]
+    assert orjson.loads(lines[0])["id"] == str(tasks[0].id)
+
+
+def test_encode_csv_with_header() -> None:
+    task = TaskEntity(title='Quoted, "title"', description="line\nbreak")
+
+    rows = list(csv.reader(io.StringIO(encode_csv([task], header=True).decode())))
+
+    assert tuple(rows[0]) == CSV_HEADER
+    assert rows[1][:3] == [str(task.id), task.title, task.description]
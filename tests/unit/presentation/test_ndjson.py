@@ -0,0 +1,28 @@
+from typing import AsyncIterator, List
+
+from src.presentation.web_api.ndjson import iter_lines
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(lines: AsyncIterator[bytes]) -> List[bytes]:
+    return [line async for line in lines]
+
+
+async def test_lines_split_across_chunks() -> None:
+    lines = await _collect(
+        iter_lines(_chunks(b'{"a"', b":1}\n{", b'"b":2}\n\n{"c":3}'))
+    )
+
+    assert lines == [b'{"a":1}', b'{"b":2}', b"", b'{"c":3}']
+
+
+async def test_overlong_line_is_truncated_and_rest_skipped() -> None:
+    lines = await _collect(
+        iter_lines(_chunks(b"x" * 6, b"y" * 6, b"zz\nok\n"), max_line_bytes=8)
+    )
+
+    assert lines == [b"xxxxxxyy", b"ok"]
@@ -0,0 +1,23 @@
+import asyncio
+from uuid import uuid4
+
+from src.infra.events import InMemoryTaskEventBroker, TaskEvent, TaskEventType
+from src.presentation.web_api.sse import SSE_RESET, encode_sse
+
+
+async def test_dropped_client_gets_reset_event() -> None:
+    broker = InMemoryTaskEventBroker(queue_size=1)
+    events = [TaskEvent(TaskEventType.CREATED, (uuid4(),)) for _ in range(2)]
+    stream = encode_sse(broker)
+    # подписка появляется, когда поток начинают читать
+    first = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    broker.committed(events)
+    chunks = [await first] + [chunk async for chunk in stream]
+
+    assert chunks == [
+        b"event: created\ndata: " + events[0].to_json() + b"\n\n",
+        SSE_RESET,
+    ]
+    assert broker.stats.subscribers == 0
@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.task.entity import TaskEntity
+from src.domain.task.value_object import TaskField, TaskFilter, TaskStatus
+from src.infra.db.repositories.task_repositories import TaskRepository
+from src.presentation.web_api.schemas.task import TaskDTO
+from src.presentation.web_api.task_json import encode_task_rows
+
+
+@pytest.mark.asyncio
+async def test_encode_task_rows_matches_task_dto(db_session: AsyncSession) -> None:
+    repo = TaskRepository(db_session)
+    await repo.create_many(
+        [
+            TaskEntity(title="Fast json", description='ÿ "quoted"'),
+            TaskEntity(
+                title="Fast json",
+                status=TaskStatus.COMPLETED,
+                created_at=datetime(2024, 5, 1, 12, 30, 0, 15, tzinfo=timezone.utc),
+            ),
+        ]
+    )
+    task_filter = TaskFilter(search="Fast json")
+
+    rows = await repo.list_rows(task_filter=task_filter)
+    tasks = await repo.list(task_filter=task_filter)
+
+    expected = TypeAdapter(list[TaskDTO]).dump_json(
+        TypeAdapter(list[TaskDTO]).validate_python(tasks, from_attributes=True)
+    )
+    assert orjson.loads(encode_task_rows(rows)) == orjson.loads(expected)
+    assert len(rows) == 2
+
+
+@pytest.mark.asyncio
+async def test_encode_task_rows_with_fields_drops_cursor_columns(
+    db_session: AsyncSession,
+) -> None:
+    repo = TaskRepository(db_session)
+    await repo.create(TaskEntity(title="Sparse json", description="x" * 1000))
+    fields = (TaskField.TITLE, TaskField.STATUS)
+
+    rows = await repo.list_rows(
+        task_filter=TaskFilter(search="Sparse json"),
+        fields=(*fields, TaskField.ID, TaskField.CREATED_AT),
+    )
+
+    assert "description" not in rows[0]._fields
+    assert orjson.loads(encode_task_rows(rows, fields)) == [
+        {"title": "Sparse json", "status": "CREATED"}
+    ]